@@ -0,0 +1,80 @@
+"""
+Benchmark del detector de tipo de entrevista (utils/detector_entrevista.py).
+
+Genera transcripciones sintéticas de 10 KB a 10 MB (turnos de entrevistador y
+entrevistados con etiquetas "Nombre:", menciones de "yo"/"nosotros" y de
+dependencias de la universidad) y compara `detectar_tipo_entrevista` con la
+implementación anterior (detector_entrevista_anterior.py). Comprueba que el
+InfoEntrevista resultante es idéntico.
+
+Uso:
+    python benchmarks/bench_detector_entrevista.py
+    python benchmarks/bench_detector_entrevista.py --tamanos-kb 10 1000 --semilla 3
+"""
+import sys
+import os
+import argparse
+import random
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from utils.detector_entrevista import detectar_tipo_entrevista
+from detector_entrevista_anterior import detectar_tipo_entrevista_anterior
+
+HABLANTES = ["Entrevistador", "Ana María", "Carlos", "Speaker 1", "Hablante 2"]
+FRASES = [
+    "Yo trabajo en la Facultad de Ingeniería, en el grupo de automática.",
+    "Nosotros usamos un servidor con dos GPU que compartimos entre proyectos.",
+    "La mayor dificultad es el presupuesto, porque las tarjetas son costosas.",
+    "Desde la Vicerrectoría de Investigaciones nos apoyaron con la convocatoria.",
+    "Hemos publicado varios artículos sobre detección de fallas.",
+    "En el Centro de Recursos Tecnológicos tienen licencias de software.",
+    "yo creo que los modelos de lenguaje son útiles, pero hay que revisarlos.",
+    "Con mis compañeros del semillero entrenamos redes neuronales.",
+    "¿Nos puede contar más sobre ese punto?",
+]
+
+
+def generar_transcripcion(caracteres: int, rng: random.Random) -> str:
+    """Turnos "Hablante: frases" hasta alcanzar `caracteres`."""
+    turnos = []
+    tamano = 0
+    while tamano < caracteres:
+        turno = f"{rng.choice(HABLANTES)}: " + " ".join(rng.choice(FRASES) for _ in range(rng.randint(1, 4)))
+        turnos.append(turno)
+        tamano += len(turno) + 1
+    return "\n".join(turnos)[:caracteres]
+
+
+def medir(funcion, *args) -> tuple:
+    """Ejecuta la función y retorna (resultado, segundos)."""
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del detector de tipo de entrevista")
+    parser.add_argument("--tamanos-kb", type=int, nargs="+", default=[10, 100, 1000, 10000],
+                        help="Tamaños de transcripción en KB (default: 10 100 1000 10000)")
+    parser.add_argument("--semilla", type=int, default=19, help="Semilla del generador (default: 19)")
+    args = parser.parse_args()
+    
+    rng = random.Random(args.semilla)
+    distintos = 0
+    for kb in args.tamanos_kb:
+        texto = generar_transcripcion(kb * 1024, rng)
+        esperado, t_anterior = medir(detectar_tipo_entrevista_anterior, texto, "Ana María")
+        obtenido, t_actual = medir(detectar_tipo_entrevista, texto, "Ana María")
+        identico = vars(obtenido) == vars(esperado)
+        distintos += not identico
+        print(f"  {kb:>6} KB  anterior {t_anterior * 1000:9.1f} ms   actual {t_actual * 1000:8.1f} ms"
+              f"  ({t_anterior / t_actual:.1f}x)  idéntico: {'sí' if identico else 'NO'}")
+    
+    if distintos:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark del motor de correcciones conocidas (utils/motor_correcciones.py).
+
+Genera un corpus sintético con las claves de CORRECCIONES_CONOCIDAS y sus
+palabras de condición mezcladas en mayúsculas y minúsculas al azar, y compara
+el motor compilado con el bucle anterior (re.search + re.sub por regla, en el
+orden de la tabla). Comprueba que el texto resultante es idéntico.
+
+Uso:
+    python benchmarks/bench_motor_correcciones.py            # 5 MB
+    python benchmarks/bench_motor_correcciones.py --mb 1 --semilla 7
+"""
+import sys
+import os
+import argparse
+import random
+import re
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from agents.agente_correccion import AgenteCorreccion
+from utils.motor_correcciones import MotorCorrecciones
+
+VOCABULARIO = (
+    "el la de en grupo con datos universidad investigación proyecto sensores "
+    "al trabajo y que para"
+).split()
+
+# Claves de la tabla, variantes que no deben corregirse y palabras de condición
+ESPECIALES = [
+    "grupo Nike", "Grupo NIKE", "al grupo Nike", "Al grupo nike", "nike", "Nike",
+    "jirops", "GIROPS", "girops", "sirius", "geio", "cafe", "Cafe", "electromagnéticos",
+    "eis", "ecología", "ise", "estadística", "gia", "inteligencia", "giga", "geometría",
+    "lider", "laboratorio", "menta", "tic", "automática", "tensor flau", "tensor flo",
+    "Tensor Flau", "narras berry", "quedas", "sid Colombia", "y el avión trabajando",
+    "gicto", "mecabot", "gigede", "genergetica", "nikes", "tensor flauta", "grupo Nikes",
+    "ice3", "giadsc",
+]
+
+
+def corregir_secuencial(texto: str, reglas) -> tuple:
+    """Implementación anterior: cada regla con re.search + re.sub, en orden."""
+    aplicadas = []
+    for patron, reemplazo in reglas:
+        if re.search(patron, texto, re.IGNORECASE):
+            texto = re.sub(patron, reemplazo, texto, flags=re.IGNORECASE)
+            aplicadas.append(f"- {patron} → {reemplazo}")
+    return texto, aplicadas
+
+
+def generar_corpus(caracteres: int, rng: random.Random, proporcion_especiales: float = 0.08) -> str:
+    """Líneas de 3 a 40 palabras hasta alcanzar `caracteres`."""
+    lineas = []
+    tamano = 0
+    while tamano < caracteres:
+        palabras = (
+            rng.choice(ESPECIALES) if rng.random() < proporcion_especiales else rng.choice(VOCABULARIO)
+            for _ in range(rng.randint(3, 40))
+        )
+        linea = " ".join(palabras) + rng.choice([".", ",", "?", ""])
+        lineas.append(linea)
+        tamano += len(linea) + 1
+    return "\n".join(lineas)
+
+
+def medir(funcion, *args) -> tuple:
+    """Ejecuta la función y retorna (resultado, segundos)."""
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del motor de correcciones conocidas")
+    parser.add_argument("--mb", type=float, default=5.0, help="Tamaño del corpus en MB (default: 5)")
+    parser.add_argument("--semilla", type=int, default=99, help="Semilla del generador (default: 99)")
+    args = parser.parse_args()
+    
+    reglas = AgenteCorreccion.CORRECCIONES_CONOCIDAS
+    texto = generar_corpus(int(args.mb * 1_000_000), random.Random(args.semilla))
+    print(f"Corpus: {len(texto) / 1e6:.1f} MB, {texto.count(chr(10)) + 1} líneas, {len(reglas)} reglas")
+    
+    motor, t_compilacion = medir(MotorCorrecciones, reglas)
+    (esperado, _), t_secuencial = medir(corregir_secuencial, texto, reglas)
+    (obtenido, _), t_motor = medir(motor.aplicar, texto)
+    
+    print(f"  Bucle secuencial: {t_secuencial:.2f}s")
+    print(f"  Motor compilado:  {t_motor:.2f}s ({t_secuencial / t_motor:.1f}x), compilación {t_compilacion * 1000:.1f} ms")
+    print(f"  Texto idéntico:   {'sí' if obtenido == esperado else 'NO'}")
+    if obtenido != esperado:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
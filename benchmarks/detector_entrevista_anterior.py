@@ -0,0 +1,128 @@
+"""
+Implementación anterior de `detectar_tipo_entrevista` (utils/detector_entrevista.py),
+con una búsqueda por patrón y otra por área sobre toda la transcripción.
+
+Sirve de referencia al benchmark (bench_detector_entrevista.py) y a la prueba
+de equivalencia (tests/test_detector_entrevista.py). Las tablas (AREAS_UTP,
+nombres femeninos) y InfoEntrevista se importan del módulo actual: solo se
+conserva el algoritmo.
+"""
+import sys
+import os
+import re
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from utils.detector_entrevista import AREAS_UTP, InfoEntrevista, detectar_genero_nombre
+
+
+# Patrones que indican múltiples participantes
+PATRONES_GRUPAL = [
+    r'\b(nosotros|nosotras)\b',
+    r'\b(nuestro|nuestra|nuestros|nuestras)\s+(grupo|equipo|área|dependencia)',
+    r'\ben\s+(el|la)\s+(área|dependencia|facultad|grupo)\b.*\b(trabajamos|hacemos|desarrollamos)\b',
+    r'\b(representante|representantes)\s+de\b',
+    r'\b(somos|estamos)\s+\d+\s+(personas|integrantes|miembros)\b',
+    r'\b(mi compañero|mi compañera|mis compañeros|mis compañeras)\b',
+    r'\b(entre|junto con)\s+(los|las|nosotros)\b',
+]
+
+
+def detectar_tipo_entrevista_anterior(transcripcion: str, nombre_archivo: str = "") -> InfoEntrevista:
+    """
+    Analiza la transcripción para determinar si es individual o grupal
+    (implementación anterior, con una búsqueda por patrón y por área).
+    
+    Args:
+        transcripcion: Texto completo de la transcripción.
+        nombre_archivo: Nombre del archivo (puede contener pistas).
+    
+    Returns:
+        InfoEntrevista con los detalles detectados.
+    """
+    texto_lower = transcripcion.lower()
+    
+    # Contar indicadores de entrevista grupal
+    indicadores_grupal = 0
+    for patron in PATRONES_GRUPAL:
+        matches = re.findall(patron, texto_lower, re.IGNORECASE)
+        indicadores_grupal += len(matches)
+    
+    # Buscar menciones de "yo" vs "nosotros"
+    menciones_yo = len(re.findall(r'\byo\b', texto_lower))
+    menciones_nosotros = len(re.findall(r'\b(nosotros|nosotras)\b', texto_lower))
+    
+    # Detectar si hay múltiples hablantes con nombres distintos
+    # Buscar patrones como "Speaker 1:", "Hablante 2:", nombres seguidos de ":"
+    patrones_hablantes = re.findall(r'(?:speaker|hablante|participante)\s*\d+|([A-ZÁÉÍÓÚ][a-záéíóú]+(?:\s+[A-ZÁÉÍÓÚ][a-záéíóú]+)*)\s*:', transcripcion)
+    hablantes_unicos = set([h for h in patrones_hablantes if h and len(h) > 2])
+    
+    # Detectar área/dependencia mencionada
+    area_detectada = None
+    for area in AREAS_UTP:
+        if area.lower() in texto_lower:
+            # Buscar el contexto completo
+            match = re.search(rf'(?:de(?:l)?|en)\s+(?:la\s+)?({area}[^,.\n]*)', transcripcion, re.IGNORECASE)
+            if match:
+                area_detectada = match.group(1).strip()
+                break
+    
+    # Determinar si es grupal - ser muy estricto
+    # Priorizar el nombre del archivo como indicador principal
+    es_grupal = False
+    
+    # Verificar si el nombre del archivo indica grupo claramente
+    if nombre_archivo:
+        nombre_lower = nombre_archivo.lower()
+        # Palabras clave que indican entrevista grupal
+        palabras_grupal = ['equipo', 'grupo', 'área', 'dependencia', 'observatorio', 
+                          'gtsi', 'vicerrectoría', 'vicerrectoria', 'decanatura',
+                          'oficina', 'centro', 'unidad']
+        if any(x in nombre_lower for x in palabras_grupal):
+            es_grupal = True
+        # Si tiene "y" o "&" entre nombres, es grupal
+        elif re.search(r'\s+y\s+|\s*&\s*', nombre_archivo):
+            es_grupal = True
+    
+    # Solo usar indicadores de texto si son muy claros
+    if not es_grupal:
+        es_grupal = (
+            len(hablantes_unicos) > 4 or  # Muchos hablantes identificados claramente
+            (menciones_nosotros > 50 and menciones_nosotros > menciones_yo * 3)  # Predominio muy claro
+        )
+    
+    # Extraer nombres del archivo o transcripción
+    nombres = []
+    if nombre_archivo:
+        # Limpiar nombre del archivo
+        nombre_limpio = nombre_archivo.replace('_original', '').replace('_transcripcion', '').replace('.txt', '')
+        
+        # Verificar si contiene múltiples nombres (separados por "y", "&", ",")
+        if re.search(r'\s+y\s+|\s*&\s*|\s*,\s*', nombre_limpio):
+            nombres = re.split(r'\s+y\s+|\s*&\s*|\s*,\s*', nombre_limpio)
+            es_grupal = True
+        else:
+            nombres = [nombre_limpio]
+    
+    # Determinar género predominante
+    if nombres:
+        generos = [detectar_genero_nombre(n) for n in nombres]
+        femeninos = generos.count('femenino')
+        masculinos = generos.count('masculino')
+        
+        if femeninos > masculinos:
+            genero = 'femenino'
+        elif masculinos > femeninos:
+            genero = 'masculino'
+        else:
+            genero = 'mixto'
+    else:
+        genero = 'masculino'  # Default
+    
+    return InfoEntrevista(
+        es_grupal=es_grupal,
+        num_participantes=len(nombres) if es_grupal else 1,
+        nombres=nombres,
+        area_dependencia=area_detectada,
+        genero_predominante=genero
+    )
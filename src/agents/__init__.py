@@ -9,6 +9,7 @@ from .agente_colaboracion_liderazgo import AgenteColaboracionLiderazgo
 from .agente_motivacion_proyeccion import AgenteMotivacionProyeccion
 from .agente_hallazgos_clave import AgenteHallazgosClave
 from .agente_narrativo import AgenteNarrativo
+from .agente_extraccion_conjunta import AgenteExtraccionConjunta
 from .agente_integrador import AgenteIntegrador
 
 __all__ = [
@@ -22,5 +23,6 @@ __all__ = [
     'AgenteMotivacionProyeccion',
     'AgenteHallazgosClave',
     'AgenteNarrativo',
+    'AgenteExtraccionConjunta',
     'AgenteIntegrador',
 ]
@@ -11,6 +11,12 @@ class AgenteColaboracionLiderazgo(BaseAgent):
     y visión estratégica para la IA en la universidad.
     """
     
+    bloques_requeridos = [3]
+    consulta_recuperacion = (
+        "colaboración sinergias alianzas facultades interdisciplinario liderazgo competencias "
+        "formación estudiantes aprendizaje visión estratégica transformación futuro universidad"
+    )
+    
     @property
     def nombre_seccion(self) -> str:
         return "V. Colaboración, liderazgo y visión estratégica"
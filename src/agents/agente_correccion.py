@@ -2,7 +2,26 @@
 Agente para detectar y corregir errores contextuales de transcripción.
 Este agente se ejecuta primero y prepara el texto para los demás agentes.
 """
+import asyncio
+import json
+import re
+from typing import List, Optional
+
 from .base_agent import BaseAgent
+from config import (
+    CORRECCION_CARACTERES_FRAGMENTO, CORRECCION_CARACTERES_CONTEXTO,
+    MODO_CORRECCION, PREDICCION_CORRECCION,
+    CORRECCIONES_APRENDIDAS, CORRECCION_UMBRAL_FUERA_LEXICO, TRANSCRIPCIONES_CORREGIDAS,
+    CORRECCION_FONETICA
+)
+from llm import ClienteLLM, ErrorLimiteTasa, PlanLlamada, entrevista_actual
+from utils.fragmentador import Fragmento, fragmentar_texto, unir_fragmentos
+from utils.motor_correcciones import obtener_motor
+from utils.almacen_json import huella_campos, huella_texto
+from utils.correcciones_aprendidas import AlmacenCorrecciones, obtener_almacen_correcciones
+from utils.transcripciones_corregidas import AlmacenTranscripcionesCorregidas, obtener_transcripciones_corregidas
+from utils.corrector_fonetico import CorrectorFonetico, obtener_corrector_fonetico
+from utils.detector_sospechosos import DetectorSospechosos, Tramo
 
 
 class AgenteCorreccion(BaseAgent):
@@ -13,8 +32,69 @@ class AgenteCorreccion(BaseAgent):
     - Nombres de personas e instituciones
     - Términos técnicos de IA
     - Acrónimos y siglas
+    
+    En modo "diferencias" el modelo no reescribe la transcripción: devuelve
+    solo la lista de cambios en JSON y se aplican localmente. En modo "tramos"
+    devuelve lo mismo, pero recibe solo los tramos con palabras sospechosas
+    (ver utils.detector_sospechosos); si no hay ninguno, la llamada se omite.
+    En modo "completo" el texto original se envía como salida predicha.
+    
+    Antes de la llamada se aplican las correcciones aprendidas de
+    transcripciones anteriores y las variantes fonéticas del vocabulario
+    técnico que se reconocen localmente (ver utils.corrector_fonetico); si casi todas las palabras resultantes ya
+    están en el léxico verificado, la llamada se omite. El resultado se guarda
+    por texto original y versión del prompt, y se reutiliza en las siguientes
+    ejecuciones (también desde el consolidador).
     """
     
+    def __init__(
+        self,
+        cliente: ClienteLLM = None,
+        modo: str = None,
+        usar_prediccion: bool = PREDICCION_CORRECCION,
+        almacen: AlmacenCorrecciones = None,
+        umbral_fuera_lexico: float = CORRECCION_UMBRAL_FUERA_LEXICO,
+        transcripciones: AlmacenTranscripcionesCorregidas = None,
+        corrector_fonetico: CorrectorFonetico = None,
+        detector: DetectorSospechosos = None
+    ):
+        """
+        Args:
+            cliente: Cliente LLM a usar. Por defecto, el compartido del proceso.
+            modo: "completo", "diferencias" o "tramos" (por defecto, MODO_CORRECCION).
+            usar_prediccion: Enviar el texto original como salida predicha en
+                     modo "completo" (si el modelo lo admite).
+            almacen: Almacén de correcciones aprendidas. Por defecto, el
+                     compartido del proceso (None si CORRECCIONES_APRENDIDAS=false).
+            umbral_fuera_lexico: Fracción máxima de palabras fuera del léxico
+                     verificado para omitir la llamada al LLM (0 = nunca).
+            transcripciones: Almacén de transcripciones corregidas. Por defecto,
+                     el compartido del proceso (None si TRANSCRIPCIONES_CORREGIDAS=false).
+            corrector_fonetico: Precorrección fonética local del vocabulario
+                     técnico. Por defecto, el léxico técnico (None si CORRECCION_FONETICA=false).
+            detector: Detector de tramos sospechosos del modo "tramos". Por
+                     defecto, uno con el léxico aprendido y las correcciones conocidas.
+        """
+        super().__init__(cliente)
+        self.modo = modo or MODO_CORRECCION
+        self.usar_prediccion = usar_prediccion
+        if almacen is None and CORRECCIONES_APRENDIDAS:
+            almacen = obtener_almacen_correcciones()
+        self.almacen = almacen
+        self.umbral_fuera_lexico = umbral_fuera_lexico
+        if transcripciones is None and TRANSCRIPCIONES_CORREGIDAS:
+            transcripciones = obtener_transcripciones_corregidas()
+        self.transcripciones = transcripciones
+        if corrector_fonetico is None and CORRECCION_FONETICA:
+            corrector_fonetico = obtener_corrector_fonetico()
+        self.corrector_fonetico = corrector_fonetico
+        if detector is None and self.modo == "tramos":
+            detector = DetectorSospechosos(
+                almacen=self.almacen,
+                conocidas=[reemplazo for _, reemplazo in self.CORRECCIONES_CONOCIDAS]
+            )
+        self.detector = detector
+    
     @property
     def nombre_seccion(self) -> str:
         return "Corrección de transcripción"
@@ -93,7 +173,7 @@ Tu tarea es:
 3. NO cambiar el contenido ni añadir información
 4. Mantener el formato y estructura del texto original
 5. Generar una lista de las correcciones realizadas"""
-    
+
     @property
     def instrucciones_extraccion(self) -> str:
         return """
@@ -127,6 +207,102 @@ Si no hay correcciones necesarias, escribe:
 IMPORTANTE: Siempre incluir la sección ---CORRECCIONES--- aunque no haya correcciones.
 """
 
+    @property
+    def instrucciones_diferencias(self) -> str:
+        return """
+INSTRUCCIONES PARA CORRECCIÓN DE TRANSCRIPCIÓN (SOLO CAMBIOS):
+
+1. Lee toda la transcripción para entender el contexto
+2. Identifica errores de reconocimiento de voz (especialmente tecnologías, nombres, términos técnicos)
+3. NO reescribas la transcripción: devuelve únicamente la lista de cambios
+
+ATENCIÓN ESPECIAL A GRUPOS DE INVESTIGACIÓN UTP:
+- Si ves "Nike", "nike", "naiqui" en contexto de grupo de investigación → corregir a "Nyquist"
+- Si ves "jirops", "girops" → corregir a "GIROPS"
+- Nyquist es un grupo de investigación en procesamiento de señales de la UTP
+- La lista completa de grupos está en: https://vicerrectorias.utp.edu.co/viie/todos-los-grupos/
+
+FORMATO DE SALIDA OBLIGATORIO:
+Un objeto JSON con la propiedad "correcciones": una lista de cambios, cada uno con:
+- "original": el texto erróneo, copiado EXACTAMENTE como aparece en la transcripción
+- "reemplazo": el texto corregido
+- "contexto": un fragmento corto y literal de la transcripción (5 a 10 palabras) que
+  contiene al texto original, para ubicarlo sin ambigüedad. Déjalo vacío ("") si el
+  cambio debe aplicarse en todas las apariciones del texto original.
+
+Si no hay correcciones necesarias, devuelve {"correcciones": []}.
+"""
+
+    @property
+    def esquema_diferencias(self) -> dict:
+        """JSON Schema de la respuesta en modo "diferencias"."""
+        return {
+            "type": "object",
+            "properties": {
+                "correcciones": {
+                    "type": "array",
+                    "description": "Cambios a aplicar sobre la transcripción",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "original": {"type": "string"},
+                            "reemplazo": {"type": "string"},
+                            "contexto": {"type": "string"},
+                        },
+                        "required": ["original", "reemplazo", "contexto"],
+                    },
+                },
+            },
+            "required": ["correcciones"],
+        }
+    
+    @property
+    def instrucciones_tramos(self) -> str:
+        return """
+INSTRUCCIONES PARA CORRECCIÓN DE TRANSCRIPCIÓN (SOLO TRAMOS DUDOSOS):
+
+1. Cada tramo numerado es un fragmento literal de la transcripción con al menos una palabra dudosa
+2. Identifica en los tramos los errores de reconocimiento de voz (especialmente tecnologías, nombres, términos técnicos)
+3. NO reescribas los tramos: devuelve únicamente la lista de cambios
+
+ATENCIÓN ESPECIAL A GRUPOS DE INVESTIGACIÓN UTP:
+- Si ves "Nike", "nike", "naiqui" en contexto de grupo de investigación → corregir a "Nyquist"
+- Si ves "jirops", "girops" → corregir a "GIROPS"
+- Nyquist es un grupo de investigación en procesamiento de señales de la UTP
+- La lista completa de grupos está en: https://vicerrectorias.utp.edu.co/viie/todos-los-grupos/
+
+FORMATO DE SALIDA OBLIGATORIO:
+Un objeto JSON con la propiedad "correcciones": una lista de cambios, cada uno con:
+- "tramo": el número del tramo
+- "original": el texto erróneo, copiado EXACTAMENTE como aparece en el tramo
+- "reemplazo": el texto corregido
+
+Si no hay correcciones necesarias, devuelve {"correcciones": []}.
+"""
+
+    @property
+    def esquema_tramos(self) -> dict:
+        """JSON Schema de la respuesta en modo "tramos"."""
+        return {
+            "type": "object",
+            "properties": {
+                "correcciones": {
+                    "type": "array",
+                    "description": "Cambios a aplicar dentro de cada tramo",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "tramo": {"type": "integer"},
+                            "original": {"type": "string"},
+                            "reemplazo": {"type": "string"},
+                        },
+                        "required": ["tramo", "original", "reemplazo"],
+                    },
+                },
+            },
+            "required": ["correcciones"],
+        }
+    
     # Correcciones conocidas que siempre deben aplicarse (errores frecuentes de transcripción)
     CORRECCIONES_CONOCIDAS = [
         # Grupos de investigación UTP (lista completa en https://vicerrectorias.utp.edu.co/viie/todos-los-grupos/)
@@ -178,27 +354,20 @@ IMPORTANTE: Siempre incluir la sección ---CORRECCIONES--- aunque no haya correc
         # Otros errores comunes
         (r'\by el avión trabajando\b', 'y ha venido trabajando'),
     ]
-
+    
     def _aplicar_correcciones_conocidas(self, texto: str) -> tuple:
         """
-        Aplica correcciones conocidas que siempre deben realizarse.
+        Aplica correcciones conocidas que siempre deben realizarse, en una
+        sola pasada con la tabla compilada (ver utils.motor_correcciones).
         
         Args:
             texto: Texto a corregir.
-            
+        
         Returns:
             Tupla (texto_corregido, lista_correcciones).
         """
-        import re
-        correcciones_aplicadas = []
-        
-        for patron, reemplazo in self.CORRECCIONES_CONOCIDAS:
-            if re.search(patron, texto, re.IGNORECASE):
-                texto = re.sub(patron, reemplazo, texto, flags=re.IGNORECASE)
-                correcciones_aplicadas.append(f"- {patron} → {reemplazo}")
-        
-        return texto, correcciones_aplicadas
-
+        return obtener_motor(tuple(self.CORRECCIONES_CONOCIDAS)).aplicar(texto)
+    
     def _aplicar_correcciones(self, texto: str, correcciones: str) -> str:
         """
         Aplica las correcciones detectadas al texto original.
@@ -206,7 +375,7 @@ IMPORTANTE: Siempre incluir la sección ---CORRECCIONES--- aunque no haya correc
         Args:
             texto: Texto original.
             correcciones: Lista de correcciones en formato "original → corregido".
-            
+        
         Returns:
             Texto con las correcciones aplicadas.
         """
@@ -239,21 +408,107 @@ IMPORTANTE: Siempre incluir la sección ---CORRECCIONES--- aunque no haya correc
                         break
         
         return texto
-
-    def process(self, transcripcion: str) -> dict:
+    
+    def _aplicar_diferencias(self, texto: str, diferencias: list, tramos: List[Tramo] = None) -> tuple:
         """
-        Procesa la transcripción y devuelve el texto corregido y la lista de correcciones.
+        Aplica los cambios devueltos en modo "diferencias" o "tramos".
+        
+        Con tramos, el cambio se aplica solo dentro de su tramo. Si no, con
+        contexto, solo dentro de las apariciones del contexto (tolerando
+        diferencias de espacios y saltos de línea); sin él, en todas las
+        apariciones del texto original como palabra completa.
+        Todos los cambios se ubican sobre el texto original, así que un cambio
+        no altera el contexto de otro; si dos se solapan, gana el primero.
+        Los cambios cuyo tramo, contexto u original no aparecen se omiten.
         
         Args:
-            transcripcion: Texto original de la transcripción.
-            
+            texto: Texto original.
+            diferencias: Lista de dicts con 'original', 'reemplazo' y 'contexto'
+                     (o 'tramo', el número del tramo empezando en 1).
+            tramos: Tramos enviados en modo "tramos".
+        
         Returns:
-            Diccionario con 'texto_corregido' y 'correcciones'.
+            Tupla (texto_corregido, lista_correcciones).
+        """
+        reemplazos = {}  # inicio -> (fin, reemplazo)
+        ocupado = []
+        correcciones_aplicadas = []
+        omitidas = 0
+        
+        for cambio in diferencias:
+            if not isinstance(cambio, dict):
+                continue
+            original = str(cambio.get('original') or '').strip()
+            reemplazo = str(cambio.get('reemplazo') or '').strip()
+            contexto = str(cambio.get('contexto') or '').strip()
+            if not original or not reemplazo or original == reemplazo:
+                continue
+            
+            patron = re.compile(rf'(?<!\w){re.escape(original)}(?!\w)')
+            if tramos is not None:
+                numero = cambio.get('tramo')
+                tramo = tramos[numero - 1] if isinstance(numero, int) and 1 <= numero <= len(tramos) else None
+                encontrados = [m.span() for m in patron.finditer(texto, tramo.inicio, tramo.fin)] if tramo else []
+            elif contexto and patron.search(contexto):
+                patron_contexto = re.compile(r'\s+'.join(re.escape(p) for p in contexto.split()))
+                encontrados = [
+                    (m.start() + sub.start(), m.start() + sub.end())
+                    for m in patron_contexto.finditer(texto)
+                    for sub in patron.finditer(m.group(0))
+                ]
+            else:
+                encontrados = [m.span() for m in patron.finditer(texto)]
+            
+            aplicados = 0
+            for inicio, fin in encontrados:
+                if any(inicio < f and i < fin for i, f in ocupado):
+                    continue
+                ocupado.append((inicio, fin))
+                reemplazos[inicio] = (fin, reemplazo)
+                aplicados += 1
+            
+            if not aplicados:
+                omitidas += 1
+                continue
+            linea = f"- {original} → {reemplazo}"
+            if linea not in correcciones_aplicadas:
+                correcciones_aplicadas.append(linea)
+        
+        partes = []
+        posicion = 0
+        for inicio in sorted(reemplazos):
+            fin, reemplazo = reemplazos[inicio]
+            partes.append(texto[posicion:inicio])
+            partes.append(reemplazo)
+            posicion = fin
+        partes.append(texto[posicion:])
+        
+        if omitidas:
+            correcciones_aplicadas.append(f"({omitidas} cambios sugeridos no se aplicaron: texto no encontrado o solapado)")
+        
+        return "".join(partes), correcciones_aplicadas
+    
+    def construir_prompt(self, transcripcion: str) -> str:
+        """
+        Construye el prompt de usuario con la transcripción original (en modo
+        "tramos", con sus tramos sospechosos).
         """
-        import time
+        if self.modo == "tramos":
+            return self.construir_prompt_tramos(self.detector.detectar(transcripcion))
         
-        max_retries = 3
-        prompt_usuario = f"""{self.instrucciones_extraccion}
+        if self.modo == "diferencias":
+            return f"""{self.instrucciones_diferencias}
+
+---
+TRANSCRIPCIÓN ORIGINAL:
+---
+{transcripcion}
+---
+
+Devuelve el objeto JSON con la lista de correcciones.
+"""
+
+        return f"""{self.instrucciones_extraccion}
 
 ---
 TRANSCRIPCIÓN ORIGINAL:
@@ -263,90 +518,484 @@ TRANSCRIPCIÓN ORIGINAL:
 
 Corrige los errores de transcripción y lista las correcciones realizadas.
 """
+
+    def construir_prompt_tramos(self, tramos: List[Tramo]) -> str:
+        """Construye el prompt de usuario con los tramos sospechosos numerados."""
+        lista = "\n".join(f"[{i}] {tramo.texto}" for i, tramo in enumerate(tramos, 1))
+        return f"""{self.instrucciones_tramos}
+
+---
+TRAMOS DUDOSOS:
+---
+{lista}
+---
+
+Devuelve el objeto JSON con la lista de correcciones.
+"""
+
+    def prediccion(self, texto: str):
+        """
+        Salida predicha para corregir `texto`: el mismo texto seguido del
+        separador de correcciones, o None si no se usa.
+        """
+        if not self.usar_prediccion or not self.cliente.admite_prediccion:
+            return None
+        return f"{texto}\n\n---CORRECCIONES---\n"
+    
+    def fragmentar(self, transcripcion: str) -> List[Fragmento]:
+        """
+        Divide la transcripción en fragmentos alineados a turnos de palabra.
+        Las transcripciones cortas quedan en un único fragmento.
+        """
+        return fragmentar_texto(transcripcion, CORRECCION_CARACTERES_FRAGMENTO, CORRECCION_CARACTERES_CONTEXTO)
+    
+    def construir_prompt_fragmento(self, fragmento: Fragmento, indice: int, total: int) -> str:
+        """
+        Construye el prompt de un fragmento. El texto vecino se incluye solo
+        como referencia para interpretar el contexto; la respuesta debe
+        contener únicamente el fragmento corregido.
+        """
+        contexto = ""
+        if fragmento.contexto_previo:
+            contexto += f"""
+[CONTEXTO ANTERIOR - solo referencia, NO lo corrijas ni lo incluyas en la respuesta]
+{fragmento.contexto_previo}
+[FIN DEL CONTEXTO ANTERIOR]
+"""
+        if fragmento.contexto_siguiente:
+            contexto += f"""
+[CONTEXTO POSTERIOR - solo referencia, NO lo corrijas ni lo incluyas en la respuesta]
+{fragmento.contexto_siguiente}
+[FIN DEL CONTEXTO POSTERIOR]
+"""
+
+        return f"""{self.instrucciones_extraccion}
+
+Esta es la parte {indice} de {total} de una transcripción más larga. Corrige y devuelve
+ÚNICAMENTE el texto entre las marcas de TRANSCRIPCIÓN ORIGINAL, completo y sin resumir.
+{contexto}
+---
+TRANSCRIPCIÓN ORIGINAL:
+---
+{fragmento.texto.strip()}
+---
+
+Corrige los errores de transcripción y lista las correcciones realizadas.
+"""
+
+    def planificar(self, transcripcion: str) -> List[PlanLlamada]:
+        """
+        Tokens estimados de las llamadas de corrección (salida de max_tokens * 2),
+        una por fragmento. En modo "diferencias" o "tramos", una sola llamada de
+        max_tokens. Ninguna si la transcripción ya se corrigió en una ejecución
+        anterior o si `_precorregir` omite el LLM. Se estima sobre el texto
+        precorregido, el mismo que recibe la corrección.
+        """
+        if self.transcripciones is not None and self.transcripciones.contiene(transcripcion, self.version_prompt):
+            return []
         
-        for attempt in range(max_retries):
-            try:
-                if self.provider == "openai":
-                    # Modelos nuevos usan max_completion_tokens
-                    use_new_param = any(x in self.model for x in ['gpt-4.1', 'gpt-5', 'o1', 'o3'])
-                    params = {
-                        "model": self.model,
-                        "messages": [
-                            {"role": "system", "content": self.prompt_sistema},
-                            {"role": "user", "content": prompt_usuario}
-                        ],
-                        "temperature": 0.1
-                    }
-                    if use_new_param:
-                        params["max_completion_tokens"] = self.max_tokens * 2
-                    else:
-                        params["max_tokens"] = self.max_tokens * 2
-                    
-                    response = self.client.chat.completions.create(**params)
-                    resultado = response.choices[0].message.content.strip()
-                else:  # gemini
-                    from google.genai import types
-                    prompt_completo = f"{self.prompt_sistema}\n\n{prompt_usuario}"
-                    response = self.client.models.generate_content(
-                        model=self.model,
-                        contents=prompt_completo,
-                        config=types.GenerateContentConfig(
-                            max_output_tokens=self.max_tokens * 2,
-                            temperature=0.1
-                        )
-                    )
-                    resultado = response.text.strip()
-                
-                # Parsear el resultado
-                # Buscar el separador de correcciones de manera más flexible
-                separadores = ["---CORRECCIONES---", "---correcciones---", "CORRECCIONES:", "Correcciones:"]
-                texto_corregido = resultado
-                correcciones = ""
-                
-                for sep in separadores:
-                    if sep.lower() in resultado.lower():
-                        idx = resultado.lower().find(sep.lower())
-                        texto_corregido = resultado[:idx].strip()
-                        correcciones = resultado[idx + len(sep):].strip()
-                        break
-                
-                # Si el texto corregido está vacío o muy corto, aplicar correcciones manualmente
-                if not texto_corregido or len(texto_corregido) < len(transcripcion) * 0.5:
-                    texto_corregido = transcripcion
-                    # Aplicar las correcciones detectadas al texto original
-                    texto_corregido = self._aplicar_correcciones(texto_corregido, correcciones)
-                
-                # SIEMPRE aplicar correcciones conocidas al final (fallback)
-                texto_corregido, correcciones_adicionales = self._aplicar_correcciones_conocidas(texto_corregido)
-                
-                # Combinar correcciones
-                if correcciones_adicionales:
-                    if correcciones:
-                        correcciones = correcciones + "\n" + "\n".join(correcciones_adicionales)
-                    else:
-                        correcciones = "\n".join(correcciones_adicionales)
-                
-                return {
-                    'texto_corregido': texto_corregido,
-                    'correcciones': correcciones
-                }
-                
-            except Exception as e:
-                error_str = str(e)
-                if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str or "rate" in error_str.lower():
-                    wait_time = 10 * (attempt + 1)
-                    print(f"      ⏳ Rate limit. Esperando {wait_time}s...")
-                    time.sleep(wait_time)
-                    continue
-                return {
-                    'texto_corregido': transcripcion,
-                    'correcciones': f"Error al procesar: {str(e)}"
-                }
+        _, texto, _, tramos, omitida = self._precorregir(transcripcion)
+        if omitida is not None:
+            return []
+        
+        if self.modo == "tramos":
+            prompt_usuario = self.construir_prompt_tramos(tramos)
+            return [self.cliente.planificar(prompt_usuario, self.prompt_sistema, self.max_tokens, type(self).__name__)]
+        
+        if self.modo == "diferencias":
+            prompt_usuario = self.construir_prompt(texto)
+            return [self.cliente.planificar(prompt_usuario, self.prompt_sistema, self.max_tokens, type(self).__name__)]
+        
+        fragmentos = self.fragmentar(texto)
+        if len(fragmentos) == 1:
+            prompt_usuario = self.construir_prompt(texto)
+            return [self.cliente.planificar(prompt_usuario, self.prompt_sistema, self.max_tokens * 2, type(self).__name__)]
+        
+        return [
+            self.cliente.planificar(
+                self.construir_prompt_fragmento(fragmento, i, len(fragmentos)),
+                self.prompt_sistema, self.max_tokens * 2,
+                f"{type(self).__name__}[{i}/{len(fragmentos)}]"
+            )
+            for i, fragmento in enumerate(fragmentos, 1)
+        ]
+    
+    def _separar_respuesta(self, resultado: str, transcripcion: str) -> tuple:
+        """
+        Separa la respuesta del LLM en texto corregido y lista de correcciones,
+        usando el texto original si la respuesta está truncada.
+        
+        Returns:
+            Tupla (texto_corregido, correcciones).
+        """
+        # Buscar el separador de correcciones de manera más flexible
+        separadores = ["---CORRECCIONES---", "---correcciones---", "CORRECCIONES:", "Correcciones:"]
+        texto_corregido = resultado
+        correcciones = ""
+        
+        for sep in separadores:
+            if sep.lower() in resultado.lower():
+                idx = resultado.lower().find(sep.lower())
+                texto_corregido = resultado[:idx].strip()
+                correcciones = resultado[idx + len(sep):].strip()
+                break
+        
+        # Si el texto corregido está vacío o muy corto, aplicar correcciones manualmente
+        if not texto_corregido or len(texto_corregido) < len(transcripcion) * 0.5:
+            texto_corregido = transcripcion
+            # Aplicar las correcciones detectadas al texto original
+            texto_corregido = self._aplicar_correcciones(texto_corregido, correcciones)
+        
+        return texto_corregido, correcciones
+    
+    def _completar_resultado(self, texto_corregido: str, correcciones: str) -> dict:
+        """
+        Aplica las correcciones conocidas al texto completo y arma el resultado.
+        """
+        # SIEMPRE aplicar correcciones conocidas al final (fallback)
+        texto_corregido, correcciones_adicionales = self._aplicar_correcciones_conocidas(texto_corregido)
+        
+        # Combinar correcciones
+        if correcciones_adicionales:
+            if correcciones:
+                correcciones = correcciones + "\n" + "\n".join(correcciones_adicionales)
+            else:
+                correcciones = "\n".join(correcciones_adicionales)
         
         return {
-            'texto_corregido': transcripcion,
-            'correcciones': "Error: Rate limit excedido."
+            'texto_corregido': texto_corregido,
+            'correcciones': correcciones
+        }
+    
+    def _interpretar_resultado(self, resultado: str, transcripcion: str) -> dict:
+        """
+        Separa la respuesta del LLM en texto corregido y lista de correcciones.
+        
+        Args:
+            resultado: Respuesta del LLM.
+            transcripcion: Texto original (fallback si la respuesta está truncada).
+        
+        Returns:
+            Diccionario con 'texto_corregido' y 'correcciones'.
+        """
+        texto_corregido, correcciones = self._separar_respuesta(resultado, transcripcion)
+        return self._completar_resultado(texto_corregido, correcciones)
+    
+    def _interpretar_diferencias(self, resultado: str, transcripcion: str, tramos: List[Tramo] = None) -> dict:
+        """
+        Aplica sobre el texto original los cambios de una respuesta en modo
+        "diferencias" o "tramos". Si el JSON no es válido se conserva el texto
+        original (más las correcciones conocidas).
+        
+        Args:
+            resultado: Respuesta JSON del LLM.
+            transcripcion: Texto original.
+            tramos: Tramos enviados en modo "tramos".
+        
+        Returns:
+            Diccionario con 'texto_corregido' y 'correcciones'.
+        """
+        texto = re.sub(r'^```(?:json)?\s*|\s*```$', '', resultado.strip())
+        try:
+            datos = json.loads(texto)
+        except json.JSONDecodeError:
+            datos = None
+        diferencias = datos.get('correcciones') if isinstance(datos, dict) else None
+        if not isinstance(diferencias, list):
+            return self._completar_resultado(transcripcion, "Error: respuesta de correcciones no válida.")
+        
+        texto_corregido, lineas = self._aplicar_diferencias(transcripcion, diferencias, tramos)
+        correcciones = "\n".join(lineas) or "- Sin correcciones significativas detectadas"
+        return self._completar_resultado(texto_corregido, correcciones)
+    
+    def _combinar_fragmentos(self, fragmentos: List[Fragmento], resultados: List[str]) -> dict:
+        """
+        Une los fragmentos corregidos en orden y fusiona sus listas de
+        correcciones sin duplicados. Un fragmento sin respuesta (None)
+        conserva su texto original.
+        """
+        textos = []
+        lineas_correcciones = []
+        errores = []
+        
+        for i, (fragmento, resultado) in enumerate(zip(fragmentos, resultados), 1):
+            if resultado is None:
+                textos.append(fragmento.texto)
+                errores.append(f"Error: no se pudo corregir el fragmento {i}/{len(fragmentos)}.")
+                continue
+            texto, correcciones = self._separar_respuesta(resultado, fragmento.texto.strip())
+            textos.append(texto)
+            for linea in correcciones.split('\n'):
+                linea = linea.strip()
+                if linea and linea not in lineas_correcciones:
+                    lineas_correcciones.append(linea)
+        
+        # "Sin correcciones" solo tiene sentido si ningún fragmento tuvo alguna
+        sin_correcciones = [l for l in lineas_correcciones if 'sin correcciones' in l.lower()]
+        if len(sin_correcciones) < len(lineas_correcciones):
+            lineas_correcciones = [l for l in lineas_correcciones if l not in sin_correcciones]
+        
+        correcciones = "\n".join(lineas_correcciones + errores)
+        return self._completar_resultado(unir_fragmentos(fragmentos, textos), correcciones)
+    
+    async def _corregir_fragmento_async(self, fragmento: Fragmento, indice: int, total: int):
+        """Corrige un fragmento; retorna la respuesta del LLM o None si falla."""
+        prompt_usuario = self.construir_prompt_fragmento(fragmento, indice, total)
+        try:
+            return await self.cliente.generar_async(
+                prompt_usuario, self.prompt_sistema, self.max_tokens * 2, 0.1,
+                agente=type(self).__name__, prediccion=self.prediccion(fragmento.texto.strip())
+            )
+        except Exception as e:
+            print(f"      ⚠ Corrección del fragmento {indice}/{total} fallida: {e}")
+            return None
+    
+    async def _corregir_fragmentos_async(self, fragmentos: List[Fragmento]) -> dict:
+        """Corrige todos los fragmentos en paralelo y los une en orden."""
+        resultados = await asyncio.gather(*[
+            self._corregir_fragmento_async(fragmento, i, len(fragmentos))
+            for i, fragmento in enumerate(fragmentos, 1)
+        ])
+        return self._combinar_fragmentos(fragmentos, resultados)
+    
+    def _tramos(self, transcripcion: str, tramos: Optional[List[Tramo]]) -> Optional[List[Tramo]]:
+        """Tramos ya detectados o, en modo "tramos", los del detector (None en otro modo)."""
+        if tramos is None and self.modo == "tramos":
+            return self.detector.detectar(transcripcion)
+        return tramos
+    
+    def _corregir_diferencias(self, transcripcion: str, tramos: Optional[List[Tramo]] = None) -> dict:
+        """
+        Corrección en modo "diferencias" o "tramos": una sola llamada, sin
+        fragmentar, porque la respuesta solo contiene los cambios.
+        
+        Args:
+            transcripcion: Texto a corregir.
+            tramos: Tramos sospechosos ya detectados en `transcripcion` (modo
+                    "tramos"); si no se indican, se detectan aquí.
+        """
+        tramos = self._tramos(transcripcion, tramos)
+        prompt_usuario = self.construir_prompt(transcripcion) if tramos is None else self.construir_prompt_tramos(tramos)
+        esquema = self.esquema_diferencias if tramos is None else self.esquema_tramos
+        
+        try:
+            resultado = self.cliente.generar(
+                prompt_usuario, self.prompt_sistema, self.max_tokens, 0.1,
+                esquema=esquema, agente=type(self).__name__
+            )
+        except ErrorLimiteTasa:
+            return self._completar_resultado(transcripcion, "Error: Rate limit excedido.")
+        except Exception as e:
+            return self._completar_resultado(transcripcion, f"Error al procesar: {str(e)}")
+        
+        return self._interpretar_diferencias(resultado, transcripcion, tramos)
+    
+    async def _corregir_diferencias_async(self, transcripcion: str, tramos: Optional[List[Tramo]] = None) -> dict:
+        """Versión asíncrona de `_corregir_diferencias`."""
+        tramos = self._tramos(transcripcion, tramos)
+        prompt_usuario = self.construir_prompt(transcripcion) if tramos is None else self.construir_prompt_tramos(tramos)
+        esquema = self.esquema_diferencias if tramos is None else self.esquema_tramos
+        
+        try:
+            resultado = await self.cliente.generar_async(
+                prompt_usuario, self.prompt_sistema, self.max_tokens, 0.1,
+                esquema=esquema, agente=type(self).__name__
+            )
+        except ErrorLimiteTasa:
+            return self._completar_resultado(transcripcion, "Error: Rate limit excedido.")
+        except Exception as e:
+            return self._completar_resultado(transcripcion, f"Error al procesar: {str(e)}")
+        
+        return self._interpretar_diferencias(resultado, transcripcion, tramos)
+    
+    @property
+    def version_prompt(self) -> str:
+        """
+        Identificador de todo lo que determina la corrección salvo el texto:
+        proveedor, modelo, modo, prompts, tabla de correcciones conocidas,
+        léxico de la precorrección fonética, tamaño de fragmento y, en modo
+        "tramos", léxicos del detector. Las correcciones aprendidas no entran:
+        solo cambian qué se corrige localmente antes del LLM.
+        """
+        campos = {
+            'provider': self.provider,
+            'model': self.model,
+            'modo': self.modo,
+            'prompt_sistema': self.prompt_sistema,
+            'prompt': self.construir_prompt_tramos([]) if self.modo == "tramos" else self.construir_prompt("{transcripcion}"),
+            'correcciones_conocidas': self.CORRECCIONES_CONOCIDAS,
+            'fonetico': self.corrector_fonetico.version if self.corrector_fonetico else None,
+            'fragmento': [CORRECCION_CARACTERES_FRAGMENTO, CORRECCION_CARACTERES_CONTEXTO],
         }
+        if self.modo == "tramos":
+            campos['detector'] = self.detector.version
+        return huella_campos(campos)
+    
+    @staticmethod
+    def _con_errores(correcciones: str) -> bool:
+        """True si la corrección falló total o parcialmente."""
+        return any(linea.strip().startswith("Error") for linea in correcciones.split('\n'))
+    
+    def _reutilizar(self, transcripcion: str):
+        """Resultado guardado de una ejecución anterior con el mismo prompt, o None."""
+        if self.transcripciones is None:
+            return None
+        resultado = self.transcripciones.obtener(transcripcion, self.version_prompt)
+        if resultado is not None:
+            resultado['reutilizada'] = True
+        return resultado
+    
+    def _guardar(self, transcripcion: str, resultado: dict) -> dict:
+        """Guarda el resultado para las siguientes ejecuciones (salvo si hubo errores)."""
+        if self.transcripciones is not None and not self._con_errores(resultado['correcciones']):
+            try:
+                self.transcripciones.guardar(transcripcion, self.version_prompt, resultado, entrevista_actual())
+            except OSError as e:
+                print(f"      ⚠ No se pudo guardar la transcripción corregida: {e}")
+        return resultado
+    
+    def _precorregir(self, transcripcion: str):
+        """
+        Aplica las correcciones locales (aprendidas y fonéticas) y decide si
+        hace falta el LLM (en modo "tramos", solo si hay palabras sospechosas).
+        
+        Returns:
+            Tupla (huella, texto, lineas_previas, tramos, resultado). `tramos`
+            son los tramos sospechosos del texto precorregido en modo "tramos"
+            (None en otro modo); `resultado` es el resultado final si la
+            llamada se omite, o None.
+        """
+        huella = huella_texto(transcripcion)
+        texto, previas = transcripcion, []
+        
+        if self.almacen is not None:
+            texto, previas = self.almacen.aplicar(texto, huella)
+        if self.corrector_fonetico is not None:
+            texto, foneticas = self.corrector_fonetico.aplicar(texto)
+            previas = previas + foneticas
+        
+        if self.almacen is not None and self.umbral_fuera_lexico > 0:
+            tasa = self.almacen.tasa_fuera_lexico(texto)
+            if tasa <= self.umbral_fuera_lexico:
+                nota = f"(corrección con LLM omitida: {tasa:.1%} de palabras fuera del léxico)"
+                return huella, texto, previas, None, self._completar_resultado(texto, "\n".join(previas + [nota]))
+        
+        tramos = self.detector.detectar(texto) if self.modo == "tramos" else None
+        if tramos is not None and not tramos:
+            nota = "(corrección con LLM omitida: ninguna palabra sospechosa)"
+            return huella, texto, previas, tramos, self._completar_resultado(texto, "\n".join(previas + [nota]))
+        return huella, texto, previas, tramos, None
+    
+    def _registrar_previas(self, huella: str, texto: str, previas: List[str], resultado: dict) -> dict:
+        """Aprende de la respuesta del LLM y antepone las correcciones locales aplicadas."""
+        # Las respuestas de error no aportan pares ni léxico verificado
+        if self.almacen is not None and not self._con_errores(resultado['correcciones']):
+            self.almacen.aprender(texto, resultado['correcciones'], resultado['texto_corregido'], huella)
+            try:
+                self.almacen.guardar()
+            except OSError as e:
+                print(f"      ⚠ No se pudo guardar el almacén de correcciones: {e}")
+        
+        if previas:
+            resultado['correcciones'] = "\n".join(previas + [resultado['correcciones']]).strip()
+        return resultado
+    
+    def process(self, transcripcion: str) -> dict:
+        """
+        Procesa la transcripción y devuelve el texto corregido y la lista de correcciones.
+        
+        Args:
+            transcripcion: Texto original de la transcripción.
+        
+        Returns:
+            Diccionario con 'texto_corregido' y 'correcciones' ('reutilizada'
+            es True si se tomó de una ejecución anterior).
+        """
+        guardada = self._reutilizar(transcripcion)
+        if guardada is not None:
+            return guardada
+        
+        huella, texto, previas, tramos, resultado = self._precorregir(transcripcion)
+        if resultado is None:
+            resultado = self._corregir(texto, tramos)
+            resultado = self._registrar_previas(huella, texto, previas, resultado)
+        return self._guardar(transcripcion, resultado)
+    
+    async def process_async(self, transcripcion: str) -> dict:
+        """
+        Versión asíncrona de process (cliente asíncrono nativo). Las correcciones
+        locales y el aprendizaje, que son trabajo de CPU y disco, se ejecutan en
+        un hilo para no bloquear el bucle de eventos mientras se corrigen otras
+        transcripciones.
+        """
+        guardada = self._reutilizar(transcripcion)
+        if guardada is not None:
+            return guardada
+        
+        huella, texto, previas, tramos, resultado = await asyncio.to_thread(self._precorregir, transcripcion)
+        if resultado is None:
+            resultado = await self._corregir_async(texto, tramos)
+            resultado = await asyncio.to_thread(self._registrar_previas, huella, texto, previas, resultado)
+        return self._guardar(transcripcion, resultado)
+    
+    def _corregir(self, transcripcion: str, tramos: Optional[List[Tramo]] = None) -> dict:
+        """Corrección con el LLM según el modo (diferencias o tramos, fragmentos o una sola llamada)."""
+        if self.modo in ("diferencias", "tramos"):
+            return self._corregir_diferencias(transcripcion, tramos)
+        
+        fragmentos = self.fragmentar(transcripcion)
+        if len(fragmentos) > 1:
+            # Transcripción larga: fragmentos corregidos en paralelo
+            return asyncio.run(self._corregir_fragmentos_async(fragmentos))
+        
+        prompt_usuario = self.construir_prompt(transcripcion)
+        
+        try:
+            resultado = self.cliente.generar(
+                prompt_usuario, self.prompt_sistema, self.max_tokens * 2, 0.1,
+                agente=type(self).__name__, prediccion=self.prediccion(transcripcion)
+            )
+        except ErrorLimiteTasa:
+            return {
+                'texto_corregido': transcripcion,
+                'correcciones': "Error: Rate limit excedido."
+            }
+        except Exception as e:
+            return {
+                'texto_corregido': transcripcion,
+                'correcciones': f"Error al procesar: {str(e)}"
+            }
+        
+        return self._interpretar_resultado(resultado, transcripcion)
+    
+    async def _corregir_async(self, transcripcion: str, tramos: Optional[List[Tramo]] = None) -> dict:
+        """Versión asíncrona de `_corregir`."""
+        if self.modo in ("diferencias", "tramos"):
+            return await self._corregir_diferencias_async(transcripcion, tramos)
+        
+        fragmentos = self.fragmentar(transcripcion)
+        if len(fragmentos) > 1:
+            return await self._corregir_fragmentos_async(fragmentos)
+        
+        prompt_usuario = self.construir_prompt(transcripcion)
+        
+        try:
+            resultado = await self.cliente.generar_async(
+                prompt_usuario, self.prompt_sistema, self.max_tokens * 2, 0.1,
+                agente=type(self).__name__, prediccion=self.prediccion(transcripcion)
+            )
+        except ErrorLimiteTasa:
+            return {
+                'texto_corregido': transcripcion,
+                'correcciones': "Error: Rate limit excedido."
+            }
+        except Exception as e:
+            return {
+                'texto_corregido': transcripcion,
+                'correcciones': f"Error al procesar: {str(e)}"
+            }
+        
+        return self._interpretar_resultado(resultado, transcripcion)
     
     def obtener_resumen_correcciones(self, correcciones: str) -> str:
         """
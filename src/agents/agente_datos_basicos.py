@@ -11,6 +11,11 @@ class AgenteDatosBasicos(BaseAgent):
     facultad, grupo de investigación, etc.
     """
     
+    consulta_recuperacion = (
+        "nombre cargo rol profesor docente investigador director coordinador facultad programa "
+        "departamento grupo investigación semillero formación doctorado maestría área especialización"
+    )
+    
     @property
     def nombre_seccion(self) -> str:
         return "I. Datos básicos del entrevistado"
@@ -51,31 +56,41 @@ EVITAR frases como:
 FORMATO: Un párrafo breve y directo con los datos concretos.
 """
     
-    def process(self, transcripcion: str, nombre_entrevistado: str = None, info_entrevista = None) -> str:
+    @staticmethod
+    def construir_nombre_info(nombre_entrevistado: str = None, info_entrevista = None) -> str:
         """
-        Procesa la transcripción incluyendo el nombre del entrevistado.
+        Bloque con el nombre del entrevistado o los participantes, según el tipo de entrevista.
         
         Args:
-            transcripcion: Texto de la transcripción (puede incluir contexto).
             nombre_entrevistado: Nombre del entrevistado o área.
             info_entrevista: InfoEntrevista con detalles de tipo de entrevista.
         """
-        import time
-        from config import REGLAS_GLOBALES
-        
-        max_retries = 3
-        
-        # Construir información del encabezado según tipo de entrevista
         if info_entrevista and info_entrevista.es_grupal:
-            nombre_info = f"""
+            return f"""
 TIPO DE ENTREVISTA: GRUPAL
 PARTICIPANTES: {', '.join(info_entrevista.nombres)}
 ÁREA/DEPENDENCIA: {info_entrevista.area_dependencia or 'No especificada'}
 """
-        else:
-            nombre_info = f"\nNOMBRE DEL ENTREVISTADO: {nombre_entrevistado}\n" if nombre_entrevistado else ""
+        return f"\nNOMBRE DEL ENTREVISTADO: {nombre_entrevistado}\n" if nombre_entrevistado else ""
+    
+    def construir_prompt(self, transcripcion: str, nombre_entrevistado: str = None, info_entrevista = None) -> str:
+        """
+        Construye el prompt de usuario incluyendo el nombre del entrevistado.
+        
+        Args:
+            transcripcion: Texto de la transcripción (puede incluir contexto).
+            nombre_entrevistado: Nombre del entrevistado o área.
+            info_entrevista: InfoEntrevista con detalles de tipo de entrevista.
+        """
+        from config import REGLAS_GLOBALES
         
-        prompt_usuario = f"""{REGLAS_GLOBALES}
+        # Construir información del encabezado según tipo de entrevista
+        nombre_info = self.construir_nombre_info(nombre_entrevistado, info_entrevista)
+        
+        if self.disposicion_prompt == "prefijo":
+            return self.construir_prompt_prefijo(transcripcion, nombre_info)
+        
+        return f"""{REGLAS_GLOBALES}
 {nombre_info}
 {self.instrucciones_extraccion}
 
@@ -87,46 +102,3 @@ TRANSCRIPCIÓN DE LA ENTREVISTA:
 
 Genera ÚNICAMENTE la sección "{self.nombre_seccion}" en formato Markdown.
 """
-        
-        for attempt in range(max_retries):
-            try:
-                if self.provider == "openai":
-                    # Modelos nuevos usan max_completion_tokens
-                    use_new_param = any(x in self.model for x in ['gpt-4.1', 'gpt-5', 'o1', 'o3'])
-                    params = {
-                        "model": self.model,
-                        "messages": [
-                            {"role": "system", "content": self.prompt_sistema},
-                            {"role": "user", "content": prompt_usuario}
-                        ],
-                        "temperature": self.temperature
-                    }
-                    if use_new_param:
-                        params["max_completion_tokens"] = self.max_tokens
-                    else:
-                        params["max_tokens"] = self.max_tokens
-                    
-                    response = self.client.chat.completions.create(**params)
-                    return response.choices[0].message.content.strip()
-                else:  # gemini
-                    from google.genai import types
-                    prompt_completo = f"{self.prompt_sistema}\n\n{prompt_usuario}"
-                    response = self.client.models.generate_content(
-                        model=self.model,
-                        contents=prompt_completo,
-                        config=types.GenerateContentConfig(
-                            max_output_tokens=self.max_tokens,
-                            temperature=self.temperature
-                        )
-                    )
-                    return response.text.strip()
-            except Exception as e:
-                error_str = str(e)
-                if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str or "rate" in error_str.lower():
-                    wait_time = 10 * (attempt + 1)
-                    print(f"      ⏳ Rate limit. Esperando {wait_time}s...")
-                    time.sleep(wait_time)
-                    continue
-                return f"## {self.nombre_seccion}\n\n**Error al procesar:** {str(e)}"
-        
-        return f"## {self.nombre_seccion}\n\n**Error:** Rate limit excedido."
@@ -11,6 +11,13 @@ class AgenteDesarrolloInnovacion(BaseAgent):
     propuestas de innovación institucional y visión de aplicación de IA.
     """
     
+    bloques_requeridos = [2]
+    consulta_recuperacion = (
+        "desarrollo despliegue producción innovación transferencia tecnológica escalabilidad "
+        "sostenibilidad mantenimiento infraestructura servidores GPU cómputo nube recursos "
+        "laboratorio plataforma financiación"
+    )
+    
     @property
     def nombre_seccion(self) -> str:
         return "IV. Desarrollo, innovación y transferencia tecnológica"
@@ -11,6 +11,13 @@ class AgenteExperienciaTecnica(BaseAgent):
     arquitecturas y metodologías aplicadas.
     """
     
+    bloques_requeridos = [1]
+    consulta_recuperacion = (
+        "proyecto rol resultados grupo investigación semillero herramientas arquitectura "
+        "metodología framework modelo datos lenguaje Python TensorFlow PyTorch librería "
+        "integración institucional"
+    )
+    
     @property
     def nombre_seccion(self) -> str:
         return "III. Experiencia técnica y práctica aplicada"
@@ -0,0 +1,221 @@
+"""
+Agente que extrae las siete secciones del reporte detallado en una sola llamada.
+Alternativa a ejecutar un agente por sección: la transcripción se envía una vez
+y el modelo devuelve un JSON con una propiedad por sección.
+"""
+import asyncio
+import json
+import re
+from typing import Dict, List, Optional
+
+from .base_agent import BaseAgent
+from .agente_datos_basicos import AgenteDatosBasicos
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import REGLAS_GLOBALES, MAX_TOKENS_CONJUNTA
+
+# Las reglas globales piden devolver solo Markdown; esta llamada devuelve JSON
+REGLA_MARKDOWN = "- Devolver SOLO el contenido de tu sección en Markdown, sin comentarios adicionales."
+REGLA_JSON = (
+    "- Devolver SOLO el objeto JSON pedido, sin comentarios adicionales. El valor de "
+    "cada propiedad es el contenido de su sección en Markdown."
+)
+REGLAS_CONJUNTA = REGLAS_GLOBALES.replace(REGLA_MARKDOWN, REGLA_JSON)
+
+
+class AgenteExtraccionConjunta(BaseAgent):
+    """
+    Pide al modelo, con salida estructurada (JSON Schema), todas las secciones
+    que generan los agentes indicados, y reparte la respuesta en el mismo
+    Markdown "## Sección" que produciría cada agente por separado.
+    
+    Las secciones que falten o vengan vacías (JSON inválido, respuesta truncada,
+    error del proveedor) se generan con la llamada individual de su agente.
+    """
+    
+    def __init__(self, agentes: List[BaseAgent], cliente=None):
+        """
+        Args:
+            agentes: Agentes de sección, en el orden del reporte.
+            cliente: Cliente LLM compartido (por defecto, el del proceso).
+        """
+        super().__init__(cliente)
+        self.agentes = agentes
+        self.max_tokens = MAX_TOKENS_CONJUNTA
+        
+        # Secciones que tuvieron que generarse con su agente en la última ejecución
+        self.secciones_respaldo: List[str] = []
+    
+    @property
+    def nombre_seccion(self) -> str:
+        return "Extracción conjunta"
+    
+    @property
+    def prompt_sistema(self) -> str:
+        return """Eres un agente especializado en elaborar reportes de entrevistas sobre inteligencia
+artificial en la Universidad Tecnológica de Pereira (UTP).
+
+Debes redactar TODAS las secciones del reporte detallado a partir de una misma transcripción.
+Cada sección sigue sus propias instrucciones, que se indican a continuación junto con el rol
+del especialista que normalmente la redacta. No repitas contenido entre secciones.
+
+Devuelve un objeto JSON con una propiedad por sección. El valor de cada propiedad es el
+contenido Markdown de esa sección SIN el encabezado "## ..." (se añade automáticamente)."""
+
+    def _clave(self, indice: int) -> str:
+        return f"seccion_{indice + 1}"
+    
+    @property
+    def instrucciones_extraccion(self) -> str:
+        bloques = []
+        for i, agente in enumerate(self.agentes):
+            bloques.append(f"""
+=== PROPIEDAD "{self._clave(i)}": {agente.nombre_seccion} ===
+
+ROL DEL ESPECIALISTA:
+{agente.prompt_sistema}
+{agente.instrucciones_extraccion}""")
+        return "\n".join(bloques)
+    
+    @property
+    def esquema(self) -> dict:
+        """JSON Schema de la respuesta: una propiedad de texto por sección."""
+        propiedades = {
+            self._clave(i): {"type": "string", "description": agente.nombre_seccion}
+            for i, agente in enumerate(self.agentes)
+        }
+        return {
+            "type": "object",
+            "properties": propiedades,
+            "required": list(propiedades),
+        }
+    
+    def construir_prompt(self, transcripcion: str, nombre_entrevistado: str = None, info_entrevista = None) -> str:
+        """
+        Construye el prompt conjunto con las instrucciones de todas las secciones.
+        
+        Args:
+            transcripcion: Texto de la transcripción (puede incluir contexto).
+            nombre_entrevistado: Nombre del entrevistado o área.
+            info_entrevista: InfoEntrevista con detalles de tipo de entrevista.
+        """
+        nombre_info = AgenteDatosBasicos.construir_nombre_info(nombre_entrevistado, info_entrevista)
+        instruccion_final = "Genera el objeto JSON con todas las secciones."
+        
+        if self.disposicion_prompt == "prefijo":
+            # El prefijo con las reglas globales se comparte con los demás agentes
+            # (caché de prefijos): la regla de salida se corrige en la tarea
+            instruccion_final = (
+                "En esta tarea la regla global de devolver solo Markdown se aplica al "
+                f"contenido de cada propiedad; la respuesta completa es el objeto JSON.\n{instruccion_final}"
+            )
+            return self.construir_prompt_prefijo(transcripcion, nombre_info, instruccion_final)
+        
+        return f"""{REGLAS_CONJUNTA}
+{nombre_info}
+{self.instrucciones_extraccion}
+
+---
+TRANSCRIPCIÓN DE LA ENTREVISTA:
+---
+{transcripcion}
+---
+
+{instruccion_final}
+"""
+
+    def _interpretar_resultado(self, resultado: str) -> Dict[int, str]:
+        """
+        Convierte la respuesta JSON en secciones Markdown, por índice de agente.
+        Omite las secciones ausentes o vacías.
+        """
+        texto = re.sub(r'^```(?:json)?\s*|\s*```$', '', resultado.strip())
+        try:
+            datos = json.loads(texto)
+        except json.JSONDecodeError:
+            return {}
+        if not isinstance(datos, dict):
+            return {}
+        
+        secciones = {}
+        for i, agente in enumerate(self.agentes):
+            contenido = datos.get(self._clave(i))
+            if not isinstance(contenido, str) or not contenido.strip():
+                continue
+            # Quitar el encabezado de la sección si el modelo lo incluyó de todas
+            # formas (otros encabezados iniciales, como "### Subsección", se conservan)
+            contenido = re.sub(
+                rf'^#{{1,3}}\s*{re.escape(agente.nombre_seccion)}\s*:?\s*(?:\n+|$)', '', contenido.strip(), flags=re.IGNORECASE
+            )
+            secciones[i] = f"## {agente.nombre_seccion}\n\n{contenido.strip()}"
+        return secciones
+    
+    def _argumentos_agente(self, agente: BaseAgent, nombre_entrevistado: str, info_entrevista) -> tuple:
+        if isinstance(agente, AgenteDatosBasicos):
+            return (nombre_entrevistado, info_entrevista)
+        return ()
+    
+    def process(
+        self, transcripcion: str, nombre_entrevistado: str = None, info_entrevista = None,
+        textos_agentes: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        Genera todas las secciones con una sola llamada.
+        
+        Args:
+            transcripcion: Texto de la transcripción (puede incluir contexto).
+            nombre_entrevistado: Nombre del entrevistado o área.
+            info_entrevista: InfoEntrevista con detalles de tipo de entrevista.
+            textos_agentes: Texto de cada agente, en su orden, para las secciones
+                            de respaldo (vista, bloques o pasajes propios). Por
+                            defecto todos reciben `transcripcion`.
+        
+        Returns:
+            Lista con el Markdown de cada sección, en el orden de los agentes.
+        """
+        prompt = self.construir_prompt(transcripcion, nombre_entrevistado, info_entrevista)
+        try:
+            resultado = self.cliente.generar(
+                prompt, self.prompt_sistema_llamada, self.max_tokens, self.temperature, esquema=self.esquema, agente=type(self).__name__
+            )
+            secciones = self._interpretar_resultado(resultado)
+        except Exception as e:
+            print(f"      ⚠ Extracción conjunta fallida ({e}); se usan los agentes individuales")
+            secciones = {}
+        
+        textos_agentes = textos_agentes or [transcripcion] * len(self.agentes)
+        self.secciones_respaldo = []
+        for i, agente in enumerate(self.agentes):
+            if i not in secciones:
+                self.secciones_respaldo.append(agente.nombre_seccion)
+                secciones[i] = agente.process(textos_agentes[i], *self._argumentos_agente(agente, nombre_entrevistado, info_entrevista))
+        
+        return [secciones[i] for i in range(len(self.agentes))]
+    
+    async def process_async(
+        self, transcripcion: str, nombre_entrevistado: str = None, info_entrevista = None,
+        textos_agentes: Optional[List[str]] = None
+    ) -> List[str]:
+        """Versión asíncrona de `process`; las secciones de respaldo se generan en paralelo."""
+        prompt = self.construir_prompt(transcripcion, nombre_entrevistado, info_entrevista)
+        try:
+            resultado = await self.cliente.generar_async(
+                prompt, self.prompt_sistema_llamada, self.max_tokens, self.temperature, esquema=self.esquema, agente=type(self).__name__
+            )
+            secciones = self._interpretar_resultado(resultado)
+        except Exception as e:
+            print(f"      ⚠ Extracción conjunta fallida ({e}); se usan los agentes individuales")
+            secciones = {}
+        
+        textos_agentes = textos_agentes or [transcripcion] * len(self.agentes)
+        faltantes = [i for i in range(len(self.agentes)) if i not in secciones]
+        self.secciones_respaldo = [self.agentes[i].nombre_seccion for i in faltantes]
+        respaldos = await asyncio.gather(*[
+            self.agentes[i].process_async(textos_agentes[i], *self._argumentos_agente(self.agentes[i], nombre_entrevistado, info_entrevista))
+            for i in faltantes
+        ])
+        secciones.update(zip(faltantes, respaldos))
+        
+        return [secciones[i] for i in range(len(self.agentes))]
@@ -5,7 +5,7 @@ y genera el reporte final consolidado.
 import asyncio
 import re
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from .base_agent import BaseAgent
 from .agente_correccion import AgenteCorreccion
@@ -17,11 +17,21 @@ from .agente_colaboracion_liderazgo import AgenteColaboracionLiderazgo
 from .agente_motivacion_proyeccion import AgenteMotivacionProyeccion
 from .agente_hallazgos_clave import AgenteHallazgosClave
 from .agente_narrativo import AgenteNarrativo
+from .agente_extraccion_conjunta import AgenteExtraccionConjunta
 
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import (
+    EXTRACCION_CONJUNTA, MODO_CORRECCION, CORRECCION_UMBRAL_FUERA_LEXICO,
+    VISTA_TRANSCRIPCION, SEGMENTACION_BLOQUES, BLOQUES_CONFIANZA_MINIMA,
+    RECUPERACION_PASAJES, RECUPERACION_TOKENS, RECUPERACION_MAX_PASAJES
+)
 from utils.detector_entrevista import detectar_tipo_entrevista, generar_instruccion_contexto, InfoEntrevista
+from utils.turnos import IndiceTurnos
+from utils.bloques import segmentar_bloques
+from utils.recuperacion import IndiceBM25
+from llm import ClienteLLM, ErrorPresupuestoTokens, PlanLlamada, estimar_tokens, obtener_cliente_llm, resumen_plan
 
 
 def limpiar_markdown(texto: str) -> str:
@@ -41,23 +51,61 @@ class AgenteIntegrador:
     concatena sus resultados en un reporte final estructurado.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        cliente: ClienteLLM = None,
+        extraccion_conjunta: bool = EXTRACCION_CONJUNTA,
+        modo_correccion: str = MODO_CORRECCION,
+        umbral_fuera_lexico: float = CORRECCION_UMBRAL_FUERA_LEXICO,
+        vista_transcripcion: str = VISTA_TRANSCRIPCION,
+        segmentacion_bloques: bool = SEGMENTACION_BLOQUES,
+        recuperacion_pasajes: bool = RECUPERACION_PASAJES
+    ):
+        """
+        Args:
+            cliente: Cliente LLM compartido por todos los agentes.
+                     Por defecto, el cliente único del proceso.
+            extraccion_conjunta: Si True, las siete secciones se piden en una
+                     sola llamada con salida JSON (AgenteExtraccionConjunta).
+            modo_correccion: "completo", "diferencias" o "tramos" (ver AgenteCorreccion).
+            umbral_fuera_lexico: Fracción máxima de palabras fuera del léxico
+                     verificado para omitir la corrección con LLM (0 = nunca).
+            vista_transcripcion: Vista de la transcripción para los agentes de
+                     sección que no declaran la suya ("completa", "entrevistado"
+                     o "sin_preguntas", ver utils/turnos.py).
+            segmentacion_bloques: Si True, los agentes que declaran
+                     `bloques_requeridos` reciben solo esos bloques de la
+                     entrevista (ver utils/bloques.py).
+            recuperacion_pasajes: Si True, los agentes que declaran
+                     `consulta_recuperacion` reciben solo los pasajes más
+                     relevantes de su vista (ver utils/recuperacion.py).
+        """
+        cliente = cliente or obtener_cliente_llm()
+        
         # Agente de corrección (se ejecuta primero)
-        self.agente_correccion = AgenteCorreccion()
+        self.agente_correccion = AgenteCorreccion(cliente, modo_correccion, umbral_fuera_lexico=umbral_fuera_lexico)
         
         # Agentes de análisis en orden
         self.agentes: List[BaseAgent] = [
-            AgenteDatosBasicos(),
-            AgenteResumenGeneral(),
-            AgenteExperienciaTecnica(),
-            AgenteDesarrolloInnovacion(),
-            AgenteColaboracionLiderazgo(),
-            AgenteMotivacionProyeccion(),
-            AgenteHallazgosClave(),
+            AgenteDatosBasicos(cliente),
+            AgenteResumenGeneral(cliente),
+            AgenteExperienciaTecnica(cliente),
+            AgenteDesarrolloInnovacion(cliente),
+            AgenteColaboracionLiderazgo(cliente),
+            AgenteMotivacionProyeccion(cliente),
+            AgenteHallazgosClave(cliente),
         ]
         
         # Agente para reporte narrativo (se ejecuta aparte)
-        self.agente_narrativo = AgenteNarrativo()
+        self.agente_narrativo = AgenteNarrativo(cliente)
+        
+        # Agente que reemplaza a los de sección con una única llamada (opcional)
+        self.agente_conjunto = AgenteExtraccionConjunta(self.agentes, cliente) if extraccion_conjunta else None
+        
+        self.vista_transcripcion = vista_transcripcion
+        self.segmentacion_bloques = segmentacion_bloques
+        self.recuperacion_pasajes = recuperacion_pasajes
+        self.cliente = cliente
         
         # Almacenar correcciones para incluir en el reporte
         self.correcciones_realizadas = ""
@@ -139,6 +187,122 @@ class AgenteIntegrador:
 
 """
     
+    def _clave_agente(self, agente: BaseAgent) -> Tuple[str, Optional[Tuple[int, ...]], Optional[str]]:
+        """Vista, bloques y consulta de recuperación con que se arma el texto de un agente de sección."""
+        vista = agente.vista_transcripcion or self.vista_transcripcion
+        bloques = None
+        if self.segmentacion_bloques and agente.bloques_requeridos:
+            bloques = tuple(agente.bloques_requeridos)
+        consulta = agente.consulta_recuperacion if self.recuperacion_pasajes else None
+        return vista, bloques, consulta
+    
+    def _textos_agentes(self, transcripcion: str, contexto_entrevista: str, verbose: bool = False) -> Dict[tuple, str]:
+        """
+        Transcripción con el contexto de la entrevista en cada vista,
+        selección de bloques y consulta que usan los agentes de sección, a
+        partir de un único índice de turnos, una única segmentación y un único
+        índice BM25.
+        
+        Args:
+            transcripcion: Texto de la transcripción.
+            contexto_entrevista: Instrucción de contexto que se antepone.
+            verbose: Si True, muestra el tamaño de cada vista reducida y de
+                     los pasajes recuperados.
+        
+        Returns:
+            Diccionario (vista, bloques, consulta) -> texto para el prompt.
+            La extracción conjunta usa (vista del integrador, None, None).
+        """
+        indice = IndiceTurnos(transcripcion)
+        claves = [(self.vista_transcripcion, None, None)] + [self._clave_agente(a) for a in self.agentes]
+        segmentacion = None
+        if any(bloques for _, bloques, _ in claves):
+            segmentacion = segmentar_bloques(indice)
+            if verbose:
+                print("  " + segmentacion.resumen())
+        indice_bm25 = None
+        
+        textos = {}
+        for vista, bloques, consulta in dict.fromkeys(claves):
+            turnos = segmentacion.seleccionar(bloques, BLOQUES_CONFIANZA_MINIMA) if bloques else None
+            pasajes = None
+            if consulta:
+                if indice_bm25 is None:
+                    indice_bm25 = IndiceBM25(
+                        indice, lambda t: estimar_tokens(t, self.cliente.provider, self.cliente.model)
+                    )
+                pasajes = indice_bm25.recuperar(
+                    consulta, RECUPERACION_TOKENS, RECUPERACION_MAX_PASAJES,
+                    lambda p: indice.incluye(p.turno, vista, turnos)
+                )
+            if pasajes:
+                textos[vista, bloques, consulta] = contexto_entrevista + "\n" + indice_bm25.texto(pasajes)
+            else:
+                textos[vista, bloques, consulta] = contexto_entrevista + "\n" + indice.vista(vista, turnos)
+            if verbose and vista != "completa" and not bloques and not consulta:
+                print("  " + indice.resumen(vista))
+            if verbose and bloques and turnos is None:
+                print(f"    ↺ Bloques {list(bloques)}: segmentación poco confiable, se envía la transcripción completa")
+            if verbose and pasajes:
+                tokens = sum(p.tokens for p in pasajes)
+                print(f"    ⌕ Pasajes para \"{' '.join(consulta.split()[:3])}...\": "
+                      f"{len(pasajes)} de {len(indice_bm25.pasajes)}, ~{tokens} tokens")
+        return textos
+    
+    def planificar(self, transcripcion: str, nombre_entrevistado: str, contexto_entrevista: str = "") -> List[PlanLlamada]:
+        """
+        Presupuesto de tokens de todas las llamadas de una entrevista, antes de
+        la primera. Los agentes de análisis reciben la transcripción corregida,
+        que aún no existe; se estima con la original, de longitud similar.
+        
+        Args:
+            transcripcion: Texto completo de la transcripción (sin corregir).
+            nombre_entrevistado: Nombre del entrevistado.
+            contexto_entrevista: Instrucción de contexto que se antepone a la transcripción.
+            
+        Returns:
+            Lista de PlanLlamada en orden de ejecución.
+        """
+        transcripcion_con_contexto = contexto_entrevista + "\n" + transcripcion
+        textos = self._textos_agentes(transcripcion, contexto_entrevista)
+        planes = list(self.agente_correccion.planificar(transcripcion))
+        
+        if self.agente_conjunto:
+            planes.append(self.agente_conjunto.planificar(textos[self.vista_transcripcion, None, None], nombre_entrevistado, self.info_entrevista))
+        else:
+            for agente in self.agentes:
+                texto_agente = textos[self._clave_agente(agente)]
+                if isinstance(agente, AgenteDatosBasicos):
+                    planes.append(agente.planificar(texto_agente, nombre_entrevistado, self.info_entrevista))
+                else:
+                    planes.append(agente.planificar(texto_agente))
+        
+        planes.append(self.agente_narrativo.planificar(transcripcion_con_contexto, nombre_entrevistado, self.info_entrevista))
+        return planes
+    
+    def _verificar_presupuesto(self, transcripcion: str, nombre_entrevistado: str, contexto_entrevista: str, verbose: bool) -> None:
+        """
+        Muestra el gasto de tokens planificado y rechaza la entrevista antes de
+        la primera llamada si algún prompt no cabe en la ventana del modelo.
+        """
+        planes = self.planificar(transcripcion, nombre_entrevistado, contexto_entrevista)
+        if verbose:
+            print("  " + resumen_plan(planes))
+        
+        excedidos = [p for p in planes if not p.cabe]
+        if excedidos:
+            raise ErrorPresupuestoTokens(
+                f"{len(excedidos)} prompt(s) no caben en la ventana de {excedidos[0].ventana} tokens: "
+                + ", ".join(f"{p.agente} (~{p.tokens_entrada})" for p in excedidos)
+            )
+    
+    def _informar_conjunta(self, total_agentes: int) -> None:
+        """Muestra cuántas secciones salieron de la llamada conjunta."""
+        respaldo = self.agente_conjunto.secciones_respaldo
+        print(f"  ✓ Extracción conjunta: {total_agentes - len(respaldo)}/{total_agentes} secciones en una llamada")
+        for nombre in respaldo:
+            print(f"    ↺ Generada con su agente: {nombre}")
+    
     def procesar_secuencial(
         self, 
         transcripcion: str, 
@@ -154,7 +318,7 @@ class AgenteIntegrador:
             verbose: Si True, muestra progreso en consola.
             
         Returns:
-            Reporte completo en formato Markdown.
+            Diccionario con 'detallado', 'narrativo' y 'secciones' (ver `procesar`).
         """
         # Detectar tipo de entrevista (individual/grupal)
         self.info_entrevista = detectar_tipo_entrevista(transcripcion, nombre_entrevistado)
@@ -166,6 +330,8 @@ class AgenteIntegrador:
             if self.info_entrevista.es_grupal and self.info_entrevista.area_dependencia:
                 print(f"  Área/Dependencia: {self.info_entrevista.area_dependencia}")
         
+        self._verificar_presupuesto(transcripcion, nombre_entrevistado, contexto_entrevista, verbose)
+        
         # PASO 0: Corregir errores de transcripción
         if verbose:
             print(f"  [0/8] Corrigiendo errores de transcripción...")
@@ -179,27 +345,46 @@ class AgenteIntegrador:
         
         if verbose:
             n_correcciones = self.agente_correccion.contar_correcciones(self.correcciones_realizadas)
-            print(f"  [0/8] ✓ Corrección completada ({n_correcciones} correcciones)")
+            origen = "reutilizada de una ejecución anterior, " if resultado_correccion.get('reutilizada') else ""
+            print(f"  [0/8] ✓ Corrección completada ({origen}{n_correcciones} correcciones)")
+        
+        # Vistas de la transcripción corregida para los agentes de sección
+        textos = self._textos_agentes(transcripcion_corregida, contexto_entrevista, verbose)
         
         # Procesar con los agentes de análisis usando la transcripción corregida
         secciones = []
         total_agentes = len(self.agentes)
         
-        for i, agente in enumerate(self.agentes, 1):
+        if self.agente_conjunto:
             if verbose:
-                print(f"  [{i}/{total_agentes}] Procesando: {agente.nombre_seccion}...")
-            
-            # El agente de datos básicos recibe el nombre del entrevistado y la info
-            if isinstance(agente, AgenteDatosBasicos):
-                resultado = agente.process(transcripcion_con_contexto, nombre_entrevistado, self.info_entrevista)
-            else:
-                resultado = agente.process(transcripcion_con_contexto)
-            
-            resultado = limpiar_markdown(resultado)
-            secciones.append(resultado)
-            
+                print(f"  [1-{total_agentes}/{total_agentes}] Extracción conjunta de las secciones...")
+            secciones = [
+                limpiar_markdown(s) for s in
+                self.agente_conjunto.process(
+                    textos[self.vista_transcripcion, None, None], nombre_entrevistado, self.info_entrevista,
+                    [textos[self._clave_agente(agente)] for agente in self.agentes]
+                )
+            ]
             if verbose:
-                print(f"  [{i}/{total_agentes}] ✓ Completado: {agente.nombre_seccion}")
+                self._informar_conjunta(total_agentes)
+        else:
+            for i, agente in enumerate(self.agentes, 1):
+                if verbose:
+                    print(f"  [{i}/{total_agentes}] Procesando: {agente.nombre_seccion}...")
+                
+                # El agente de datos básicos recibe el nombre del entrevistado y la info
+                texto_agente = textos[self._clave_agente(agente)]
+                if isinstance(agente, AgenteDatosBasicos):
+                    resultado = agente.process(texto_agente, nombre_entrevistado, self.info_entrevista)
+                else:
+                    resultado = agente.process(texto_agente)
+                
+                resultado = limpiar_markdown(resultado)
+                secciones.append(resultado)
+                
+                if verbose:
+                    print(f"  [{i}/{total_agentes}] ✓ Completado: {agente.nombre_seccion}")
+            
         
         # Generar reporte narrativo
         if verbose:
@@ -229,7 +414,8 @@ class AgenteIntegrador:
         
         return {
             'detallado': reporte_detallado,
-            'narrativo': reporte_narrativo
+            'narrativo': reporte_narrativo,
+            'secciones': dict(zip((a.nombre_seccion for a in self.agentes), secciones))
         }
     
     async def procesar_paralelo(
@@ -247,7 +433,7 @@ class AgenteIntegrador:
             verbose: Si True, muestra progreso en consola.
             
         Returns:
-            Diccionario con 'detallado' y 'narrativo'.
+            Diccionario con 'detallado', 'narrativo' y 'secciones' (ver `procesar`).
         """
         # Detectar tipo de entrevista (individual/grupal)
         self.info_entrevista = detectar_tipo_entrevista(transcripcion, nombre_entrevistado)
@@ -259,11 +445,13 @@ class AgenteIntegrador:
             if self.info_entrevista.es_grupal and self.info_entrevista.area_dependencia:
                 print(f"  Área/Dependencia: {self.info_entrevista.area_dependencia}")
         
+        self._verificar_presupuesto(transcripcion, nombre_entrevistado, contexto_entrevista, verbose)
+        
         # PASO 0: Corregir errores de transcripción (secuencial, antes del paralelo)
         if verbose:
             print(f"  [0] Corrigiendo errores de transcripción...")
         
-        resultado_correccion = self.agente_correccion.process(transcripcion)
+        resultado_correccion = await self.agente_correccion.process_async(transcripcion)
         transcripcion_corregida = resultado_correccion['texto_corregido']
         self.correcciones_realizadas = resultado_correccion['correcciones']
         
@@ -272,27 +460,62 @@ class AgenteIntegrador:
         
         if verbose:
             n_correcciones = self.agente_correccion.contar_correcciones(self.correcciones_realizadas)
-            print(f"  [0] ✓ Corrección completada ({n_correcciones} correcciones)")
-            print(f"  Ejecutando {len(self.agentes) + 1} agentes en paralelo...")
+            origen = "reutilizada de una ejecución anterior, " if resultado_correccion.get('reutilizada') else ""
+            print(f"  [0] ✓ Corrección completada ({origen}{n_correcciones} correcciones)")
+        
+        # Vistas de la transcripción corregida para los agentes de sección
+        textos = self._textos_agentes(transcripcion_corregida, contexto_entrevista, verbose)
+        
+        if verbose:
+            if self.agente_conjunto:
+                print(f"  Ejecutando extracción conjunta y reporte narrativo en paralelo...")
+            else:
+                print(f"  Ejecutando {len(self.agentes) + 1} agentes en paralelo...")
         
         # Crear tareas - el primer agente (datos básicos) recibe el nombre y la info
-        async def procesar_agente(agente, idx):
+        def procesar_agente(agente):
+            texto_agente = textos[self._clave_agente(agente)]
             if isinstance(agente, AgenteDatosBasicos):
-                return agente.process(transcripcion_con_contexto, nombre_entrevistado, self.info_entrevista)
+                return agente.process_async(texto_agente, nombre_entrevistado, self.info_entrevista)
             else:
-                return await agente.process_async(transcripcion_con_contexto)
+                return agente.process_async(texto_agente)
         
         # Ejecutar todos los agentes en paralelo (incluyendo narrativo)
-        tareas = [procesar_agente(agente, i) for i, agente in enumerate(self.agentes)]
+        if self.agente_conjunto:
+            tareas = [self.agente_conjunto.process_async(
+                textos[self.vista_transcripcion, None, None], nombre_entrevistado, self.info_entrevista,
+                [textos[self._clave_agente(agente)] for agente in self.agentes]
+            )]
+            entradas = [(self.agente_conjunto, textos[self.vista_transcripcion, None, None])]
+        else:
+            tareas = [procesar_agente(agente) for agente in self.agentes]
+            entradas = [(agente, textos[self._clave_agente(agente)]) for agente in self.agentes]
         tareas.append(self.agente_narrativo.process_async(transcripcion_con_contexto, nombre_entrevistado, self.info_entrevista))
-        
-        resultados = await asyncio.gather(*tareas)
+        entradas.append((self.agente_narrativo, transcripcion_con_contexto))
+        
+        # El primer agente calienta la caché de prefijos del proveedor, solo si
+        # otro comparte su prefijo (la misma transcripción); con vistas, bloques
+        # o pasajes recuperados propios no hay nada que reutilizar
+        agente_primero, texto_primero = entradas[0]
+        comparten_prefijo = agente_primero.disposicion_prompt == "prefijo" and any(
+            agente.disposicion_prompt == "prefijo" and texto == texto_primero
+            for agente, texto in entradas[1:]
+        )
+        if comparten_prefijo:
+            primero = await tareas[0]
+            resultados = [primero] + list(await asyncio.gather(*tareas[1:]))
+        else:
+            resultados = await asyncio.gather(*tareas)
         
         # Separar resultados: los primeros son del reporte detallado, el último es narrativo
+        if self.agente_conjunto:
+            resultados = list(resultados[0]) + [resultados[-1]]
         resultados_detallado = [limpiar_markdown(r) for r in resultados[:-1]]
         resultado_narrativo = limpiar_markdown(resultados[-1])
         
         if verbose:
+            if self.agente_conjunto:
+                self._informar_conjunta(len(self.agentes))
             print(f"  ✓ Todos los agentes completados")
         
         # Construir reporte detallado
@@ -313,7 +536,8 @@ class AgenteIntegrador:
         
         return {
             'detallado': reporte_detallado,
-            'narrativo': reporte_narrativo
+            'narrativo': reporte_narrativo,
+            'secciones': dict(zip((a.nombre_seccion for a in self.agentes), resultados_detallado))
         }
     
     def procesar(
@@ -333,7 +557,9 @@ class AgenteIntegrador:
             verbose: Si True, muestra progreso en consola.
             
         Returns:
-            Diccionario con 'detallado' (reporte estructurado) y 'narrativo' (perfil general).
+            Diccionario con 'detallado' (reporte estructurado), 'narrativo' (perfil
+            general) y 'secciones' (título -> Markdown de cada sección del
+            reporte detallado, sin encabezado ni pie).
         """
         if paralelo:
             return asyncio.run(
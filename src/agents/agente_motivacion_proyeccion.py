@@ -11,6 +11,12 @@ class AgenteMotivacionProyeccion(BaseAgent):
     de apoyo institucional y proyección profesional.
     """
     
+    bloques_requeridos = [4]
+    consulta_recuperacion = (
+        "motivación impulsa propósito proyección profesional crecimiento carrera acompañamiento "
+        "apoyo institucional expectativas inspiración metas"
+    )
+    
     @property
     def nombre_seccion(self) -> str:
         return "VI. Motivación y proyección profesional"
@@ -194,6 +194,12 @@ Usa pronombres y sustantivos masculinos:
 ===================================
 """
         
+        if self.disposicion_prompt == "prefijo":
+            return self.construir_prompt_prefijo(
+                transcripcion, instruccion_contexto,
+                instruccion_final="Genera el reporte narrativo en formato Markdown. Comienza directamente con el texto, sin encabezados."
+            )
+        
         return f"""
 {instruccion_contexto}
 
@@ -210,35 +216,15 @@ TRANSCRIPCIÓN DE LA ENTREVISTA:
 Genera el reporte narrativo en formato Markdown. Comienza directamente con el texto, sin encabezados.
 """
     
-    def process(self, transcripcion: str, nombre_entrevistado: str = None, info_entrevista = None) -> str:
+    def construir_prompt(self, transcripcion: str, nombre_entrevistado: str = None, info_entrevista = None) -> str:
         """
-        Procesa la transcripción y genera el reporte narrativo.
+        Construye el prompt del reporte narrativo.
         
         Args:
             transcripcion: Texto de la transcripción.
             nombre_entrevistado: Nombre del entrevistado para determinar género.
             info_entrevista: InfoEntrevista con detalles de tipo de entrevista.
-            
-        Returns:
-            Reporte narrativo en formato Markdown.
         """
         if nombre_entrevistado or info_entrevista:
-            prompt_usuario = self.construir_prompt_usuario_con_nombre(transcripcion, nombre_entrevistado, info_entrevista)
-        else:
-            prompt_usuario = self.construir_prompt_usuario(transcripcion)
-        
-        if self.provider == "openai":
-            return self._llamar_openai(self.prompt_sistema, prompt_usuario)
-        else:
-            prompt_completo = f"{self.prompt_sistema}\n\n{prompt_usuario}"
-            return self._llamar_gemini(prompt_completo)
-    
-    async def process_async(self, transcripcion: str, nombre_entrevistado: str = None, info_entrevista = None) -> str:
-        """
-        Versión asíncrona de process.
-        """
-        import asyncio
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None, lambda: self.process(transcripcion, nombre_entrevistado, info_entrevista)
-        )
+            return self.construir_prompt_usuario_con_nombre(transcripcion, nombre_entrevistado, info_entrevista)
+        return self.construir_prompt_usuario(transcripcion)
@@ -8,12 +8,26 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from abc import ABC, abstractmethod
-from config import (
-    LLM_PROVIDER, 
-    OPENAI_API_KEY, OPENAI_MODEL,
-    GOOGLE_API_KEY, GEMINI_MODEL,
-    MAX_TOKENS, TEMPERATURE, REGLAS_GLOBALES
-)
+from typing import List, Optional
+from config import MAX_TOKENS, TEMPERATURE, REGLAS_GLOBALES, DISPOSICION_PROMPT
+from llm import ClienteLLM, ErrorLimiteTasa, PlanLlamada, obtener_cliente_llm
+
+
+def construir_prefijo_transcripcion(transcripcion: str) -> str:
+    """
+    Prefijo común de los prompts en la disposición "prefijo".
+    
+    Solo depende de la transcripción, por lo que es idéntico byte a byte para
+    todos los agentes de una entrevista y el proveedor puede servir esos tokens
+    desde su caché de prefijos.
+    """
+    return f"""{REGLAS_GLOBALES}
+---
+TRANSCRIPCIÓN DE LA ENTREVISTA:
+---
+{transcripcion}
+---
+"""
 
 
 class BaseAgent(ABC):
@@ -23,19 +37,30 @@ class BaseAgent(ABC):
     Soporta OpenAI y Gemini como proveedores.
     """
     
-    def __init__(self):
-        self.provider = LLM_PROVIDER.lower()
+    # Vista de la transcripción que recibe el agente dentro de AgenteIntegrador:
+    # "completa", "entrevistado" o "sin_preguntas" (ver utils/turnos.py).
+    # None usa la vista configurada en el integrador (VISTA_TRANSCRIPCION).
+    vista_transcripcion: Optional[str] = None
+    
+    # Bloques de la guía de entrevista (1-4, ver utils/bloques.py) que necesita el
+    # agente cuando la segmentación por bloques está activada. None = toda la transcripción.
+    bloques_requeridos: Optional[List[int]] = None
+    
+    # Términos de búsqueda con que el agente elige sus pasajes cuando la recuperación
+    # está activada (ver utils/recuperacion.py). None = su vista entera.
+    consulta_recuperacion: Optional[str] = None
+    
+    def __init__(self, cliente: ClienteLLM = None):
+        """
+        Args:
+            cliente: Cliente LLM a usar. Por defecto, el compartido del proceso.
+        """
+        self.cliente = cliente or obtener_cliente_llm()
+        self.provider = self.cliente.provider
+        self.model = self.cliente.model
         self.max_tokens = MAX_TOKENS
         self.temperature = TEMPERATURE
-        
-        if self.provider == "openai":
-            from openai import OpenAI
-            self.client = OpenAI(api_key=OPENAI_API_KEY)
-            self.model = OPENAI_MODEL
-        else:  # gemini
-            from google import genai
-            self.client = genai.Client(api_key=GOOGLE_API_KEY)
-            self.model = GEMINI_MODEL
+        self.disposicion_prompt = DISPOSICION_PROMPT
     
     @property
     @abstractmethod
@@ -55,10 +80,46 @@ class BaseAgent(ABC):
         """Instrucciones específicas sobre qué información extraer."""
         pass
     
+    @property
+    def prompt_sistema_llamada(self) -> Optional[str]:
+        """
+        Prompt de sistema que se envía al proveedor.
+        En la disposición "prefijo" el rol del agente va al final del mensaje de
+        usuario, porque un prompt de sistema distinto por agente rompería el prefijo.
+        """
+        if self.disposicion_prompt == "prefijo":
+            return None
+        return self.prompt_sistema
+    
+    def construir_prompt_prefijo(self, transcripcion: str, datos_adicionales: str = "", instruccion_final: str = None) -> str:
+        """
+        Construye el prompt en la disposición "prefijo": reglas globales y
+        transcripción primero, y el rol e instrucciones del agente al final.
+        
+        Args:
+            transcripcion: Texto de la transcripción.
+            datos_adicionales: Datos propios del agente (ej: nombre del entrevistado).
+            instruccion_final: Última línea del prompt. Por defecto pide la sección del agente.
+        """
+        if instruccion_final is None:
+            instruccion_final = f'Genera ÚNICAMENTE la sección "{self.nombre_seccion}" en formato Markdown.'
+        
+        return f"""{construir_prefijo_transcripcion(transcripcion)}
+=== TAREA DEL AGENTE ===
+{self.prompt_sistema}
+{datos_adicionales}
+{self.instrucciones_extraccion}
+
+{instruccion_final}
+"""
+    
     def construir_prompt_usuario(self, transcripcion: str) -> str:
         """
         Construye el prompt de usuario con la transcripción.
         """
+        if self.disposicion_prompt == "prefijo":
+            return self.construir_prompt_prefijo(transcripcion)
+        
         return f"""
 {REGLAS_GLOBALES}
 
@@ -73,70 +134,49 @@ TRANSCRIPCIÓN DE LA ENTREVISTA:
 Genera ÚNICAMENTE la sección "{self.nombre_seccion}" en formato Markdown.
 """
     
-    def _llamar_openai(self, prompt_sistema: str, prompt_usuario: str) -> str:
-        """Llama a la API de OpenAI."""
-        # Modelos nuevos (gpt-4.1, o1, etc.) usan max_completion_tokens
-        # Modelos antiguos (gpt-4o-mini, gpt-4, etc.) usan max_tokens
-        use_new_param = any(x in self.model for x in ['gpt-4.1', 'gpt-5', 'o1', 'o3'])
-        
-        params = {
-            "model": self.model,
-            "messages": [
-                {"role": "system", "content": prompt_sistema},
-                {"role": "user", "content": prompt_usuario}
-            ],
-            "temperature": self.temperature
-        }
-        
-        if use_new_param:
-            params["max_completion_tokens"] = self.max_tokens
-        else:
-            params["max_tokens"] = self.max_tokens
-        
-        response = self.client.chat.completions.create(**params)
-        return response.choices[0].message.content.strip()
+    def construir_prompt(self, transcripcion: str, *args, **kwargs) -> str:
+        """
+        Construye el prompt de usuario que envía `process`.
+        Las subclases que reciben datos adicionales (nombre, tipo de entrevista)
+        sobrescriben este método en lugar de `process`.
+        """
+        return self.construir_prompt_usuario(transcripcion)
     
-    def _llamar_gemini(self, prompt_completo: str) -> str:
-        """Llama a la API de Google Gemini."""
-        from google.genai import types
-        response = self.client.models.generate_content(
-            model=self.model,
-            contents=prompt_completo,
-            config=types.GenerateContentConfig(
-                max_output_tokens=self.max_tokens,
-                temperature=self.temperature
-            )
-        )
-        return response.text.strip()
+    def planificar(self, transcripcion: str, *args, **kwargs) -> PlanLlamada:
+        """
+        Tokens estimados del prompt que enviaría `process`, frente a la ventana
+        de contexto del modelo. No llama al proveedor.
+        """
+        prompt_usuario = self.construir_prompt(transcripcion, *args, **kwargs)
+        return self.cliente.planificar(prompt_usuario, self.prompt_sistema_llamada, self.max_tokens, type(self).__name__)
     
-    def process(self, transcripcion: str) -> str:
+    def process(self, transcripcion: str, *args, **kwargs) -> str:
         """
         Procesa la transcripción y genera el contenido de la sección.
         """
-        import time
-        max_retries = 3
+        prompt_usuario = self.construir_prompt(transcripcion, *args, **kwargs)
         
-        prompt_usuario = self.construir_prompt_usuario(transcripcion)
+        try:
+            return self.cliente.generar(prompt_usuario, self.prompt_sistema_llamada, self.max_tokens, self.temperature, agente=type(self).__name__)
+        except ErrorLimiteTasa:
+            return f"## {self.nombre_seccion}\n\n**Error:** Rate limit excedido."
+        except Exception as e:
+            return f"## {self.nombre_seccion}\n\n**Error al procesar:** {str(e)}"
+    
+    async def process_async(self, transcripcion: str, *args, **kwargs) -> str:
+        """
+        Versión asíncrona del procesamiento.
         
-        for attempt in range(max_retries):
-            try:
-                if self.provider == "openai":
-                    return self._llamar_openai(self.prompt_sistema, prompt_usuario)
-                else:
-                    prompt_completo = f"{self.prompt_sistema}\n\n{prompt_usuario}"
-                    return self._llamar_gemini(prompt_completo)
-                    
-            except Exception as e:
-                error_str = str(e)
-                if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str or "rate" in error_str.lower():
-                    wait_time = 10 * (attempt + 1)
-                    print(f"      ⏳ Rate limit. Esperando {wait_time}s...")
-                    time.sleep(wait_time)
-                    continue
-                return f"## {self.nombre_seccion}\n\n**Error al procesar:** {str(e)}"
+        Usa el cliente asíncrono nativo del proveedor, de modo que varios agentes
+        pueden esperar sus respuestas al mismo tiempo. Recibe los mismos
+        argumentos que `process`, incluidos los de las subclases con datos
+        adicionales (ej: AgenteDatosBasicos, AgenteNarrativo).
+        """
+        prompt_usuario = self.construir_prompt(transcripcion, *args, **kwargs)
         
-        return f"## {self.nombre_seccion}\n\n**Error:** Rate limit excedido."
-    
-    async def process_async(self, transcripcion: str) -> str:
-        """Versión asíncrona del procesamiento."""
-        return self.process(transcripcion)
+        try:
+            return await self.cliente.generar_async(prompt_usuario, self.prompt_sistema_llamada, self.max_tokens, self.temperature, agente=type(self).__name__)
+        except ErrorLimiteTasa:
+            return f"## {self.nombre_seccion}\n\n**Error:** Rate limit excedido."
+        except Exception as e:
+            return f"## {self.nombre_seccion}\n\n**Error al procesar:** {str(e)}"
@@ -6,7 +6,7 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-# Proveedor de LLM ("openai" o "gemini")
+# Proveedor de LLM ("openai", "gemini" o "local" para el simulador sin red)
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai")
 
 # OpenAI Configuration
@@ -17,15 +17,228 @@ OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
 
+# Proveedor local simulado (LLM_PROVIDER=local): respuestas deterministas sin red
+# para medir la orquestación. Latencia y variación en segundos.
+LOCAL_MODEL = os.getenv("LOCAL_MODEL", "local-simulado")
+LOCAL_LATENCIA = float(os.getenv("LOCAL_LATENCIA", "0.5"))
+LOCAL_JITTER = float(os.getenv("LOCAL_JITTER", "0.2"))
+LOCAL_TOKENS_POR_SEGUNDO = float(os.getenv("LOCAL_TOKENS_POR_SEGUNDO", "100"))
+LOCAL_TASA_429 = float(os.getenv("LOCAL_TASA_429", "0.0"))
+LOCAL_SEMILLA = int(os.getenv("LOCAL_SEMILLA", "42"))
+# Veces más rápido que se generan los tokens que coinciden con la predicción
+LOCAL_ACELERACION_PREDICCION = float(os.getenv("LOCAL_ACELERACION_PREDICCION", "4"))
+
 # Configuración general
 MAX_TOKENS = int(os.getenv("MAX_TOKENS", "4000"))
 TEMPERATURE = float(os.getenv("TEMPERATURE", "0.3"))
 
+# Extracción conjunta: una sola llamada con salida JSON para las siete secciones
+# del reporte detallado en lugar de una llamada por agente (main.py --conjunta)
+EXTRACCION_CONJUNTA = os.getenv("EXTRACCION_CONJUNTA", "false").lower() == "true"
+# (se limita a la salida máxima del modelo, ver SALIDAS_MAXIMAS)
+MAX_TOKENS_CONJUNTA = int(os.getenv("MAX_TOKENS_CONJUNTA", "16000"))
+
+# Conexiones HTTP keep-alive del cliente LLM compartido por todos los agentes
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "20"))
+
+# Límites de tasa por proveedor/modelo: (solicitudes por minuto, tokens por minuto).
+# Se usa la entrada con el prefijo más largo del nombre del modelo.
+# Ajustar al tier de la cuenta; LLM_LIMITE_RPM / LLM_LIMITE_TPM los sobrescriben.
+LIMITES_TASA = {
+    "openai": {
+        "default": (500, 30000),
+        "gpt-4o-mini": (500, 200000),
+        "gpt-4o": (500, 30000),
+        "gpt-4.1-mini": (500, 200000),
+        "gpt-4.1": (500, 30000),
+    },
+    "gemini": {
+        "default": (15, 1000000),
+        "gemini-2.0-flash": (15, 1000000),
+        "gemini-2.5-flash": (10, 250000),
+        "gemini-2.5-pro": (5, 250000),
+        "gemini-1.5-pro": (2, 32000),
+    },
+    "local": {
+        "default": (600, 1000000),
+    },
+}
+LIMITE_RPM = int(os.getenv("LLM_LIMITE_RPM", "0"))
+LIMITE_TPM = int(os.getenv("LLM_LIMITE_TPM", "0"))
+
+# Ventanas de contexto (tokens de entrada + salida) por proveedor/modelo, con la
+# misma búsqueda por prefijo más largo que LIMITES_TASA.
+VENTANAS_CONTEXTO = {
+    "openai": {
+        "default": 128000,
+        "gpt-4o-mini": 128000,
+        "gpt-4o": 128000,
+        "gpt-4.1": 1047576,
+        "gpt-5": 400000,
+    },
+    "gemini": {
+        "default": 1048576,
+        "gemini-1.5-pro": 2097152,
+    },
+    "local": {
+        "default": 128000,
+    },
+}
+
+# Tokens de salida máximos por proveedor/modelo (prefijo más largo, como la ventana).
+# Los max_tokens pedidos por encima de este tope se reducen antes de enviar la llamada.
+SALIDAS_MAXIMAS = {
+    "openai": {
+        "default": 16384,
+        "gpt-4.1": 32768,
+        "gpt-5": 128000,
+    },
+    "gemini": {
+        "default": 8192,
+        "gemini-2.5": 65536,
+    },
+    "local": {
+        "default": 128000,
+    },
+}
+
+# Estimación de tokens sin red: caracteres por token en texto en español cuando no
+# hay tokenizador instalado (con `tiktoken` se cuenta exacto para OpenAI), y margen
+# de seguridad sobre la estimación. Si la salida pedida no cabe, se reduce hasta
+# MIN_TOKENS_SALIDA; por debajo de eso el prompt se rechaza antes de enviarlo.
+CARACTERES_POR_TOKEN = {"openai": 3.5, "gemini": 3.8, "local": 4.0}
+MARGEN_ESTIMACION_TOKENS = float(os.getenv("MARGEN_ESTIMACION_TOKENS", "0.1"))
+MIN_TOKENS_SALIDA = int(os.getenv("MIN_TOKENS_SALIDA", "1000"))
+
+# Corrección por fragmentos: las transcripciones más largas que este tamaño se dividen
+# en fragmentos alineados a turnos de palabra que se corrigen en paralelo. Cada
+# fragmento recibe como contexto de solo lectura parte del texto vecino.
+CORRECCION_CARACTERES_FRAGMENTO = int(os.getenv("CORRECCION_CARACTERES_FRAGMENTO", "12000"))
+CORRECCION_CARACTERES_CONTEXTO = int(os.getenv("CORRECCION_CARACTERES_CONTEXTO", "600"))
+
+# Formato de respuesta del agente de corrección (main.py --correccion):
+# - "completo": el modelo reescribe la transcripción corregida y la lista de correcciones.
+# - "diferencias": el modelo devuelve solo los cambios (original, reemplazo, contexto) en
+#   JSON y se aplican localmente; la salida es una fracción del tamaño de la transcripción.
+# - "tramos": solo se envían los tramos con palabras sospechosas (ver
+#   utils/detector_sospechosos.py), en una llamada; sin tramos, no hay llamada.
+MODO_CORRECCION = os.getenv("MODO_CORRECCION", "completo")
+
+# Salidas predichas (predicted outputs de OpenAI): en el modo "completo" la respuesta es
+# casi idéntica a la transcripción, así que se envía el texto original como predicción
+# y el proveedor genera rápido los tramos que coinciden. Solo con los modelos cuyo
+# nombre empieza por alguno de MODELOS_PREDICCION y sin salida estructurada.
+PREDICCION_CORRECCION = os.getenv("PREDICCION_CORRECCION", "true").lower() == "true"
+MODELOS_PREDICCION = ["gpt-4o", "gpt-4.1"]
+
+# Vista de la transcripción que reciben los siete agentes de sección (main.py --vista):
+# - "completa": la transcripción entera.
+# - "entrevistado": solo los turnos del entrevistado (sin los del entrevistador).
+# - "sin_preguntas": sin los turnos del entrevistador que contienen preguntas.
+# Si no se identifica al entrevistador, se envía la transcripción completa. El reporte
+# narrativo siempre recibe la transcripción completa (ver utils/turnos.py).
+VISTA_TRANSCRIPCION = os.getenv("VISTA_TRANSCRIPCION", "completa")
+
+# Segmentación por bloques de la guía de entrevista (main.py --bloques): los agentes de
+# sección que declaran `bloques_requeridos` reciben solo los turnos de esos bloques (ver
+# utils/bloques.py). Si la confianza de la segmentación es menor que
+# BLOQUES_CONFIANZA_MINIMA, o un bloque requerido no aparece, reciben la transcripción entera.
+SEGMENTACION_BLOQUES = os.getenv("SEGMENTACION_BLOQUES", "false").lower() == "true"
+BLOQUES_CONFIANZA_MINIMA = float(os.getenv("BLOQUES_CONFIANZA_MINIMA", "0.7"))
+
+# Recuperación de pasajes con BM25 (main.py --recuperacion): los agentes de sección que
+# declaran `consulta_recuperacion` reciben solo los pasajes más relevantes de su vista,
+# hasta RECUPERACION_TOKENS tokens y RECUPERACION_MAX_PASAJES pasajes (0 = sin límite), en
+# el orden original. Si todo cabe en el presupuesto, reciben su vista entera (ver
+# utils/recuperacion.py).
+RECUPERACION_PASAJES = os.getenv("RECUPERACION_PASAJES", "false").lower() == "true"
+RECUPERACION_TOKENS = int(os.getenv("RECUPERACION_TOKENS", "3000"))
+RECUPERACION_MAX_PASAJES = int(os.getenv("RECUPERACION_MAX_PASAJES", "0"))
+RECUPERACION_CARACTERES_PASAJE = int(os.getenv("RECUPERACION_CARACTERES_PASAJE", "800"))
+
+# Disposición de los prompts de los agentes:
+# - "clasica": rol del agente como prompt de sistema e instrucciones antes de la transcripción.
+# - "prefijo": reglas globales + transcripción primero (idénticas para todos los agentes de
+#   una entrevista) y rol e instrucciones del agente al final, para que el proveedor
+#   reutilice los tokens de la transcripción desde su caché de prefijos.
+DISPOSICION_PROMPT = os.getenv("DISPOSICION_PROMPT", "clasica")
+
 # Paths
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_RAW_DIR = os.path.join(BASE_DIR, "data", "raw")
 DATA_OUTPUTS_DIR = os.path.join(BASE_DIR, "data", "outputs")
 
+# Caché persistente de respuestas del LLM (tamaño máximo en MB, desalojo LRU)
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", os.path.join(BASE_DIR, "data", "cache", "llm"))
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "500"))
+
+# Correcciones aprendidas: pares "original → corrección" que reporta el agente de
+# corrección, acumulados entre ejecuciones y aplicados antes de llamar al LLM. Un par
+# se aplica si se reportó en al menos CORRECCIONES_MIN_OCURRENCIAS transcripciones
+# distintas y es al menos CORRECCIONES_CONFIANZA_MINIMA de los reportes de ese texto
+# original, y solo donde el contexto coincide con el de los reportes (en la
+# transcripción donde se aprendió se aplica siempre).
+CORRECCIONES_APRENDIDAS = os.getenv("CORRECCIONES_APRENDIDAS", "true").lower() == "true"
+CORRECCIONES_APRENDIDAS_PATH = os.getenv(
+    "CORRECCIONES_APRENDIDAS_PATH", os.path.join(BASE_DIR, "data", "correcciones_aprendidas.json")
+)
+CORRECCIONES_MIN_OCURRENCIAS = int(os.getenv("CORRECCIONES_MIN_OCURRENCIAS", "2"))
+CORRECCIONES_CONFIANZA_MINIMA = float(os.getenv("CORRECCIONES_CONFIANZA_MINIMA", "0.8"))
+# Los pares no reportados en CORRECCIONES_EDAD_MAXIMA transcripciones se olvidan, y el
+# almacén guarda como máximo CORRECCIONES_MAX_PARES pares y CORRECCIONES_MAX_LEXICO
+# palabras de léxico verificado (las vistas más recientemente)
+CORRECCIONES_EDAD_MAXIMA = int(os.getenv("CORRECCIONES_EDAD_MAXIMA", "500"))
+CORRECCIONES_MAX_PARES = int(os.getenv("CORRECCIONES_MAX_PARES", "5000"))
+CORRECCIONES_MAX_LEXICO = int(os.getenv("CORRECCIONES_MAX_LEXICO", "100000"))
+
+# Omitir la llamada de corrección al LLM si, tras las correcciones aprendidas, la
+# fracción de palabras fuera del léxico aprendido (palabras de transcripciones ya
+# corregidas) no supera este valor, ej: 0.005. Con 0 nunca se omite.
+CORRECCION_UMBRAL_FUERA_LEXICO = float(os.getenv("CORRECCION_UMBRAL_FUERA_LEXICO", "0"))
+
+# Precorrección local de variantes fonéticas del vocabulario técnico ("paiton" → Python)
+# antes de la llamada de corrección (ver utils/corrector_fonetico.py)
+CORRECCION_FONETICA = os.getenv("CORRECCION_FONETICA", "true").lower() == "true"
+
+# Modo "tramos": palabras de contexto a cada lado de las palabras sospechosas
+CORRECCION_PALABRAS_CONTEXTO = int(os.getenv("CORRECCION_PALABRAS_CONTEXTO", "6"))
+
+# Transcripciones corregidas, compartidas entre main.py y el consolidador: una por
+# archivo original y versión del prompt de corrección
+TRANSCRIPCIONES_CORREGIDAS = os.getenv("TRANSCRIPCIONES_CORREGIDAS", "true").lower() == "true"
+TRANSCRIPCIONES_CORREGIDAS_DIR = os.getenv(
+    "TRANSCRIPCIONES_CORREGIDAS_DIR", os.path.join(DATA_OUTPUTS_DIR, "transcripciones_corregidas")
+)
+
+# Transcripciones que el consolidador carga y corrige a la vez (--max-concurrencia);
+# los límites de tasa de LIMITES_TASA siguen aplicándose a todas las llamadas
+CONSOLIDADOR_MAX_CONCURRENCIA = int(os.getenv("CONSOLIDADOR_MAX_CONCURRENCIA", "4"))
+
+# Consolidación por hechos (consolidador_main.py --hechos): primero se extraen de cada
+# entrevista hechos breves por categoría (grupos, hardware, software...), hasta
+# HECHOS_MAX_POR_CATEGORIA por categoría, y cada agente consolidador recibe solo los de
+# sus categorías. Los hechos se guardan por texto de la entrevista y versión del prompt.
+CONSOLIDACION_HECHOS = os.getenv("CONSOLIDACION_HECHOS", "false").lower() == "true"
+HECHOS_MAX_POR_CATEGORIA = int(os.getenv("HECHOS_MAX_POR_CATEGORIA", "5"))
+MAX_TOKENS_HECHOS = int(os.getenv("MAX_TOKENS_HECHOS", "3000"))
+HECHOS_ENTREVISTAS_DIR = os.getenv(
+    "HECHOS_ENTREVISTAS_DIR", os.path.join(DATA_OUTPUTS_DIR, "hechos_entrevistas")
+)
+
+# Reducción en árbol de los hechos (consolidador_main.py --abanico K): los hechos de cada
+# K entrevistas se fusionan en un resumen, los de cada K resúmenes en otro, y así por
+# niveles hasta un único resumen raíz, con hasta HECHOS_MAX_FUSION hechos por categoría.
+# Propuestas y Conclusiones trabajan sobre la raíz; el resto de agentes, sobre el nivel
+# más bajo del árbol que cabe en la ventana del modelo. 0 = sin árbol.
+CONSOLIDACION_ABANICO = int(os.getenv("CONSOLIDACION_ABANICO", "0"))
+HECHOS_MAX_FUSION = int(os.getenv("HECHOS_MAX_FUSION", "12"))
+
+# Consolidación desde los reportes individuales (consolidador_main.py --desde-reportes): el
+# corpus son las secciones que main.py guarda en <REPORTES_INDIVIDUALES_DIR>/<entrevistado>/
+# secciones.json, en lugar de las transcripciones, y no hay fase de corrección
+CONSOLIDACION_DESDE_REPORTES = os.getenv("CONSOLIDACION_DESDE_REPORTES", "false").lower() == "true"
+REPORTES_INDIVIDUALES_DIR = os.getenv("REPORTES_INDIVIDUALES_DIR", DATA_OUTPUTS_DIR)
+
 # Reglas globales para todos los agentes
 REGLAS_GLOBALES = """
 REGLAS GLOBALES (OBLIGATORIAS):
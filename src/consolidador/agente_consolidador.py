@@ -10,12 +10,8 @@ import os
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import (
-    LLM_PROVIDER, 
-    OPENAI_API_KEY, OPENAI_MODEL,
-    GOOGLE_API_KEY, GEMINI_MODEL,
-    TEMPERATURE
-)
+from config import TEMPERATURE
+from llm import ClienteLLM, obtener_cliente_llm
 
 
 class AgenteConsolidadorInfraestructura:
@@ -152,18 +148,15 @@ REGLAS CRÍTICAS:
 - Atribuye información al entrevistado correspondiente
 """
     
-    def __init__(self):
-        self.provider = LLM_PROVIDER.lower()
+    def __init__(self, cliente: ClienteLLM = None):
+        """
+        Args:
+            cliente: Cliente LLM a usar. Por defecto, el compartido del proceso.
+        """
+        self.cliente = cliente or obtener_cliente_llm()
+        self.provider = self.cliente.provider
+        self.model = self.cliente.model
         self.temperature = TEMPERATURE
-        
-        if self.provider == "openai":
-            from openai import OpenAI
-            self.client = OpenAI(api_key=OPENAI_API_KEY)
-            self.model = OPENAI_MODEL
-        else:  # gemini
-            from google import genai
-            self.client = genai.Client(api_key=GOOGLE_API_KEY)
-            self.model = GEMINI_MODEL
     
     def ejecutar(self, transcripciones_consolidadas: str) -> str:
         """
@@ -182,44 +175,8 @@ REGLAS CRÍTICAS:
 
 Genera el documento consolidado siguiendo la estructura indicada en tus instrucciones."""
         
-        if self.provider == "openai":
-            return self._llamar_openai(prompt_usuario)
-        else:
-            return self._llamar_gemini(prompt_usuario)
-    
-    def _llamar_openai(self, prompt_usuario: str) -> str:
-        """Llama a la API de OpenAI."""
-        # Usar max_completion_tokens para modelos nuevos
-        use_new_param = any(x in self.model for x in ['gpt-4.1', 'gpt-5', 'o1', 'o3'])
-        
-        params = {
-            "model": self.model,
-            "messages": [
-                {"role": "system", "content": self.prompt_sistema},
-                {"role": "user", "content": prompt_usuario}
-            ],
-            "temperature": self.temperature,
-        }
-        
-        if use_new_param:
-            params["max_completion_tokens"] = self.max_tokens
-        else:
-            params["max_tokens"] = self.max_tokens
-        
-        response = self.client.chat.completions.create(**params)
-        return response.choices[0].message.content
-    
-    def _llamar_gemini(self, prompt_usuario: str) -> str:
-        """Llama a la API de Gemini."""
-        from google.genai import types
-        
-        response = self.client.models.generate_content(
-            model=self.model,
-            contents=prompt_usuario,
-            config=types.GenerateContentConfig(
-                system_instruction=self.prompt_sistema,
-                temperature=self.temperature,
-                max_output_tokens=self.max_tokens
-            )
+        return self.cliente.generar(
+            prompt_usuario, self.prompt_sistema,
+            max_tokens=self.max_tokens, temperature=self.temperature,
+            agente=type(self).__name__
         )
-        return response.text
@@ -0,0 +1,337 @@
+"""
+Agente que extrae los hechos de una entrevista para la consolidación por hechos.
+
+Primera fase de la consolidación por hechos: cada entrevista se resume una sola
+vez, con salida JSON, en listas breves de hechos por categoría (grupos,
+hardware, software...). En la segunda fase cada agente consolidador recibe solo
+los hechos de sus categorías (ver `categorias_hechos` en BaseAgentConsolidador)
+en lugar de todas las transcripciones, de modo que su prompt crece con unas
+pocas líneas por entrevista.
+
+Con muchas entrevistas, hasta esas líneas dejan de caber en un prompt: la
+reducción en árbol (AgenteFusionHechos) fusiona los hechos por grupos de
+entrevistas, y luego esos resúmenes por grupos, hasta un único resumen raíz.
+"""
+import sys
+import os
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import TEMPERATURE, MAX_TOKENS_HECHOS, HECHOS_MAX_POR_CATEGORIA, HECHOS_MAX_FUSION
+from llm import ClienteLLM, PlanLlamada, obtener_cliente_llm
+from utils.almacen_json import huella_campos
+from utils.hechos_entrevistas import AlmacenHechos, obtener_almacen_hechos
+
+
+# Categorías de hechos, en el orden del reporte consolidado
+CATEGORIAS_HECHOS = {
+    "grupos": "Grupos de investigación, laboratorios, semilleros y dependencias que trabajan con IA, "
+              "con sus líneas de trabajo y proyectos",
+    "hardware": "Equipos de cómputo, servidores, GPUs y recursos en la nube, con sus características "
+                "y el grupo o dependencia al que pertenecen",
+    "software": "Lenguajes, frameworks, librerías, modelos, plataformas y herramientas, y para qué se usan",
+    "fortalezas": "Capacidades, experiencia, logros y colaboraciones destacadas",
+    "limitaciones": "Limitaciones de recursos, infraestructura, personal o procesos, y desafíos",
+    "oportunidades": "Oportunidades de aplicación, crecimiento o colaboración",
+    "propuestas": "Propuestas y recomendaciones concretas",
+}
+
+
+def formatear_hechos(
+    hechos: List[Tuple[str, Dict[str, List[str]]]],
+    categorias: List[str] = None,
+    encabezado: str = "ENTREVISTA"
+) -> str:
+    """
+    Texto con los hechos de varias entrevistas para el prompt de un agente consolidador.
+    
+    Args:
+        hechos: Pares (nombre de la entrevista, hechos por categoría).
+        categorias: Categorías a incluir. None = todas.
+        encabezado: Rótulo de cada bloque ("RESUMEN" para los resúmenes de
+                    la reducción en árbol).
+    
+    Returns:
+        Un bloque "ENTREVISTA: nombre" por entrevista con algún hecho de las
+        categorías, con sus hechos en viñetas por categoría.
+    """
+    categorias = categorias or list(CATEGORIAS_HECHOS)
+    bloques = []
+    for nombre, por_categoria in hechos:
+        lineas = []
+        for categoria in categorias:
+            elementos = por_categoria.get(categoria) or []
+            if elementos:
+                lineas.append(f"[{categoria.upper()}]")
+                lineas.extend(f"- {hecho}" for hecho in elementos)
+        if lineas:
+            bloques.append(f"{'='*60}\n{encabezado}: {nombre}\n{'='*60}\n" + "\n".join(lineas))
+    return "\n\n".join(bloques)
+
+
+def unir_hechos(resumenes: List[Dict[str, List[str]]], max_por_categoria: int) -> Dict[str, List[str]]:
+    """
+    Fusión local, sin LLM, de varios resúmenes: por categoría, toma los hechos
+    alternando entre resúmenes (el primero de cada uno, luego el segundo...),
+    sin repetir, hasta `max_por_categoria`.
+    """
+    hechos = {}
+    for categoria in CATEGORIAS_HECHOS:
+        listas = [r.get(categoria) or [] for r in resumenes]
+        intercalados = (lista[i] for i in range(max(map(len, listas), default=0)) for lista in listas if i < len(lista))
+        hechos[categoria] = list(dict.fromkeys(intercalados))[:max_por_categoria]
+    return hechos
+
+
+class AgenteHechos:
+    """
+    Extrae de una entrevista los hechos de cada categoría de CATEGORIAS_HECHOS.
+    
+    No hereda de BaseAgentConsolidador porque no genera una sección: devuelve
+    datos estructurados de una sola entrevista, que se guardan en disco por
+    texto de la entrevista y versión del prompt.
+    """
+    
+    def __init__(
+        self,
+        cliente: ClienteLLM = None,
+        almacen: AlmacenHechos = None,
+        max_por_categoria: int = HECHOS_MAX_POR_CATEGORIA
+    ):
+        """
+        Args:
+            cliente: Cliente LLM a usar. Por defecto, el compartido del proceso.
+            almacen: Almacén de hechos extraídos. Por defecto, el compartido del proceso.
+            max_por_categoria: Hechos máximos por categoría.
+        """
+        self.cliente = cliente or obtener_cliente_llm()
+        self.almacen = almacen if almacen is not None else obtener_almacen_hechos()
+        self.max_por_categoria = max_por_categoria
+        self.max_tokens = MAX_TOKENS_HECHOS
+        self.temperature = TEMPERATURE
+    
+    @property
+    def prompt_sistema(self) -> str:
+        return """Eres un analista que prepara los insumos de un reporte consolidado sobre las capacidades
+de inteligencia artificial en la Universidad Tecnológica de Pereira (UTP).
+
+A partir de UNA entrevista, extraes los hechos concretos que aporta, clasificados por categoría.
+Otro analista redactará el reporte solo con estos hechos, sin leer la entrevista."""
+
+    @property
+    def esquema(self) -> dict:
+        """JSON Schema de la respuesta: una lista de hechos por categoría."""
+        propiedades = {
+            categoria: {"type": "array", "description": descripcion, "items": {"type": "string"}}
+            for categoria, descripcion in CATEGORIAS_HECHOS.items()
+        }
+        return {
+            "type": "object",
+            "properties": propiedades,
+            "required": list(propiedades),
+        }
+    
+    def construir_prompt(self, entrevista: str, nombre: str) -> str:
+        """Prompt de extracción para una entrevista."""
+        categorias = "\n".join(f'- "{categoria}": {descripcion}' for categoria, descripcion in CATEGORIAS_HECHOS.items())
+        return f"""CATEGORÍAS:
+{categorias}
+
+REGLAS:
+- Cada hecho es una frase breve (máximo 30 palabras) que se entiende sola: nombra el grupo,
+  laboratorio o dependencia al que se refiere cuando la entrevista lo indica.
+- Conserva los datos concretos: nombres de grupos, modelos de equipos, cifras, tecnologías.
+- Máximo {self.max_por_categoria} hechos por categoría, los más relevantes, sin repetir.
+- Si una categoría no tiene información, deja su lista vacía.
+- Solo información que SÍ aparece en la entrevista; no inventes ni infieras.
+- Las transcripciones pueden tener errores de reconocimiento; interpreta el contexto.
+
+---
+ENTREVISTA: {nombre}
+---
+{entrevista}
+---
+
+Devuelve el objeto JSON con la lista de hechos de cada categoría.
+"""
+
+    @property
+    def version_prompt(self) -> str:
+        """Identificador de todo lo que determina la extracción salvo la entrevista."""
+        campos = {
+            'provider': self.cliente.provider,
+            'model': self.cliente.model,
+            'prompt_sistema': self.prompt_sistema,
+            'prompt': self.construir_prompt("{entrevista}", "{nombre}"),
+            'esquema': self.esquema,
+            'max_tokens': self.max_tokens,
+        }
+        return huella_campos(campos)
+    
+    def _interpretar_resultado(self, resultado: str) -> Optional[Dict[str, List[str]]]:
+        """Convierte la respuesta JSON en listas de hechos por categoría, o None si no es válida."""
+        texto = re.sub(r'^```(?:json)?\s*|\s*```$', '', resultado.strip())
+        try:
+            datos = json.loads(texto)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(datos, dict):
+            return None
+        
+        hechos = {}
+        for categoria in CATEGORIAS_HECHOS:
+            elementos = datos.get(categoria)
+            if not isinstance(elementos, list):
+                elementos = []
+            limpios = [" ".join(e.split()) for e in elementos if isinstance(e, str) and e.strip()]
+            hechos[categoria] = list(dict.fromkeys(limpios))[:self.max_por_categoria]
+        return hechos
+    
+    def planificar(self, entrevista: str, nombre: str) -> PlanLlamada:
+        """Tokens estimados de la extracción de una entrevista. No llama al proveedor."""
+        return self.cliente.planificar(
+            self.construir_prompt(entrevista, nombre), self.prompt_sistema, self.max_tokens, agente=type(self).__name__
+        )
+    
+    def extraer(self, entrevista: str, nombre: str) -> Optional[Dict[str, List[str]]]:
+        """
+        Hechos de una entrevista, reutilizando los guardados si existen.
+        
+        Args:
+            entrevista: Texto de la entrevista (corregido, si corresponde).
+            nombre: Nombre del entrevistado o del archivo.
+        
+        Returns:
+            Diccionario categoría -> hechos, o None si la respuesta no es un
+            JSON válido o la llamada falla.
+        """
+        version = self.version_prompt
+        hechos = self.almacen.obtener(entrevista, version)
+        if hechos is not None:
+            return hechos
+        
+        try:
+            resultado = self.cliente.generar(
+                self.construir_prompt(entrevista, nombre), self.prompt_sistema, self.max_tokens, self.temperature,
+                esquema=self.esquema, agente=type(self).__name__
+            )
+        except Exception as e:
+            print(f"      ⚠ Extracción de hechos fallida para {nombre}: {e}")
+            return None
+        return self._guardar(entrevista, version, resultado, nombre)
+    
+    async def extraer_async(self, entrevista: str, nombre: str) -> Optional[Dict[str, List[str]]]:
+        """Versión asíncrona de `extraer`."""
+        version = self.version_prompt
+        hechos = self.almacen.obtener(entrevista, version)
+        if hechos is not None:
+            return hechos
+        
+        try:
+            resultado = await self.cliente.generar_async(
+                self.construir_prompt(entrevista, nombre), self.prompt_sistema, self.max_tokens, self.temperature,
+                esquema=self.esquema, agente=type(self).__name__
+            )
+        except Exception as e:
+            print(f"      ⚠ Extracción de hechos fallida para {nombre}: {e}")
+            return None
+        return self._guardar(entrevista, version, resultado, nombre)
+    
+    def _guardar(self, entrevista: str, version: str, resultado: str, nombre: str) -> Optional[Dict[str, List[str]]]:
+        """Interpreta la respuesta y, si es válida, la guarda para las siguientes ejecuciones."""
+        hechos = self._interpretar_resultado(resultado)
+        if hechos is None:
+            print(f"      ⚠ Hechos de {nombre}: la respuesta no es un JSON válido")
+            return None
+        try:
+            self.almacen.guardar(entrevista, version, hechos, nombre)
+        except OSError as e:
+            print(f"      ⚠ No se pudieron guardar los hechos de {nombre}: {e}")
+        return hechos
+
+
+class AgenteFusionHechos(AgenteHechos):
+    """
+    Fusiona los hechos de varias entrevistas, o de varios resúmenes ya
+    fusionados, en un único resumen con las mismas categorías: un nodo de la
+    reducción en árbol.
+    
+    Usa el esquema y el almacén de AgenteHechos; un resumen guardado se
+    identifica por el texto de los resúmenes que fusiona, así que una nueva
+    consolidación solo fusiona de nuevo los grupos que cambiaron.
+    """
+    
+    def __init__(
+        self,
+        cliente: ClienteLLM = None,
+        almacen: AlmacenHechos = None,
+        max_por_categoria: int = HECHOS_MAX_FUSION
+    ):
+        """
+        Args:
+            cliente: Cliente LLM a usar. Por defecto, el compartido del proceso.
+            almacen: Almacén de hechos extraídos. Por defecto, el compartido del proceso.
+            max_por_categoria: Hechos máximos por categoría del resumen fusionado.
+        """
+        super().__init__(cliente, almacen, max_por_categoria)
+    
+    @property
+    def prompt_sistema(self) -> str:
+        return """Eres un analista que prepara los insumos de un reporte consolidado sobre las capacidades
+de inteligencia artificial en la Universidad Tecnológica de Pereira (UTP).
+
+Recibes los hechos, clasificados por categoría, de varias entrevistas o de varios resúmenes
+de grupos de entrevistas, y los fusionas en un único resumen con las mismas categorías.
+Otro analista redactará el reporte solo con estos resúmenes."""
+
+    def construir_prompt(self, resumenes: str, nombre: str) -> str:
+        """Prompt de fusión de los resúmenes de un grupo."""
+        categorias = "\n".join(f'- "{categoria}": {descripcion}' for categoria, descripcion in CATEGORIAS_HECHOS.items())
+        return f"""CATEGORÍAS:
+{categorias}
+
+REGLAS:
+- Une en uno solo los hechos equivalentes de distintos resúmenes y conserva los datos concretos:
+  nombres de grupos, modelos de equipos, cifras, tecnologías.
+- Cuando un hecho aparece en varias entrevistas, indícalo al final entre paréntesis, ej:
+  "(4 entrevistas)", sumando los conteos que ya traigan los resúmenes.
+- Máximo {self.max_por_categoria} hechos por categoría: prioriza los que aparecen en más entrevistas
+  y los más concretos.
+- Cada hecho es una frase breve (máximo 40 palabras) que se entiende sola.
+- Solo información que SÍ aparece en los resúmenes; no inventes ni infieras.
+
+---
+RESÚMENES A FUSIONAR:
+---
+{resumenes}
+---
+
+Devuelve el objeto JSON con la lista de hechos fusionados de cada categoría.
+"""
+
+    async def fusionar_async(
+        self,
+        resumenes: List[Tuple[str, Dict[str, List[str]]]],
+        nombre: str,
+        encabezado: str = "RESUMEN"
+    ) -> Dict[str, List[str]]:
+        """
+        Fusiona los resúmenes de un grupo, reutilizando la fusión guardada si existe.
+        
+        Args:
+            resumenes: Pares (nombre, hechos por categoría) del grupo.
+            nombre: Nombre del resumen fusionado (solo informativo).
+            encabezado: Rótulo de los bloques de entrada (ver `formatear_hechos`).
+        
+        Returns:
+            Hechos fusionados por categoría. Si la llamada falla, la unión
+            local de los resúmenes (ver `unir_hechos`).
+        """
+        hechos = await self.extraer_async(formatear_hechos(resumenes, encabezado=encabezado), nombre)
+        if hechos is None:
+            print(f"      ⚠ {nombre}: se usa la unión de los resúmenes sin fusionar")
+            hechos = unir_hechos([h for _, h in resumenes], self.max_por_categoria)
+        return hechos
@@ -15,6 +15,10 @@ class AgenteConclusiones(BaseAgentConsolidador):
     del análisis consolidado de capacidades de IA en la UTP.
     """
     
+    # La síntesis se apoya en las valoraciones; el inventario lo cubren las secciones I-III
+    categorias_hechos = ["fortalezas", "limitaciones", "oportunidades", "propuestas"]
+    usa_raiz_arbol = True
+    
     @property
     def nombre_seccion(self) -> str:
         return "VIII. Conclusiones y Síntesis Ejecutiva"
@@ -15,6 +15,8 @@ class AgenteFortalezas(BaseAgentConsolidador):
     ventajas competitivas en IA identificadas en la UTP.
     """
     
+    categorias_hechos = ["fortalezas", "grupos"]
+    
     @property
     def nombre_seccion(self) -> str:
         return "IV. Fortalezas y Capacidades Destacadas"
@@ -15,6 +15,8 @@ class AgenteGruposLabs(BaseAgentConsolidador):
     facultades y líneas de trabajo relacionadas con IA en la UTP.
     """
     
+    categorias_hechos = ["grupos"]
+    
     @property
     def nombre_seccion(self) -> str:
         return "I. Grupos de Investigación y Laboratorios"
@@ -15,6 +15,8 @@ class AgenteHardware(BaseAgentConsolidador):
     GPUs y recursos computacionales disponibles para IA en la UTP.
     """
     
+    categorias_hechos = ["hardware"]
+    
     @property
     def nombre_seccion(self) -> str:
         return "II. Inventario de Hardware e Infraestructura Computacional"
@@ -15,6 +15,8 @@ class AgenteLimitaciones(BaseAgentConsolidador):
     obstáculos identificados para el desarrollo de IA en la UTP.
     """
     
+    categorias_hechos = ["limitaciones"]
+    
     @property
     def nombre_seccion(self) -> str:
         return "V. Limitaciones y Desafíos Identificados"
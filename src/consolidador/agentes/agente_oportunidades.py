@@ -15,6 +15,8 @@ class AgenteOportunidades(BaseAgentConsolidador):
     colaboración e innovación identificadas para IA en la UTP.
     """
     
+    categorias_hechos = ["oportunidades", "fortalezas"]
+    
     @property
     def nombre_seccion(self) -> str:
         return "VI. Oportunidades Identificadas"
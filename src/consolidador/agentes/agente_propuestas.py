@@ -17,6 +17,8 @@ class AgentePropuestas(BaseAgentConsolidador):
     
     # Más tokens para propuestas detalladas
     max_tokens = 5000
+    categorias_hechos = ["propuestas", "limitaciones", "oportunidades"]
+    usa_raiz_arbol = True
     
     @property
     def nombre_seccion(self) -> str:
@@ -15,6 +15,8 @@ class AgenteSoftware(BaseAgentConsolidador):
     plataformas y herramientas utilizadas en proyectos de IA en la UTP.
     """
     
+    categorias_hechos = ["software"]
+    
     @property
     def nombre_seccion(self) -> str:
         return "III. Ecosistema de Software y Herramientas"
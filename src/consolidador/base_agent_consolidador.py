@@ -7,15 +7,45 @@ y generan una sección específica del reporte consolidado.
 import sys
 import os
 from abc import ABC, abstractmethod
+from typing import List, Optional
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import (
-    LLM_PROVIDER,
-    OPENAI_API_KEY, OPENAI_MODEL,
-    GOOGLE_API_KEY, GEMINI_MODEL,
-    TEMPERATURE, MAX_TOKENS
-)
+from config import TEMPERATURE, DISPOSICION_PROMPT
+from llm import ClienteLLM, PlanLlamada, obtener_cliente_llm
+
+
+# Reglas comunes a todos los agentes consolidadores
+REGLAS_CONSOLIDACION = """REGLAS IMPORTANTES:
+- NO menciones nombres de entrevistados directamente (ej: "según Juan García...")
+- NO hagas referencias explícitas a entrevistas específicas (ej: "en la entrevista 3...")
+- Sintetiza y agrupa la información de TODAS las entrevistas
+- Presenta los hallazgos como descubrimientos del análisis institucional
+- Si múltiples fuentes mencionan lo mismo, preséntalo como hallazgo consolidado
+- Solo incluye información que SÍ fue mencionada, no inventes datos
+- EVITA REDUNDANCIAS: No repitas la misma información, tecnología o concepto múltiples veces
+
+ESTILO DE REDACCIÓN - MUY IMPORTANTE:
+- Escribe de forma NARRATIVA y FLUIDA, como un informe profesional bien redactado
+- Alterna entre párrafos narrativos y bullet points estratégicos para facilitar la lectura
+- Los bullet points deben usarse para listas concretas (tecnologías, equipos, recursos), NO para todo el contenido
+- Desarrolla ideas en párrafos completos antes de usar listas
+- RECONOCE Y DESTACA los equipos de trabajo, grupos de investigación y comunidades
+- Menciona logros colectivos y capacidades de los equipos
+- Usa un tono profesional pero cercano, que valore el trabajo realizado
+- Usa **negritas** para términos clave y nombres de grupos/tecnologías
+- Cada elemento (tecnología, herramienta, grupo) debe mencionarse UNA SOLA VEZ en la sección
+
+FORMATO DE SALIDA:
+- Usa Markdown con jerarquía de encabezados (##, ###, ####)
+- Combina prosa narrativa con bullet points donde sea apropiado
+- Las viñetas (-) para listas concretas de items, tecnologías o recursos
+- Párrafos de 3-5 líneas para explicaciones y contexto"""
+
+# Encabezado del material de análisis en el prompt
+TITULO_TRANSCRIPCIONES = "TRANSCRIPCIONES A ANALIZAR"
+TITULO_HECHOS = "HECHOS EXTRAÍDOS DE LAS ENTREVISTAS (AGRUPADOS POR ENTREVISTA Y CATEGORÍA)"
+TITULO_REPORTES = "REPORTES INDIVIDUALES DE LAS ENTREVISTAS A ANALIZAR"
 
 
 class BaseAgentConsolidador(ABC):
@@ -32,18 +62,24 @@ class BaseAgentConsolidador(ABC):
     # Tokens por sección (más bajo que el consolidador monolítico)
     max_tokens = 4000
     
-    def __init__(self):
-        self.provider = LLM_PROVIDER.lower()
+    # Categorías de hechos (ver consolidador/agente_hechos.py) que recibe el agente en la
+    # consolidación por hechos. None = todas.
+    categorias_hechos: Optional[List[str]] = None
+    
+    # En la reducción en árbol de los hechos, True: el agente recibe el resumen raíz;
+    # False: el nivel más bajo del árbol que cabe en la ventana del modelo
+    usa_raiz_arbol = False
+    
+    def __init__(self, cliente: ClienteLLM = None):
+        """
+        Args:
+            cliente: Cliente LLM a usar. Por defecto, el compartido del proceso.
+        """
+        self.cliente = cliente or obtener_cliente_llm()
+        self.provider = self.cliente.provider
+        self.model = self.cliente.model
         self.temperature = TEMPERATURE
-        
-        if self.provider == "openai":
-            from openai import OpenAI
-            self.client = OpenAI(api_key=OPENAI_API_KEY)
-            self.model = OPENAI_MODEL
-        else:  # gemini
-            from google import genai
-            self.client = genai.Client(api_key=GOOGLE_API_KEY)
-            self.model = GEMINI_MODEL
+        self.disposicion_prompt = DISPOSICION_PROMPT
     
     @property
     @abstractmethod
@@ -63,96 +99,79 @@ class BaseAgentConsolidador(ABC):
         """Instrucciones específicas de qué información extraer y cómo formatearla."""
         pass
     
-    def _construir_prompt(self, transcripciones: str) -> str:
+    def _construir_prompt(self, transcripciones: str, titulo_entrada: str = TITULO_TRANSCRIPCIONES) -> str:
         """Construye el prompt completo para el LLM."""
+        if self.disposicion_prompt == "prefijo":
+            return self._construir_prompt_prefijo(transcripciones, titulo_entrada)
+        
         return f"""
 {self.prompt_sistema}
 
-REGLAS IMPORTANTES:
-- NO menciones nombres de entrevistados directamente (ej: "según Juan García...")
-- NO hagas referencias explícitas a entrevistas específicas (ej: "en la entrevista 3...")
-- Sintetiza y agrupa la información de TODAS las entrevistas
-- Presenta los hallazgos como descubrimientos del análisis institucional
-- Si múltiples fuentes mencionan lo mismo, preséntalo como hallazgo consolidado
-- Solo incluye información que SÍ fue mencionada, no inventes datos
-- EVITA REDUNDANCIAS: No repitas la misma información, tecnología o concepto múltiples veces
+{REGLAS_CONSOLIDACION}
 
-ESTILO DE REDACCIÓN - MUY IMPORTANTE:
-- Escribe de forma NARRATIVA y FLUIDA, como un informe profesional bien redactado
-- Alterna entre párrafos narrativos y bullet points estratégicos para facilitar la lectura
-- Los bullet points deben usarse para listas concretas (tecnologías, equipos, recursos), NO para todo el contenido
-- Desarrolla ideas en párrafos completos antes de usar listas
-- RECONOCE Y DESTACA los equipos de trabajo, grupos de investigación y comunidades
-- Menciona logros colectivos y capacidades de los equipos
-- Usa un tono profesional pero cercano, que valore el trabajo realizado
-- Usa **negritas** para términos clave y nombres de grupos/tecnologías
-- Cada elemento (tecnología, herramienta, grupo) debe mencionarse UNA SOLA VEZ en la sección
+{self.instrucciones_extraccion}
 
-FORMATO DE SALIDA:
-- Usa Markdown con jerarquía de encabezados (##, ###, ####)
-- Combina prosa narrativa con bullet points donde sea apropiado
-- Las viñetas (-) para listas concretas de items, tecnologías o recursos
-- Párrafos de 3-5 líneas para explicaciones y contexto
+---
+{titulo_entrada}:
+---
 
-{self.instrucciones_extraccion}
+{transcripciones}
 
 ---
-TRANSCRIPCIONES A ANALIZAR:
+
+Genera ÚNICAMENTE la sección "{self.nombre_seccion}" siguiendo las instrucciones anteriores.
+"""
+    
+    def _construir_prompt_prefijo(self, transcripciones: str, titulo_entrada: str = TITULO_TRANSCRIPCIONES) -> str:
+        """
+        Construye el prompt en la disposición "prefijo": reglas comunes y
+        transcripciones primero (idénticas para los 8 agentes, reutilizables
+        desde la caché de prefijos del proveedor) y el rol e instrucciones del
+        agente al final.
+        """
+        return f"""
+{REGLAS_CONSOLIDACION}
+
+---
+{titulo_entrada}:
 ---
 
 {transcripciones}
 
 ---
 
+=== TAREA DEL AGENTE ===
+{self.prompt_sistema}
+
+{self.instrucciones_extraccion}
+
 Genera ÚNICAMENTE la sección "{self.nombre_seccion}" siguiendo las instrucciones anteriores.
 """
     
-    def ejecutar(self, transcripciones: str) -> str:
+    def planificar(self, transcripciones: str, titulo_entrada: str = TITULO_TRANSCRIPCIONES) -> PlanLlamada:
+        """
+        Tokens estimados del prompt que enviaría `ejecutar`, frente a la ventana
+        de contexto del modelo. No llama al proveedor.
+        """
+        prompt = self._construir_prompt(transcripciones, titulo_entrada)
+        return self.cliente.planificar(prompt, max_tokens=self.max_tokens, agente=type(self).__name__)
+    
+    def ejecutar(self, transcripciones: str, titulo_entrada: str = TITULO_TRANSCRIPCIONES) -> str:
         """
         Procesa las transcripciones y genera la sección correspondiente.
         
         Args:
-            transcripciones: Texto concatenado de todas las entrevistas
+            transcripciones: Texto concatenado de todas las entrevistas (o de
+                             sus hechos, ver consolidador/agente_hechos.py)
+            titulo_entrada: Encabezado con que el texto entra al prompt
             
         Returns:
             Contenido Markdown de la sección generada
         """
-        prompt = self._construir_prompt(transcripciones)
-        
-        if self.provider == "openai":
-            return self._llamar_openai(prompt)
-        else:
-            return self._llamar_gemini(prompt)
+        prompt = self._construir_prompt(transcripciones, titulo_entrada)
+        return self.cliente.generar(prompt, max_tokens=self.max_tokens, temperature=self.temperature, agente=type(self).__name__)
     
-    async def ejecutar_async(self, transcripciones: str) -> str:
+    async def ejecutar_async(self, transcripciones: str, titulo_entrada: str = TITULO_TRANSCRIPCIONES) -> str:
         """Versión asíncrona de ejecutar (para procesamiento paralelo)."""
-        import asyncio
-        return await asyncio.get_event_loop().run_in_executor(
-            None, self.ejecutar, transcripciones
-        )
-    
-    def _llamar_openai(self, prompt: str) -> str:
-        """Llama a la API de OpenAI."""
-        params = {
-            "model": self.model,
-            "messages": [
-                {"role": "user", "content": prompt}
-            ],
-            "max_tokens": self.max_tokens,
-            "temperature": self.temperature,
-        }
-        
-        response = self.client.chat.completions.create(**params)
-        return response.choices[0].message.content.strip()
-    
-    def _llamar_gemini(self, prompt: str) -> str:
-        """Llama a la API de Google Gemini."""
-        response = self.client.models.generate_content(
-            model=self.model,
-            contents=prompt,
-            config={
-                "max_output_tokens": self.max_tokens,
-                "temperature": self.temperature,
-            }
-        )
-        return response.text.strip()
+        prompt = self._construir_prompt(transcripciones, titulo_entrada)
+        return await self.cliente.generar_async(prompt, max_tokens=self.max_tokens, temperature=self.temperature, agente=type(self).__name__)
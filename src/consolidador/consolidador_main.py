@@ -4,6 +4,8 @@ Script principal del consolidador de infraestructura IA.
 
 Este script lee todas las transcripciones de entrevistas, las corrige
 y genera un reporte consolidado sobre la infraestructura de IA en la UTP.
+Con --desde-reportes parte en cambio de las secciones de los reportes
+individuales que ya generó main.py, sin corrección.
 
 Usa múltiples agentes especializados para generar secciones específicas:
 - Grupos y Laboratorios
@@ -19,59 +21,115 @@ Uso:
     python -m src.consolidador.consolidador_main                    # Genera reporte consolidado
     python -m src.consolidador.consolidador_main --paralelo         # Ejecución paralela (más rápido)
     python -m src.consolidador.consolidador_main --sin-correccion   # Sin corrección de transcripciones
+    python -m src.consolidador.consolidador_main --sin-cache        # Ignora la caché de respuestas del LLM
+    python -m src.consolidador.consolidador_main --max-concurrencia 8  # Corrige hasta 8 transcripciones a la vez
+    python -m src.consolidador.consolidador_main --hechos           # Cada agente recibe solo los hechos de su sección
+    python -m src.consolidador.consolidador_main --abanico 8        # Reduce los hechos en árbol, de 8 en 8
+    python -m src.consolidador.consolidador_main --desde-reportes   # Parte de los reportes individuales de main.py
     python -m src.consolidador.consolidador_main --help             # Muestra ayuda
 """
+import asyncio
 import os
 import sys
+import time
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 # Agregar el directorio src al path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from config import DATA_RAW_DIR, DATA_OUTPUTS_DIR
+from config import (
+    DATA_RAW_DIR, DATA_OUTPUTS_DIR, CONSOLIDADOR_MAX_CONCURRENCIA, CONSOLIDACION_HECHOS, CONSOLIDACION_ABANICO,
+    CONSOLIDACION_DESDE_REPORTES, REPORTES_INDIVIDUALES_DIR
+)
 from utils.file_loader import cargar_transcripcion, listar_transcripciones, extraer_nombre_entrevistado
 from utils.latex_generator import generar_latex_reporte, compilar_pdf
 from agents.agente_correccion import AgenteCorreccion
 from integrador_consolidado import IntegradorConsolidado
+from consolidador.base_agent_consolidador import TITULO_TRANSCRIPCIONES, TITULO_REPORTES
+from llm import configurar_cache, contexto_entrevista, obtener_cliente_llm, obtener_metricas
+from utils.transcripciones_corregidas import configurar_transcripciones_corregidas
+from utils.hechos_entrevistas import configurar_almacen_hechos
+from utils.almacen_json import huella_texto
+from utils.reportes_individuales import cargar_secciones, texto_secciones
 
 
-def corregir_transcripcion(transcripcion: str, agente_correccion: AgenteCorreccion) -> str:
+def etiquetar_transcripcion(nombre: str, contenido: str) -> str:
+    """Encabezado "ENTREVISTA: nombre" con el que cada transcripción entra al consolidado."""
+    return f"""
+{'='*60}
+ENTREVISTA: {nombre}
+{'='*60}
+
+{contenido}
+"""
+
+
+def concatenar_transcripciones(entrevistas: List[Tuple[str, str]]) -> str:
+    """Texto único con todas las entrevistas (nombre, texto), cada una con su encabezado."""
+    return "\n\n".join(etiquetar_transcripcion(nombre, contenido) for nombre, contenido in entrevistas)
+
+
+async def _preparar_transcripciones_async(
+    archivos: List[str],
+    agente_correccion: Optional[AgenteCorreccion],
+    max_concurrencia: int,
+    verbose: bool
+) -> List[Tuple[str, str]]:
     """
-    Corrige errores de transcripción usando el agente de corrección.
-    
-    Args:
-        transcripcion: Texto de la transcripción original.
-        agente_correccion: Instancia del agente de corrección.
-        
-    Returns:
-        Transcripción corregida.
+    Carga y corrige las transcripciones con hasta `max_concurrencia` a la vez.
+    El progreso se muestra en el orden en que terminan; el resultado (pares
+    nombre, texto) conserva el orden de `archivos`.
     """
-    resultado = agente_correccion.process(transcripcion)
+    semaforo = asyncio.Semaphore(max(1, max_concurrencia))
+    completadas = 0
     
-    # El agente devuelve el texto corregido seguido de las correcciones
-    # Extraer solo el texto corregido (antes de "---CORRECCIONES---")
-    if "---CORRECCIONES---" in resultado:
-        texto_corregido = resultado.split("---CORRECCIONES---")[0].strip()
-        return texto_corregido
-    elif "CORRECCIONES REALIZADAS" in resultado:
-        texto_corregido = resultado.split("CORRECCIONES REALIZADAS")[0].strip()
-        return texto_corregido
+    async def preparar(archivo: str) -> Tuple[str, str]:
+        nonlocal completadas
+        nombre = extraer_nombre_entrevistado(archivo)
+        
+        async with semaforo:
+            inicio = time.perf_counter()
+            contenido = cargar_transcripcion(archivo)
+            detalle = ""
+            
+            # Corregir transcripción si hay agente disponible
+            if agente_correccion:
+                with contexto_entrevista(nombre):
+                    resultado = await agente_correccion.process_async(contenido)
+                contenido = resultado['texto_corregido']
+                if resultado.get('reutilizada'):
+                    detalle = " (corrección reutilizada)"
+                else:
+                    detalle = f" ({time.perf_counter() - inicio:.1f}s)"
+        
+        completadas += 1
+        if verbose:
+            print(f"  [{completadas}/{len(archivos)}] ✓ {nombre}{detalle}")
+        return nombre, contenido
     
-    return resultado
+    return await asyncio.gather(*[preparar(archivo) for archivo in archivos])
 
 
-def preparar_transcripciones(directorio: str, agente_correccion: AgenteCorreccion = None, verbose: bool = True) -> str:
+def cargar_entrevistas(
+    directorio: str,
+    agente_correccion: AgenteCorreccion = None,
+    verbose: bool = True,
+    max_concurrencia: int = CONSOLIDADOR_MAX_CONCURRENCIA
+) -> List[Tuple[str, str]]:
     """
-    Carga, corrige y concatena todas las transcripciones con etiquetas.
+    Carga y corrige todas las transcripciones de un directorio.
     
     Args:
         directorio: Directorio con las transcripciones.
         agente_correccion: Agente para corregir las transcripciones.
         verbose: Si True, muestra progreso.
+        max_concurrencia: Transcripciones que se corrigen a la vez.
         
     Returns:
-        Texto con todas las transcripciones etiquetadas y corregidas.
+        Pares (nombre del entrevistado, texto corregido) en el orden de
+        `listar_transcripciones`.
     """
     archivos = listar_transcripciones(directorio)
     
@@ -80,36 +138,81 @@ def preparar_transcripciones(directorio: str, agente_correccion: AgenteCorreccio
     
     if verbose:
         if agente_correccion:
-            print(f"\nCargando y corrigiendo {len(archivos)} transcripciones...")
+            print(f"\nCargando y corrigiendo {len(archivos)} transcripciones "
+                  f"(hasta {max(1, max_concurrencia)} a la vez)...")
         else:
             print(f"\nCargando {len(archivos)} transcripciones...")
     
-    transcripciones = []
+    return asyncio.run(
+        _preparar_transcripciones_async(archivos, agente_correccion, max_concurrencia, verbose)
+    )
+
+
+def cargar_reportes_individuales(
+    directorio: str,
+    directorio_transcripciones: str = DATA_RAW_DIR,
+    verbose: bool = True
+) -> List[Tuple[str, str]]:
+    """
+    Carga las secciones de los reportes individuales que guardó main.py.
+    Avisa de las transcripciones sin reporte y de los reportes generados a
+    partir de una versión anterior de su transcripción.
     
-    for i, archivo in enumerate(archivos, 1):
-        nombre = extraer_nombre_entrevistado(archivo)
-        contenido = cargar_transcripcion(archivo)
-        
-        # Corregir transcripción si hay agente disponible
-        if agente_correccion:
-            if verbose:
-                print(f"  [{i}/{len(archivos)}] Corrigiendo: {nombre}...")
-            contenido = corregir_transcripcion(contenido, agente_correccion)
-        
-        if verbose:
-            print(f"  [{i}/{len(archivos)}] ✓ {nombre}")
+    Args:
+        directorio: Directorio de salida de main.py.
+        directorio_transcripciones: Directorio con las transcripciones, solo
+                                    para los avisos.
+        verbose: Si True, muestra progreso.
         
-        # Etiquetar cada transcripción
-        transcripcion_etiquetada = f"""
-{'='*60}
-ENTREVISTA: {nombre}
-{'='*60}
-
-{contenido}
-"""
-        transcripciones.append(transcripcion_etiquetada)
+    Returns:
+        Pares (nombre del entrevistado, secciones en Markdown), en orden
+        alfabético.
+    """
+    reportes = cargar_secciones(directorio)
+    if not reportes:
+        raise ValueError(f"No se encontraron reportes individuales en {directorio}; "
+                         f"genera primero los reportes con main.py")
     
-    return "\n\n".join(transcripciones)
+    if verbose:
+        print(f"\nCargando {len(reportes)} reportes individuales de {directorio}...")
+    
+    huellas = {r['nombre']: r.get('huella_transcripcion') for r in reportes}
+    sin_reporte, desactualizados = [], []
+    for archivo in listar_transcripciones(directorio_transcripciones):
+        nombre = extraer_nombre_entrevistado(archivo)
+        if nombre not in huellas:
+            sin_reporte.append(nombre)
+        elif huellas[nombre] != huella_texto(cargar_transcripcion(archivo)):
+            desactualizados.append(nombre)
+    if verbose and sin_reporte:
+        print(f"  ⚠ Transcripciones sin reporte individual (no se incluyen): {', '.join(sorted(sin_reporte))}")
+    if verbose and desactualizados:
+        print(f"  ⚠ Reportes de una versión anterior de la transcripción: {', '.join(sorted(desactualizados))}")
+    
+    return [(r['nombre'], texto_secciones(r)) for r in reportes]
+
+
+def preparar_transcripciones(
+    directorio: str,
+    agente_correccion: AgenteCorreccion = None,
+    verbose: bool = True,
+    max_concurrencia: int = CONSOLIDADOR_MAX_CONCURRENCIA
+) -> str:
+    """
+    Carga, corrige y concatena todas las transcripciones con etiquetas.
+    
+    Args:
+        directorio: Directorio con las transcripciones.
+        agente_correccion: Agente para corregir las transcripciones.
+        verbose: Si True, muestra progreso.
+        max_concurrencia: Transcripciones que se corrigen a la vez.
+        
+    Returns:
+        Texto con todas las transcripciones etiquetadas y corregidas, en el
+        orden de `listar_transcripciones`.
+    """
+    entrevistas = cargar_entrevistas(directorio, agente_correccion, verbose, max_concurrencia)
+    return concatenar_transcripciones(entrevistas)
 
 
 def generar_latex_consolidado(contenido_md: str) -> str:
@@ -282,7 +385,27 @@ def main():
                        help="Saltar corrección de transcripciones (más rápido)")
     parser.add_argument("--paralelo", action="store_true",
                        help="Ejecutar agentes en paralelo (más rápido, puede causar rate limits)")
+    parser.add_argument("--max-concurrencia", type=int, default=CONSOLIDADOR_MAX_CONCURRENCIA,
+                       help=f"Transcripciones que se corrigen a la vez (default: {CONSOLIDADOR_MAX_CONCURRENCIA})")
+    parser.add_argument("--sin-cache", action="store_true",
+                       help="No usar la caché persistente de respuestas del LLM ni las transcripciones ya corregidas")
+    parser.add_argument("--hechos", action="store_true",
+                       help="Extraer primero los hechos de cada entrevista y enviar a cada agente solo los de su sección")
+    parser.add_argument("--abanico", type=int, default=CONSOLIDACION_ABANICO,
+                       help="Reducir los hechos en árbol fusionando K resúmenes por nodo; implica --hechos "
+                            f"(default: {CONSOLIDACION_ABANICO}, 0 = sin árbol)")
+    parser.add_argument("--desde-reportes", nargs="?", metavar="DIR", const=REPORTES_INDIVIDUALES_DIR,
+                       default=REPORTES_INDIVIDUALES_DIR if CONSOLIDACION_DESDE_REPORTES else None,
+                       help="Partir de las secciones de los reportes individuales de main.py en lugar de las "
+                            f"transcripciones, sin corrección (default DIR: {REPORTES_INDIVIDUALES_DIR})")
     args = parser.parse_args()
+    if args.abanico == 1 or args.abanico < 0:
+        parser.error("--abanico debe ser 0 (sin árbol) o al menos 2")
+    
+    cache = configurar_cache(habilitada=not args.sin_cache)
+    transcripciones_corregidas = configurar_transcripciones_corregidas(habilitado=not args.sin_cache)
+    almacen_hechos = configurar_almacen_hechos(habilitado=not args.sin_cache)
+    por_hechos = args.hechos or CONSOLIDACION_HECHOS or args.abanico > 0
     
     print("\n" + "="*60)
     print("  CONSOLIDADOR DE INFRAESTRUCTURA IA - UTP")
@@ -290,7 +413,9 @@ def main():
     print("="*60)
     
     agente_correccion = None
-    if not args.sin_correccion:
+    if args.desde_reportes:
+        print("\n[Entrada: reportes individuales de main.py, sin corrección]")
+    elif not args.sin_correccion:
         # Crear agente de corrección
         print("\nInicializando agentes...")
         agente_correccion = AgenteCorreccion()
@@ -300,21 +425,36 @@ def main():
     
     # Preparar transcripciones (cargar y opcionalmente corregir)
     try:
-        transcripciones = preparar_transcripciones(
-            DATA_RAW_DIR, 
-            agente_correccion=agente_correccion
-        )
+        if args.desde_reportes:
+            entrevistas = cargar_reportes_individuales(args.desde_reportes, DATA_RAW_DIR)
+        else:
+            entrevistas = cargar_entrevistas(
+                DATA_RAW_DIR, 
+                agente_correccion=agente_correccion,
+                max_concurrencia=args.max_concurrencia
+            )
     except ValueError as e:
         print(f"\nError: {e}")
         sys.exit(1)
     
+    integrador = IntegradorConsolidado(verbose=True)
+    
+    hechos = None
+    if por_hechos:
+        print(f"\nExtrayendo hechos de {len(entrevistas)} entrevistas "
+              f"(hasta {max(1, args.max_concurrencia)} a la vez)...")
+        hechos = integrador.extraer_hechos(entrevistas, max_concurrencia=args.max_concurrencia)
+        if args.abanico:
+            print(f"\nReduciendo los hechos en árbol (abanico {args.abanico})...")
+            niveles = integrador.reducir_hechos(hechos, args.abanico, max_concurrencia=args.max_concurrencia)
+    else:
+        transcripciones = concatenar_transcripciones(entrevistas)
+    
     # Crear integrador de agentes consolidadores
     print("\n" + "-"*60)
     print("Generando reporte consolidado con agentes especializados...")
     print("-"*60)
     
-    integrador = IntegradorConsolidado(verbose=True)
-    
     # Mostrar agentes que se ejecutarán
     agentes_info = integrador.obtener_agentes()
     print(f"\n  Agentes a ejecutar: {len(agentes_info)}")
@@ -322,11 +462,22 @@ def main():
         print(f"    - {info['nombre']}")
     
     modo = "paralelo" if args.paralelo else "secuencial"
+    if args.abanico:
+        modo += f", por hechos en árbol (abanico {args.abanico})"
+    elif por_hechos:
+        modo += ", por hechos"
     print(f"\n  Modo de ejecución: {modo}")
     print("  (Esto puede tomar varios minutos)\n")
     
     try:
-        reporte_md = integrador.procesar(transcripciones, paralelo=args.paralelo)
+        with contexto_entrevista("consolidado"):
+            if args.abanico:
+                reporte_md = integrador.procesar_arbol(niveles, paralelo=args.paralelo)
+            elif por_hechos:
+                reporte_md = integrador.procesar_hechos(hechos, paralelo=args.paralelo)
+            else:
+                titulo = TITULO_REPORTES if args.desde_reportes else TITULO_TRANSCRIPCIONES
+                reporte_md = integrador.procesar(transcripciones, paralelo=args.paralelo, titulo_entrada=titulo)
         print("\n  ✓ Análisis completado")
     except Exception as e:
         print(f"\n  ✗ Error generando reporte: {e}")
@@ -359,6 +510,19 @@ def main():
             f.write(reporte_md)
         print(f"  Se guardó el reporte en Markdown: {ruta_md}")
     
+    print(f"\n  {cache.resumen()}")
+    if agente_correccion:
+        print(f"  {transcripciones_corregidas.resumen()}")
+    if por_hechos:
+        print(f"  {almacen_hechos.resumen()}")
+    print(f"  {obtener_cliente_llm().limitador.resumen()}")
+    print(f"  {obtener_cliente_llm().resumen_tokens()}")
+    
+    metricas = obtener_metricas()
+    ruta_metricas = metricas.guardar_json(os.path.join(DATA_OUTPUTS_DIR, "metricas_llm_consolidado.json"))
+    print(f"\n{metricas.resumen()}")
+    print(f"\n  Métricas guardadas en: {ruta_metricas}")
+    
     print("\n" + "="*60)
     print("  CONSOLIDACIÓN COMPLETADA")
     print("="*60 + "\n")
@@ -3,11 +3,18 @@ Integrador de agentes consolidadores.
 
 Orquesta la ejecución de múltiples agentes especializados para generar
 un reporte consolidado completo sobre capacidades de IA en la UTP.
+
+Cada agente recibe las transcripciones concatenadas (o las secciones de los
+reportes individuales de main.py) o, en la consolidación por
+hechos, solo los hechos de sus categorías extraídos antes de cada entrevista
+(ver consolidador/agente_hechos.py). Con muchas entrevistas, los hechos se
+reducen antes en árbol hasta un único resumen raíz (ver `reducir_hechos`).
 """
 import sys
 import os
 import asyncio
-from typing import List, Dict, Optional
+import time
+from typing import List, Dict, Optional, Tuple
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -21,6 +28,12 @@ from consolidador.agentes import (
     AgentePropuestas,
     AgenteConclusiones,
 )
+from consolidador.agente_hechos import AgenteHechos, AgenteFusionHechos, formatear_hechos
+from consolidador.base_agent_consolidador import TITULO_TRANSCRIPCIONES, TITULO_HECHOS, TITULO_REPORTES
+from config import CONSOLIDADOR_MAX_CONCURRENCIA
+from llm import (
+    ClienteLLM, ErrorPresupuestoTokens, contexto_entrevista, obtener_cliente_llm, obtener_metricas, resumen_plan
+)
 
 
 class IntegradorConsolidado:
@@ -31,41 +44,248 @@ class IntegradorConsolidado:
     Puede ejecutar los agentes en paralelo o secuencialmente.
     """
     
-    def __init__(self, verbose: bool = True):
+    def __init__(self, verbose: bool = True, cliente: ClienteLLM = None):
         self.verbose = verbose
+        cliente = cliente or obtener_cliente_llm()
         self.agentes = [
-            AgenteGruposLabs(),
-            AgenteHardware(),
-            AgenteSoftware(),
-            AgenteFortalezas(),
-            AgenteLimitaciones(),
-            AgenteOportunidades(),
-            AgentePropuestas(),
-            AgenteConclusiones(),
+            AgenteGruposLabs(cliente),
+            AgenteHardware(cliente),
+            AgenteSoftware(cliente),
+            AgenteFortalezas(cliente),
+            AgenteLimitaciones(cliente),
+            AgenteOportunidades(cliente),
+            AgentePropuestas(cliente),
+            AgenteConclusiones(cliente),
         ]
+        
+        # Extracción de hechos por entrevista (consolidación por hechos)
+        self.agente_hechos = AgenteHechos(cliente)
+        self.agente_fusion = AgenteFusionHechos(cliente)
     
     def _log(self, mensaje: str):
         """Imprime mensaje si verbose está activado."""
         if self.verbose:
             print(mensaje)
     
-    def procesar(self, transcripciones: str, paralelo: bool = False) -> str:
+    def procesar(
+        self,
+        transcripciones: str,
+        paralelo: bool = False,
+        titulo_entrada: str = TITULO_TRANSCRIPCIONES
+    ) -> str:
         """
         Procesa las transcripciones con todos los agentes y genera el reporte.
         
         Args:
             transcripciones: Texto concatenado de todas las entrevistas
             paralelo: Si True, ejecuta agentes en paralelo; si False, secuencial
+            titulo_entrada: Encabezado del texto en el prompt (TITULO_REPORTES
+                            si son las secciones de los reportes individuales)
+            
+        Returns:
+            Reporte consolidado en formato Markdown
+        """
+        return self._procesar_textos([transcripciones] * len(self.agentes), titulo_entrada, paralelo)
+    
+    def extraer_hechos(
+        self,
+        entrevistas: List[Tuple[str, str]],
+        max_concurrencia: int = CONSOLIDADOR_MAX_CONCURRENCIA
+    ) -> List[Tuple[str, Dict[str, List[str]]]]:
+        """
+        Extrae los hechos de cada entrevista, hasta `max_concurrencia` a la vez.
+        Los hechos ya extraídos de una entrevista con el mismo texto se
+        reutilizan sin llamar al LLM.
+        
+        Args:
+            entrevistas: Pares (nombre, texto de la entrevista).
+            max_concurrencia: Entrevistas que se procesan a la vez.
+            
+        Returns:
+            Pares (nombre, hechos por categoría) en el orden de `entrevistas`;
+            sin hechos si la extracción de una entrevista falló.
+        """
+        return asyncio.run(self._extraer_hechos_async(entrevistas, max_concurrencia))
+    
+    async def _extraer_hechos_async(self, entrevistas: List[Tuple[str, str]], max_concurrencia: int) -> list:
+        semaforo = asyncio.Semaphore(max(1, max_concurrencia))
+        completadas = 0
+        fallidas = []
+        inicio = time.perf_counter()
+        
+        async def extraer(nombre: str, texto: str) -> Tuple[str, Dict[str, List[str]]]:
+            nonlocal completadas
+            async with semaforo:
+                with contexto_entrevista(nombre):
+                    hechos = await self.agente_hechos.extraer_async(texto, nombre)
+            completadas += 1
+            if hechos is None:
+                fallidas.append(nombre)
+                hechos = {}
+            self._log(f"  [{completadas}/{len(entrevistas)}] {'✓' if hechos else '✗'} Hechos: {nombre} "
+                      f"({sum(len(h) for h in hechos.values())})")
+            return nombre, hechos
+        
+        resultado = await asyncio.gather(*[extraer(nombre, texto) for nombre, texto in entrevistas])
+        self._log(f"  Hechos de {len(entrevistas) - len(fallidas)}/{len(entrevistas)} entrevistas "
+                  f"en {time.perf_counter() - inicio:.1f}s")
+        if fallidas:
+            self._log(f"  ⚠ Sin hechos (se omiten del consolidado): {', '.join(fallidas)}")
+        return resultado
+    
+    def procesar_hechos(self, hechos: List[Tuple[str, Dict[str, List[str]]]], paralelo: bool = False) -> str:
+        """
+        Genera el reporte a partir de los hechos de cada entrevista: cada
+        agente recibe solo los hechos de sus categorías (`categorias_hechos`).
+        
+        Args:
+            hechos: Resultado de `extraer_hechos`.
+            paralelo: Si True, ejecuta agentes en paralelo; si False, secuencial
+            
+        Returns:
+            Reporte consolidado en formato Markdown
+        """
+        textos = [formatear_hechos(hechos, agente.categorias_hechos) for agente in self.agentes]
+        return self._procesar_textos(textos, TITULO_HECHOS, paralelo)
+    
+    def reducir_hechos(
+        self,
+        hechos: List[Tuple[str, Dict[str, List[str]]]],
+        abanico: int,
+        max_concurrencia: int = CONSOLIDADOR_MAX_CONCURRENCIA
+    ) -> List[List[Tuple[str, Dict[str, List[str]]]]]:
+        """
+        Reducción en árbol: fusiona los hechos de cada `abanico` entrevistas en
+        un resumen, los de cada `abanico` resúmenes en otro, y así por niveles
+        hasta un único resumen raíz. Las fusiones de un nivel se ejecutan a la
+        vez (hasta `max_concurrencia`); un grupo de un solo elemento pasa al
+        nivel siguiente sin fusionar. Muestra la profundidad y la latencia y
+        los tokens de cada nivel.
+        
+        Args:
+            hechos: Resultado de `extraer_hechos`.
+            abanico: Resúmenes que se fusionan en cada nodo (al menos 2).
+            max_concurrencia: Fusiones que se ejecutan a la vez.
+            
+        Returns:
+            Niveles del árbol: el primero, los hechos de cada entrevista (sin
+            las que no tienen hechos); el último, la raíz.
+        """
+        if abanico < 2:
+            raise ValueError(f"El abanico de la reducción en árbol debe ser al menos 2 (recibido: {abanico})")
+        return asyncio.run(self._reducir_hechos_async(hechos, abanico, max_concurrencia))
+    
+    async def _reducir_hechos_async(self, hechos: list, abanico: int, max_concurrencia: int) -> list:
+        semaforo = asyncio.Semaphore(max(1, max_concurrencia))
+        metricas = obtener_metricas()
+        
+        # (nombre, hechos, entrevistas que cubre) de cada nodo del nivel actual
+        nodos = [(nombre, h, 1) for nombre, h in hechos if any(h.values())]
+        niveles = [[(nombre, h) for nombre, h, _ in nodos]]
+        llamadas = tokens_entrada = tokens_salida = 0
+        inicio_arbol = time.perf_counter()
+        
+        while len(nodos) > 1:
+            numero = len(niveles)
+            etiqueta = f"árbol nivel {numero}"
+            encabezado = "ENTREVISTA" if numero == 1 else "RESUMEN"
+            grupos = [nodos[i:i + abanico] for i in range(0, len(nodos), abanico)]
+            
+            async def fusionar(indice: int, grupo: list) -> tuple:
+                cubiertas = sum(c for _, _, c in grupo)
+                if len(grupo) == 1:
+                    return grupo[0]
+                nombre = f"nivel {numero}, grupo {indice} ({cubiertas} entrevistas)"
+                async with semaforo:
+                    with contexto_entrevista(etiqueta):
+                        fusionados = await self.agente_fusion.fusionar_async(
+                            [(n, h) for n, h, _ in grupo], nombre, encabezado
+                        )
+                return nombre, fusionados, cubiertas
+            
+            primer_registro = len(metricas.registros)
+            inicio = time.perf_counter()
+            nuevos = await asyncio.gather(*[fusionar(i, grupo) for i, grupo in enumerate(grupos, 1)])
+            segundos = time.perf_counter() - inicio
+            
+            registros = [r for r in metricas.registros[primer_registro:] if r.entrevista == etiqueta]
+            entrada = sum(r.tokens_entrada for r in registros)
+            salida = sum(r.tokens_salida for r in registros)
+            llamadas += len(registros)
+            tokens_entrada += entrada
+            tokens_salida += salida
+            self._log(f"  Nivel {numero}: {len(nodos)} → {len(nuevos)} resúmenes en {segundos:.1f}s "
+                      f"({len(registros)} llamadas, {entrada} tokens de entrada, {salida} de salida)")
+            
+            nodos = nuevos
+            niveles.append([(nombre, h) for nombre, h, _ in nodos])
+        
+        self._log(f"  Árbol de hechos (abanico {abanico}): {' → '.join(str(len(n)) for n in niveles)}, "
+                  f"profundidad {len(niveles) - 1}, {time.perf_counter() - inicio_arbol:.1f}s, "
+                  f"{llamadas} llamadas, {tokens_entrada} tokens de entrada, {tokens_salida} de salida")
+        return niveles
+    
+    def procesar_arbol(self, niveles: List[List[Tuple[str, Dict[str, List[str]]]]], paralelo: bool = False) -> str:
+        """
+        Genera el reporte a partir de la reducción en árbol de los hechos: los
+        agentes con `usa_raiz_arbol` (Propuestas, Conclusiones) reciben el
+        resumen raíz; el resto, el nivel más bajo cuyo texto cabe en la ventana
+        del modelo (los hechos de cada entrevista, si caben).
+        
+        Args:
+            niveles: Resultado de `reducir_hechos`.
+            paralelo: Si True, ejecuta agentes en paralelo; si False, secuencial
             
         Returns:
             Reporte consolidado en formato Markdown
         """
+        textos = []
+        for agente in self.agentes:
+            candidatos = [len(niveles) - 1] if agente.usa_raiz_arbol else range(len(niveles))
+            for numero in candidatos:
+                encabezado = "ENTREVISTA" if numero == 0 else "RESUMEN"
+                texto = formatear_hechos(niveles[numero], agente.categorias_hechos, encabezado)
+                if agente.planificar(texto, TITULO_HECHOS).cabe:
+                    break
+            textos.append(texto)
+            self._log(f"    - {agente.nombre_seccion}: nivel {numero} ({len(niveles[numero])} "
+                      f"{'entrevistas' if numero == 0 else 'resúmenes'})")
+        return self._procesar_textos(textos, TITULO_HECHOS, paralelo)
+    
+    def _procesar_textos(self, textos: List[str], titulo_entrada: str, paralelo: bool) -> str:
+        """Ejecuta cada agente con su texto (en el orden de `self.agentes`) y ensambla el reporte."""
+        self._verificar_presupuesto(textos, titulo_entrada)
+        
         if paralelo:
-            return asyncio.run(self._procesar_paralelo(transcripciones))
+            return asyncio.run(self._procesar_paralelo(textos, titulo_entrada))
         else:
-            return self._procesar_secuencial(transcripciones)
+            return self._procesar_secuencial(textos, titulo_entrada)
     
-    def _procesar_secuencial(self, transcripciones: str) -> str:
+    def _verificar_presupuesto(self, textos: List[str], titulo_entrada: str = TITULO_TRANSCRIPCIONES) -> None:
+        """
+        Muestra el gasto de tokens planificado de los agentes y rechaza la
+        consolidación antes de la primera llamada si el texto de algún agente
+        (transcripciones concatenadas, reportes individuales o hechos) no cabe en la ventana del modelo.
+        
+        Raises:
+            ErrorPresupuestoTokens: Si algún prompt no cabe en la ventana.
+        """
+        planes = [agente.planificar(texto, titulo_entrada) for agente, texto in zip(self.agentes, textos)]
+        self._log("  " + resumen_plan(planes))
+        
+        excedidos = [p for p in planes if not p.cabe]
+        if excedidos:
+            material = {
+                TITULO_HECHOS: "Los hechos de las entrevistas",
+                TITULO_REPORTES: "Los reportes individuales",
+            }.get(titulo_entrada, "Las transcripciones")
+            raise ErrorPresupuestoTokens(
+                f"{material} (~{excedidos[0].tokens_entrada} tokens) no caben en la ventana de "
+                f"{excedidos[0].ventana} tokens del modelo; reduce el número de entrevistas o usa "
+                f"un modelo con más contexto"
+            )
+    
+    def _procesar_secuencial(self, textos: List[str], titulo_entrada: str = TITULO_TRANSCRIPCIONES) -> str:
         """Ejecuta los agentes uno por uno."""
         secciones = []
         total = len(self.agentes)
@@ -74,7 +294,7 @@ class IntegradorConsolidado:
             self._log(f"  [{i}/{total}] Generando: {agente.nombre_seccion}...")
             
             try:
-                seccion = agente.ejecutar(transcripciones)
+                seccion = agente.ejecutar(textos[i - 1], titulo_entrada)
                 secciones.append(seccion)
                 self._log(f"  [{i}/{total}] ✓ Completado: {agente.nombre_seccion}")
             except Exception as e:
@@ -83,13 +303,13 @@ class IntegradorConsolidado:
         
         return self._ensamblar_reporte(secciones)
     
-    async def _procesar_paralelo(self, transcripciones: str) -> str:
+    async def _procesar_paralelo(self, textos: List[str], titulo_entrada: str = TITULO_TRANSCRIPCIONES) -> str:
         """Ejecuta los agentes en paralelo."""
         self._log(f"  Ejecutando {len(self.agentes)} agentes en paralelo...")
         
         async def ejecutar_agente(agente, idx: int):
             try:
-                resultado = await agente.ejecutar_async(transcripciones)
+                resultado = await agente.ejecutar_async(textos[idx], titulo_entrada)
                 self._log(f"  ✓ Completado: {agente.nombre_seccion}")
                 return (idx, resultado)
             except Exception as e:
@@ -101,7 +321,18 @@ class IntegradorConsolidado:
             for i, agente in enumerate(self.agentes)
         ]
         
-        resultados = await asyncio.gather(*tareas)
+        # El primer agente calienta la caché de prefijos del proveedor, solo si
+        # otro agente comparte su prefijo (mismo texto de entrada); con hechos
+        # filtrados por categoría cada agente recibe un texto distinto
+        comparten_prefijo = self.agentes[0].disposicion_prompt == "prefijo" and any(
+            agente.disposicion_prompt == "prefijo" and texto == textos[0]
+            for agente, texto in zip(self.agentes[1:], textos[1:])
+        )
+        if comparten_prefijo:
+            primero = await tareas[0]
+            resultados = [primero] + list(await asyncio.gather(*tareas[1:]))
+        else:
+            resultados = await asyncio.gather(*tareas)
         
         # Ordenar resultados por índice original
         resultados_ordenados = sorted(resultados, key=lambda x: x[0])
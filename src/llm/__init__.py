@@ -0,0 +1,33 @@
+"""
+Capa compartida de acceso a los proveedores de LLM.
+
+Todos los agentes (individuales y consolidadores) envían sus llamadas a través
+de un único cliente por proceso.
+"""
+from .cache import CacheRespuestas, configurar_cache, obtener_cache
+from .cliente import ClienteLLM, ErrorLimiteTasa, obtener_cliente_llm
+from .limitador import LimitadorTasa, obtener_limitador
+from .metricas import MetricasLLM, RegistroLlamada, contexto_entrevista, entrevista_actual, obtener_metricas
+from .tokens import ErrorPresupuestoTokens, PlanLlamada, estimar_tokens, resumen_plan, salida_maxima, ventana_contexto
+
+__all__ = [
+    'CacheRespuestas',
+    'configurar_cache',
+    'obtener_cache',
+    'ClienteLLM',
+    'ErrorLimiteTasa',
+    'obtener_cliente_llm',
+    'LimitadorTasa',
+    'obtener_limitador',
+    'MetricasLLM',
+    'RegistroLlamada',
+    'contexto_entrevista',
+    'entrevista_actual',
+    'obtener_metricas',
+    'ErrorPresupuestoTokens',
+    'PlanLlamada',
+    'estimar_tokens',
+    'resumen_plan',
+    'salida_maxima',
+    'ventana_contexto',
+]
@@ -0,0 +1,180 @@
+"""
+Caché persistente de respuestas del LLM.
+
+Cada respuesta se guarda en disco bajo el hash SHA-256 de todo lo que la
+determina (proveedor, modelo, temperatura, max_tokens, prompt de sistema y
+prompt de usuario). Repetir una ejecución con las mismas transcripciones y
+prompts no vuelve a llamar al proveedor. El tamaño total está acotado y se
+desalojan primero las entradas usadas hace más tiempo (LRU por mtime).
+"""
+import sys
+import os
+import json
+import threading
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import LLM_CACHE_DIR, LLM_CACHE_MAX_MB
+from utils.almacen_json import escribir_json_atomico, huella_campos
+
+
+class CacheRespuestas:
+    """
+    Caché de respuestas en disco, direccionada por contenido y con desalojo LRU.
+    
+    Los archivos se reparten en subdirectorios por los dos primeros caracteres
+    del hash. Un acierto actualiza la fecha de modificación del archivo, que es
+    la que se usa para decidir qué desalojar cuando se supera el tamaño máximo.
+    """
+    
+    def __init__(self, directorio: str = LLM_CACHE_DIR, max_mb: int = LLM_CACHE_MAX_MB, habilitada: bool = True):
+        self.directorio = directorio
+        self.max_bytes = max_mb * 1024 * 1024
+        self.habilitada = habilitada
+        self.aciertos = 0
+        self.fallos = 0
+        
+        self._lock = threading.Lock()
+        self._tamano_total = None
+    
+    @staticmethod
+    def calcular_clave(**campos) -> str:
+        """
+        Calcula la clave de caché de una llamada.
+        
+        Args:
+            **campos: Todo lo que determina la respuesta (proveedor, modelo,
+                      temperatura, max_tokens, prompts, ...).
+                      
+        Returns:
+            Hash SHA-256 en hexadecimal.
+        """
+        return huella_campos(campos, longitud=None)
+    
+    def _ruta(self, clave: str) -> str:
+        return os.path.join(self.directorio, clave[:2], f"{clave}.json")
+    
+    def obtener(self, clave: str) -> Optional[str]:
+        """
+        Busca una respuesta en la caché.
+        
+        Args:
+            clave: Clave calculada con `calcular_clave`.
+            
+        Returns:
+            La respuesta guardada, o None si no existe o la caché está desactivada.
+        """
+        if not self.habilitada:
+            return None
+        
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                respuesta = json.load(f)['respuesta']
+            os.utime(ruta)
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.fallos += 1
+            return None
+        
+        with self._lock:
+            self.aciertos += 1
+        return respuesta
+    
+    def guardar(self, clave: str, respuesta: str) -> None:
+        """
+        Guarda una respuesta y desaloja entradas antiguas si se supera el tamaño máximo.
+        
+        Args:
+            clave: Clave calculada con `calcular_clave`.
+            respuesta: Texto de la respuesta del LLM.
+        """
+        if not self.habilitada:
+            return
+        
+        ruta = self._ruta(clave)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        
+        # Escritura atómica: otro hilo puede leer la misma clave a la vez
+        tamano_anterior = os.path.getsize(ruta) if os.path.exists(ruta) else 0
+        escribir_json_atomico(ruta, {'respuesta': respuesta}, indent=None)
+        
+        with self._lock:
+            if self._tamano_total is None:
+                self._tamano_total = self._calcular_tamano()
+            else:
+                self._tamano_total += os.path.getsize(ruta) - tamano_anterior
+            if self._tamano_total > self.max_bytes:
+                self._desalojar()
+    
+    def _listar_entradas(self) -> list:
+        """Lista (mtime, tamaño, ruta) de todas las entradas en disco."""
+        entradas = []
+        for raiz, _, archivos in os.walk(self.directorio):
+            for nombre in archivos:
+                if not nombre.endswith('.json'):
+                    continue
+                ruta = os.path.join(raiz, nombre)
+                try:
+                    stat = os.stat(ruta)
+                except OSError:
+                    continue
+                entradas.append((stat.st_mtime, stat.st_size, ruta))
+        return entradas
+    
+    def _calcular_tamano(self) -> int:
+        return sum(tamano for _, tamano, _ in self._listar_entradas())
+    
+    def _desalojar(self) -> None:
+        """Elimina las entradas menos usadas hasta quedar por debajo del máximo."""
+        entradas = sorted(self._listar_entradas())
+        total = sum(tamano for _, tamano, _ in entradas)
+        
+        for _, tamano, ruta in entradas:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(ruta)
+                total -= tamano
+            except OSError:
+                continue
+        
+        self._tamano_total = total
+    
+    def resumen(self) -> str:
+        """Línea de resumen con los contadores de la ejecución."""
+        if not self.habilitada:
+            return "Caché LLM: desactivada"
+        total = self.aciertos + self.fallos
+        tasa = (self.aciertos / total * 100) if total else 0.0
+        return f"Caché LLM: {self.aciertos} aciertos, {self.fallos} fallos ({tasa:.0f}% de aciertos)"
+
+
+_cache_compartida = None
+_lock_compartido = threading.Lock()
+
+
+def obtener_cache() -> CacheRespuestas:
+    """Retorna la caché de respuestas compartida del proceso."""
+    global _cache_compartida
+    if _cache_compartida is None:
+        with _lock_compartido:
+            if _cache_compartida is None:
+                _cache_compartida = CacheRespuestas()
+    return _cache_compartida
+
+
+def configurar_cache(habilitada: bool) -> CacheRespuestas:
+    """
+    Activa o desactiva la caché compartida (opción --sin-cache).
+    
+    Args:
+        habilitada: Si False, no se lee ni se escribe en la caché.
+        
+    Returns:
+        La caché compartida.
+    """
+    cache = obtener_cache()
+    cache.habilitada = habilitada
+    return cache
@@ -0,0 +1,529 @@
+"""
+Cliente LLM compartido por todo el proceso.
+
+Crea un solo cliente del SDK por proveedor (síncrono y asíncrono nativo) con un
+pool de conexiones HTTP keep-alive de tamaño configurable. Los agentes reciben
+este cliente en lugar de construir el suyo, de modo que todas las llamadas de
+una ejecución reutilizan las mismas conexiones TLS.
+"""
+import sys
+import os
+import asyncio
+import threading
+import time
+import weakref
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    LLM_PROVIDER,
+    OPENAI_API_KEY, OPENAI_MODEL,
+    GOOGLE_API_KEY, GEMINI_MODEL,
+    LOCAL_MODEL,
+    MAX_TOKENS, TEMPERATURE, LLM_POOL_SIZE,
+    MODELOS_PREDICCION
+)
+from .cache import CacheRespuestas, obtener_cache
+from .limitador import obtener_limitador
+from .metricas import MetricasLLM, RegistroLlamada, obtener_metricas
+from .tokens import PlanLlamada, estimar_tokens, salida_maxima, ventana_contexto
+
+
+class ErrorLimiteTasa(Exception):
+    """Se agotaron los reintentos por límite de tasa del proveedor."""
+    pass
+
+
+def es_error_limite_tasa(error: Exception) -> bool:
+    """
+    Indica si la excepción del SDK corresponde a un límite de tasa, por su tipo
+    o código y no por el texto del mensaje: `openai.RateLimitError` o
+    `status_code` 429 (OpenAI, proveedor local), o `code` 429 / `status`
+    RESOURCE_EXHAUSTED (google-genai).
+    """
+    try:
+        from openai import RateLimitError
+        if isinstance(error, RateLimitError):
+            return True
+    except ImportError:
+        pass
+    if getattr(error, 'status_code', None) == 429 or getattr(error, 'code', None) == 429:
+        return True
+    return getattr(error, 'status', None) == "RESOURCE_EXHAUSTED"
+
+
+class ClienteLLM:
+    """
+    Envoltorio sobre el SDK de OpenAI o Gemini (o el proveedor local simulado)
+    compartido por todos los agentes.
+    
+    Los clientes del SDK se crean de forma perezosa. El cliente síncrono es
+    seguro entre hilos y se comparte siempre; el asíncrono se crea uno por
+    event loop porque sus conexiones quedan ligadas al loop que las abrió
+    (main.py ejecuta un `asyncio.run` por entrevista).
+    """
+    
+    max_reintentos = 3
+    
+    def __init__(self, provider: str = None, pool_size: int = None, cache: CacheRespuestas = None, metricas: MetricasLLM = None):
+        self.provider = (provider or LLM_PROVIDER).lower()
+        self.pool_size = pool_size or LLM_POOL_SIZE
+        self.model = {"openai": OPENAI_MODEL, "local": LOCAL_MODEL}.get(self.provider, GEMINI_MODEL)
+        self.cache = cache or obtener_cache()
+        self.limitador = obtener_limitador(self.provider, self.model)
+        self.metricas = metricas or obtener_metricas()
+        self.ventana = ventana_contexto(self.provider, self.model)
+        self.salida_maxima = salida_maxima(self.provider, self.model)
+        
+        self._lock = threading.Lock()
+        self._cliente = None
+        self._clientes_async = weakref.WeakKeyDictionary()
+        
+        # Uso acumulado de las llamadas reales (las respuestas en caché no cuentan)
+        self.llamadas = 0
+        self.tokens_entrada = 0
+        self.tokens_cacheados = 0
+        self.tokens_salida = 0
+        self.tokens_prediccion_aceptados = 0
+        self.tokens_prediccion_rechazados = 0
+    
+    @property
+    def admite_prediccion(self) -> bool:
+        """True si el modelo acepta salidas predichas (el proveedor local las simula)."""
+        if self.provider == "local":
+            return True
+        return self.provider == "openai" and any(self.model.startswith(m) for m in MODELOS_PREDICCION)
+    
+    def _limites_http(self):
+        """Límites del pool de conexiones HTTP (keep-alive)."""
+        import httpx
+        return httpx.Limits(
+            max_connections=self.pool_size,
+            max_keepalive_connections=self.pool_size
+        )
+    
+    def _crear_cliente(self, asincrono: bool):
+        """Construye un cliente del SDK con el pool de conexiones configurado."""
+        if self.provider == "local":
+            from .proveedor_local import ProveedorLocal
+            return ProveedorLocal()
+        elif self.provider == "openai":
+            if asincrono:
+                from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+                return AsyncOpenAI(
+                    api_key=OPENAI_API_KEY,
+                    http_client=DefaultAsyncHttpxClient(limits=self._limites_http())
+                )
+            from openai import OpenAI, DefaultHttpxClient
+            return OpenAI(
+                api_key=OPENAI_API_KEY,
+                http_client=DefaultHttpxClient(limits=self._limites_http())
+            )
+        else:  # gemini
+            from google import genai
+            from google.genai import types
+            cliente = genai.Client(
+                api_key=GOOGLE_API_KEY,
+                http_options=types.HttpOptions(
+                    client_args={"limits": self._limites_http()},
+                    async_client_args={"limits": self._limites_http()}
+                )
+            )
+            return cliente.aio if asincrono else cliente
+    
+    @property
+    def cliente(self):
+        """Cliente síncrono del SDK (uno por proceso)."""
+        if self._cliente is None:
+            with self._lock:
+                if self._cliente is None:
+                    self._cliente = self._crear_cliente(asincrono=False)
+        return self._cliente
+    
+    @property
+    def cliente_async(self):
+        """Cliente asíncrono nativo del SDK para el event loop en curso."""
+        if self.provider == "local":
+            # El simulador no abre conexiones: una sola instancia para todo el proceso
+            return self.cliente
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            cliente = self._clientes_async.get(loop)
+            if cliente is None:
+                cliente = self._crear_cliente(asincrono=True)
+                self._clientes_async[loop] = cliente
+        return cliente
+    
+    @classmethod
+    def _esquema_estricto(cls, esquema: dict) -> dict:
+        """Copia del esquema que prohíbe propiedades extra en cada objeto (modo estricto de OpenAI)."""
+        if not isinstance(esquema, dict):
+            return esquema
+        estricto = {clave: cls._esquema_estricto(valor) if clave == "items" else valor for clave, valor in esquema.items()}
+        if "properties" in esquema:
+            estricto["properties"] = {nombre: cls._esquema_estricto(prop) for nombre, prop in esquema["properties"].items()}
+        if esquema.get("type") == "object":
+            estricto["additionalProperties"] = False
+        return estricto
+    
+    def _parametros_openai(self, prompt_usuario: str, prompt_sistema: str, max_tokens: int, temperature: float,
+                           esquema: dict = None, prediccion: str = None) -> dict:
+        """Parámetros de chat.completions para OpenAI."""
+        # Modelos nuevos (gpt-4.1, o1, etc.) usan max_completion_tokens
+        # Modelos antiguos (gpt-4o-mini, gpt-4, etc.) usan max_tokens
+        use_new_param = any(x in self.model for x in ['gpt-4.1', 'gpt-5', 'o1', 'o3'])
+        
+        mensajes = []
+        if prompt_sistema:
+            mensajes.append({"role": "system", "content": prompt_sistema})
+        mensajes.append({"role": "user", "content": prompt_usuario})
+        
+        params = {
+            "model": self.model,
+            "messages": mensajes,
+            "temperature": temperature
+        }
+        
+        # Predicted outputs no admite max_completion_tokens: con predicción se
+        # envía max_tokens también a los modelos nuevos (gpt-4.1 lo acepta)
+        usar_prediccion = bool(prediccion) and not esquema and self.admite_prediccion
+        if use_new_param and not usar_prediccion:
+            params["max_completion_tokens"] = max_tokens
+        else:
+            params["max_tokens"] = max_tokens
+        
+        if esquema:
+            # Structured outputs en modo estricto
+            params["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "respuesta",
+                    "strict": True,
+                    "schema": self._esquema_estricto(esquema),
+                },
+            }
+        elif usar_prediccion:
+            # Predicted outputs: no compatible con salida estructurada
+            params["prediction"] = {"type": "content", "content": prediccion}
+        return params
+    
+    @staticmethod
+    def _contenido_gemini(prompt_usuario: str, prompt_sistema: str) -> str:
+        """
+        Texto que se envía a Gemini: el prompt de sistema antepuesto al de
+        usuario, como lo enviaban los agentes (sin system_instruction).
+        """
+        if prompt_sistema:
+            return f"{prompt_sistema}\n\n{prompt_usuario}"
+        return prompt_usuario
+    
+    def _config_gemini(self, max_tokens: int, temperature: float, esquema: dict = None):
+        """Configuración de generate_content para Gemini."""
+        from google.genai import types
+        salida_json = {}
+        if esquema:
+            salida_json = {"response_mime_type": "application/json", "response_schema": esquema}
+        return types.GenerateContentConfig(
+            max_output_tokens=max_tokens,
+            temperature=temperature,
+            **salida_json
+        )
+    
+    @staticmethod
+    def _uso_openai(response) -> dict:
+        """Tokens de entrada, cacheados, de salida y de predicción de una respuesta de OpenAI."""
+        uso = getattr(response, "usage", None)
+        if uso is None:
+            return {}
+        detalles = getattr(uso, "prompt_tokens_details", None)
+        detalles_salida = getattr(uso, "completion_tokens_details", None)
+        return {
+            "tokens_entrada": uso.prompt_tokens or 0,
+            "tokens_cacheados": getattr(detalles, "cached_tokens", 0) or 0,
+            "tokens_salida": uso.completion_tokens or 0,
+            "tokens_prediccion_aceptados": getattr(detalles_salida, "accepted_prediction_tokens", 0) or 0,
+            "tokens_prediccion_rechazados": getattr(detalles_salida, "rejected_prediction_tokens", 0) or 0,
+            "finish_reason": response.choices[0].finish_reason,
+        }
+    
+    @staticmethod
+    def _uso_gemini(response) -> dict:
+        """Tokens de entrada, cacheados y de salida de una respuesta de Gemini."""
+        uso = getattr(response, "usage_metadata", None)
+        if uso is None:
+            return {}
+        candidatos = getattr(response, "candidates", None) or []
+        motivo = getattr(candidatos[0], "finish_reason", None) if candidatos else None
+        return {
+            "tokens_entrada": uso.prompt_token_count or 0,
+            "tokens_cacheados": uso.cached_content_token_count or 0,
+            "tokens_salida": uso.candidates_token_count or 0,
+            "finish_reason": getattr(motivo, "name", motivo),
+        }
+    
+    def _registrar_uso(self, uso: dict) -> None:
+        """Acumula el uso de tokens de una llamada real."""
+        with self._lock:
+            self.llamadas += 1
+            self.tokens_entrada += uso.get("tokens_entrada", 0)
+            self.tokens_cacheados += uso.get("tokens_cacheados", 0)
+            self.tokens_salida += uso.get("tokens_salida", 0)
+            self.tokens_prediccion_aceptados += uso.get("tokens_prediccion_aceptados", 0)
+            self.tokens_prediccion_rechazados += uso.get("tokens_prediccion_rechazados", 0)
+    
+    def _registrar_llamada(self, agente: str, inicio: float, uso: dict = None, latencia: float = 0.0,
+                           reintentos: int = 0, finish_reason: str = None, desde_cache: bool = False) -> None:
+        """Agrega la llamada al registro de métricas del proceso."""
+        uso = uso or {}
+        self.metricas.registrar(RegistroLlamada(
+            agente=agente or "-",
+            entrevista=None,
+            modelo=self.model,
+            tokens_entrada=uso.get("tokens_entrada", 0),
+            tokens_cacheados=uso.get("tokens_cacheados", 0),
+            tokens_salida=uso.get("tokens_salida", 0),
+            tokens_prediccion_aceptados=uso.get("tokens_prediccion_aceptados", 0),
+            tokens_prediccion_rechazados=uso.get("tokens_prediccion_rechazados", 0),
+            latencia=latencia,
+            duracion=time.perf_counter() - inicio,
+            reintentos=reintentos,
+            finish_reason=finish_reason or uso.get("finish_reason"),
+            desde_cache=desde_cache,
+        ))
+    
+    def _generar_una_vez(self, prompt_usuario: str, prompt_sistema: str, max_tokens: int, temperature: float,
+                         esquema: dict = None, prediccion: str = None) -> tuple:
+        """Realiza una llamada síncrona al proveedor."""
+        if self.provider == "local":
+            texto, uso = self.cliente.generar(prompt_usuario, prompt_sistema, max_tokens, temperature, esquema, prediccion)
+        elif self.provider == "openai":
+            params = self._parametros_openai(prompt_usuario, prompt_sistema, max_tokens, temperature, esquema, prediccion)
+            response = self.cliente.chat.completions.create(**params)
+            texto, uso = response.choices[0].message.content.strip(), self._uso_openai(response)
+        else:
+            response = self.cliente.models.generate_content(
+                model=self.model,
+                contents=self._contenido_gemini(prompt_usuario, prompt_sistema),
+                config=self._config_gemini(max_tokens, temperature, esquema)
+            )
+            texto, uso = response.text.strip(), self._uso_gemini(response)
+        
+        return texto, uso
+    
+    async def _generar_una_vez_async(self, prompt_usuario: str, prompt_sistema: str, max_tokens: int, temperature: float,
+                                     esquema: dict = None, prediccion: str = None) -> tuple:
+        """Realiza una llamada asíncrona nativa al proveedor."""
+        if self.provider == "local":
+            texto, uso = await self.cliente_async.generar_async(prompt_usuario, prompt_sistema, max_tokens, temperature, esquema, prediccion)
+        elif self.provider == "openai":
+            params = self._parametros_openai(prompt_usuario, prompt_sistema, max_tokens, temperature, esquema, prediccion)
+            response = await self.cliente_async.chat.completions.create(**params)
+            texto, uso = response.choices[0].message.content.strip(), self._uso_openai(response)
+        else:
+            response = await self.cliente_async.models.generate_content(
+                model=self.model,
+                contents=self._contenido_gemini(prompt_usuario, prompt_sistema),
+                config=self._config_gemini(max_tokens, temperature, esquema)
+            )
+            texto, uso = response.text.strip(), self._uso_gemini(response)
+        
+        return texto, uso
+    
+    def resumen_tokens(self) -> str:
+        """Línea de resumen con los tokens usados y los servidos desde la caché de prefijos."""
+        porcentaje = (self.tokens_cacheados / self.tokens_entrada * 100) if self.tokens_entrada else 0.0
+        resumen = (
+            f"Tokens LLM ({self.llamadas} llamadas): {self.tokens_entrada} de entrada "
+            f"({self.tokens_cacheados} cacheados por el proveedor, {porcentaje:.0f}%), "
+            f"{self.tokens_salida} de salida"
+        )
+        if self.tokens_prediccion_aceptados or self.tokens_prediccion_rechazados:
+            resumen += (
+                f" (predicción: {self.tokens_prediccion_aceptados} aceptados, "
+                f"{self.tokens_prediccion_rechazados} rechazados)"
+            )
+        return resumen
+    
+    def planificar(self, prompt_usuario: str, prompt_sistema: str = None, max_tokens: int = MAX_TOKENS, agente: str = None) -> PlanLlamada:
+        """
+        Estima localmente los tokens de una llamada frente a la ventana del modelo.
+        
+        Args:
+            prompt_usuario: Mensaje del usuario.
+            prompt_sistema: Instrucciones de sistema (opcional).
+            max_tokens: Máximo de tokens de salida pedido; se limita a la
+                        salida máxima del modelo.
+            agente: Nombre del agente, para el resumen.
+            
+        Returns:
+            PlanLlamada con los tokens de entrada estimados.
+        """
+        entrada = estimar_tokens(prompt_usuario, self.provider, self.model)
+        entrada += estimar_tokens(prompt_sistema or "", self.provider, self.model)
+        return PlanLlamada(agente or "-", entrada, min(max_tokens, self.salida_maxima), self.ventana)
+    
+    def _verificar_presupuesto(self, plan: PlanLlamada) -> int:
+        """
+        Verificación previa al envío: retorna los max_tokens que caben en la
+        ventana o lanza ErrorPresupuestoTokens si el prompt no cabe.
+        """
+        max_tokens = plan.verificar()
+        if plan.replanificada:
+            print(f"      ⚠ {plan.agente}: salida reducida de {plan.max_tokens} a {max_tokens} tokens para caber en la ventana")
+        return max_tokens
+    
+    def _tokens_reserva(self, tokens_entrada: int, max_tokens: int) -> int:
+        """
+        Tokens a reservar en el limitador para una llamada.
+        OpenAI además descuenta max_tokens de su cuota de tokens por minuto al
+        recibir la solicitud.
+        """
+        if self.provider == "openai":
+            return tokens_entrada + max_tokens
+        return tokens_entrada
+    
+    def _clave_cache(self, prompt_usuario: str, prompt_sistema: str, max_tokens: int, temperature: float, esquema: dict = None) -> str:
+        """Clave de caché de una llamada."""
+        # El esquema solo entra en la clave si se usa, para conservar las claves existentes
+        extra = {"esquema": esquema} if esquema else {}
+        return self.cache.calcular_clave(
+            provider=self.provider,
+            model=self.model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            prompt_sistema=prompt_sistema or "",
+            prompt_usuario=prompt_usuario,
+            **extra
+        )
+    
+    def generar(
+        self,
+        prompt_usuario: str,
+        prompt_sistema: str = None,
+        max_tokens: int = MAX_TOKENS,
+        temperature: float = TEMPERATURE,
+        esquema: dict = None,
+        agente: str = None,
+        prediccion: str = None
+    ) -> str:
+        """
+        Genera una respuesta del LLM, reintentando ante límites de tasa.
+        Si una llamada idéntica ya está en la caché, no se llama al proveedor;
+        si no, se reserva cupo en el limitador de tasa antes de enviarla.
+        
+        Args:
+            prompt_usuario: Mensaje del usuario.
+            prompt_sistema: Instrucciones de sistema (opcional).
+            max_tokens: Máximo de tokens de salida.
+            temperature: Temperatura de muestreo.
+            esquema: JSON Schema de un objeto con propiedades de texto (opcional).
+                     Si se indica, se pide salida estructurada y la respuesta
+                     es el JSON como texto.
+            agente: Nombre del agente que hace la llamada, para las métricas.
+            prediccion: Texto que se espera casi idéntico a la respuesta (opcional).
+                     Se envía como salida predicha si el modelo la admite; no
+                     cambia la respuesta, solo acelera su generación, por lo que
+                     no entra en la clave de la caché.
+            
+        Returns:
+            Texto de la respuesta.
+            
+        Raises:
+            ErrorLimiteTasa: Si se agotan los reintentos por límite de tasa.
+            ErrorPresupuestoTokens: Si el prompt no cabe en la ventana de contexto.
+        """
+        inicio = time.perf_counter()
+        plan = self.planificar(prompt_usuario, prompt_sistema, max_tokens, agente)
+        max_tokens = self._verificar_presupuesto(plan)
+        clave = self._clave_cache(prompt_usuario, prompt_sistema, max_tokens, temperature, esquema)
+        respuesta = self.cache.obtener(clave)
+        if respuesta is not None:
+            self._registrar_llamada(agente, inicio, finish_reason="cache", desde_cache=True)
+            return respuesta
+        
+        tokens = self._tokens_reserva(plan.tokens_entrada, max_tokens)
+        for attempt in range(self.max_reintentos):
+            self.limitador.adquirir(tokens)
+            inicio_llamada = time.perf_counter()
+            try:
+                respuesta, uso = self._generar_una_vez(prompt_usuario, prompt_sistema, max_tokens, temperature, esquema, prediccion)
+            except Exception as e:
+                if not es_error_limite_tasa(e):
+                    self._registrar_llamada(agente, inicio, reintentos=attempt, finish_reason="error")
+                    raise
+                # 429 pese al limitador: pausar a todos los agentes, con espera exponencial
+                wait_time = 10 * 2 ** attempt
+                print(f"      ⏳ Rate limit. Esperando {wait_time}s...")
+                self.limitador.pausar(wait_time)
+                continue
+            
+            self._registrar_uso(uso)
+            self._registrar_llamada(agente, inicio, uso, time.perf_counter() - inicio_llamada, attempt)
+            self.cache.guardar(clave, respuesta)
+            return respuesta
+        
+        self._registrar_llamada(agente, inicio, reintentos=self.max_reintentos, finish_reason="rate_limit")
+        raise ErrorLimiteTasa("Rate limit excedido.")
+    
+    async def generar_async(
+        self,
+        prompt_usuario: str,
+        prompt_sistema: str = None,
+        max_tokens: int = MAX_TOKENS,
+        temperature: float = TEMPERATURE,
+        esquema: dict = None,
+        agente: str = None,
+        prediccion: str = None
+    ) -> str:
+        """Versión asíncrona nativa de `generar`."""
+        inicio = time.perf_counter()
+        plan = self.planificar(prompt_usuario, prompt_sistema, max_tokens, agente)
+        max_tokens = self._verificar_presupuesto(plan)
+        clave = self._clave_cache(prompt_usuario, prompt_sistema, max_tokens, temperature, esquema)
+        respuesta = self.cache.obtener(clave)
+        if respuesta is not None:
+            self._registrar_llamada(agente, inicio, finish_reason="cache", desde_cache=True)
+            return respuesta
+        
+        tokens = self._tokens_reserva(plan.tokens_entrada, max_tokens)
+        for attempt in range(self.max_reintentos):
+            await self.limitador.adquirir_async(tokens)
+            inicio_llamada = time.perf_counter()
+            try:
+                respuesta, uso = await self._generar_una_vez_async(prompt_usuario, prompt_sistema, max_tokens, temperature, esquema, prediccion)
+            except Exception as e:
+                if not es_error_limite_tasa(e):
+                    self._registrar_llamada(agente, inicio, reintentos=attempt, finish_reason="error")
+                    raise
+                # 429 pese al limitador: pausar a todos los agentes, con espera exponencial
+                wait_time = 10 * 2 ** attempt
+                print(f"      ⏳ Rate limit. Esperando {wait_time}s...")
+                self.limitador.pausar(wait_time)
+                continue
+            
+            self._registrar_uso(uso)
+            self._registrar_llamada(agente, inicio, uso, time.perf_counter() - inicio_llamada, attempt)
+            self.cache.guardar(clave, respuesta)
+            return respuesta
+        
+        self._registrar_llamada(agente, inicio, reintentos=self.max_reintentos, finish_reason="rate_limit")
+        raise ErrorLimiteTasa("Rate limit excedido.")
+
+
+_cliente_compartido = None
+_lock_compartido = threading.Lock()
+
+
+def obtener_cliente_llm() -> ClienteLLM:
+    """
+    Retorna el cliente LLM compartido del proceso, creándolo si no existe.
+    
+    Returns:
+        Instancia única de ClienteLLM configurada desde config.py.
+    """
+    global _cliente_compartido
+    if _cliente_compartido is None:
+        with _lock_compartido:
+            if _cliente_compartido is None:
+                _cliente_compartido = ClienteLLM()
+    return _cliente_compartido
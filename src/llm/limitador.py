@@ -0,0 +1,158 @@
+"""
+Limitador de tasa global (token bucket) para las llamadas al LLM.
+
+Cada combinación proveedor/modelo tiene un limitador compartido por todo el
+proceso con dos cubos: solicitudes por minuto y tokens por minuto. Toda llamada
+reserva en ambos antes de enviarse, de modo que los modos paralelos pueden
+aprovechar la cuota completa sin provocar errores 429.
+"""
+import sys
+import os
+import asyncio
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import LIMITES_TASA, LIMITE_RPM, LIMITE_TPM
+
+
+class CuboTokens:
+    """
+    Cubo de tokens con recarga continua.
+    
+    La capacidad es el límite por minuto y se recarga de forma lineal, por lo
+    que admite ráfagas hasta la capacidad y luego el ritmo sostenido del límite.
+    """
+    
+    def __init__(self, capacidad_por_minuto: float):
+        self.capacidad = float(capacidad_por_minuto)
+        self.tasa_por_segundo = self.capacidad / 60.0
+        self.disponible = self.capacidad
+        self._ultima_recarga = time.monotonic()
+    
+    def recargar(self, ahora: float) -> None:
+        """Suma los tokens acumulados desde la última recarga."""
+        transcurrido = ahora - self._ultima_recarga
+        self.disponible = min(self.capacidad, self.disponible + transcurrido * self.tasa_por_segundo)
+        self._ultima_recarga = ahora
+    
+    def espera_para(self, cantidad: float) -> float:
+        """Segundos hasta que haya `cantidad` disponible (0 si ya la hay)."""
+        faltante = cantidad - self.disponible
+        return max(0.0, faltante / self.tasa_por_segundo)
+
+
+class LimitadorTasa:
+    """
+    Limitador de solicitudes y tokens por minuto para un proveedor/modelo.
+    
+    Seguro entre hilos y utilizable desde código síncrono y asíncrono.
+    """
+    
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._solicitudes = CuboTokens(rpm)
+        self._tokens = CuboTokens(tpm)
+        self._pausa_hasta = 0.0
+        self._lock = threading.Lock()
+        
+        self.esperas = 0
+        self.segundos_espera = 0.0
+    
+    def _reservar(self, tokens: int) -> float:
+        """
+        Intenta reservar una solicitud y `tokens` tokens.
+        
+        Returns:
+            0 si la reserva se hizo; en otro caso, segundos a esperar antes de reintentar.
+        """
+        # Una solicitud más grande que el cubo nunca cabría: se limita a su capacidad
+        tokens = min(tokens, self.tpm)
+        
+        with self._lock:
+            ahora = time.monotonic()
+            if ahora < self._pausa_hasta:
+                return self._pausa_hasta - ahora
+            
+            self._solicitudes.recargar(ahora)
+            self._tokens.recargar(ahora)
+            espera = max(self._solicitudes.espera_para(1), self._tokens.espera_para(tokens))
+            if espera > 0:
+                return espera
+            
+            self._solicitudes.disponible -= 1
+            self._tokens.disponible -= tokens
+            return 0.0
+    
+    def _registrar_espera(self, segundos: float) -> None:
+        with self._lock:
+            self.esperas += 1
+            self.segundos_espera += segundos
+    
+    def adquirir(self, tokens: int) -> None:
+        """Bloquea el hilo hasta poder enviar una solicitud de `tokens` tokens."""
+        while True:
+            espera = self._reservar(tokens)
+            if espera <= 0:
+                return
+            self._registrar_espera(espera)
+            time.sleep(espera)
+    
+    async def adquirir_async(self, tokens: int) -> None:
+        """Versión asíncrona de `adquirir` (no bloquea el event loop)."""
+        while True:
+            espera = self._reservar(tokens)
+            if espera <= 0:
+                return
+            self._registrar_espera(espera)
+            await asyncio.sleep(espera)
+    
+    def pausar(self, segundos: float) -> None:
+        """
+        Detiene todas las reservas durante `segundos`.
+        Se usa cuando el proveedor responde 429 pese al limitador (cuota
+        compartida con otros procesos o límites configurados muy altos).
+        """
+        with self._lock:
+            self._pausa_hasta = max(self._pausa_hasta, time.monotonic() + segundos)
+    
+    def resumen(self) -> str:
+        """Línea de resumen con las esperas acumuladas."""
+        return (
+            f"Limitador de tasa ({self.rpm} RPM, {self.tpm} TPM): "
+            f"{self.esperas} esperas, {self.segundos_espera:.1f}s en espera"
+        )
+
+
+def limites_para(provider: str, model: str) -> tuple:
+    """
+    Busca los límites (rpm, tpm) configurados para un proveedor y modelo.
+    
+    Usa la entrada de LIMITES_TASA cuyo nombre sea el prefijo más largo del
+    modelo (así 'gpt-4o-mini' no toma los límites de 'gpt-4o'). Las variables
+    LLM_LIMITE_RPM y LLM_LIMITE_TPM tienen prioridad si están definidas.
+    """
+    tabla = LIMITES_TASA.get(provider, {})
+    rpm, tpm = tabla.get("default", (60, 100000))
+    
+    candidatos = [nombre for nombre in tabla if nombre != "default" and model.startswith(nombre)]
+    if candidatos:
+        rpm, tpm = tabla[max(candidatos, key=len)]
+    
+    return (LIMITE_RPM or rpm, LIMITE_TPM or tpm)
+
+
+_limitadores = {}
+_lock_limitadores = threading.Lock()
+
+
+def obtener_limitador(provider: str, model: str) -> LimitadorTasa:
+    """Retorna el limitador compartido del proceso para un proveedor/modelo."""
+    clave = (provider, model)
+    with _lock_limitadores:
+        if clave not in _limitadores:
+            rpm, tpm = limites_para(provider, model)
+            _limitadores[clave] = LimitadorTasa(rpm, tpm)
+        return _limitadores[clave]
@@ -0,0 +1,174 @@
+"""
+Registro por llamada del uso de tokens y la latencia del LLM.
+
+Cada llamada de ClienteLLM (incluidas las servidas desde la caché) queda
+etiquetada con el agente que la hizo y la entrevista en curso, para
+identificar qué agentes dominan el coste y el tiempo de una ejecución.
+"""
+import contextvars
+import json
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+
+# Entrevista en curso; asyncio copia el contexto a cada tarea, así que las
+# llamadas concurrentes de una misma entrevista heredan la etiqueta
+_entrevista_actual = contextvars.ContextVar("entrevista_actual", default=None)
+
+
+@contextmanager
+def contexto_entrevista(nombre: str):
+    """
+    Etiqueta con `nombre` todas las llamadas al LLM hechas dentro del bloque.
+    
+    Args:
+        nombre: Nombre de la entrevista (o etapa, ej: "consolidado").
+    """
+    token = _entrevista_actual.set(nombre)
+    try:
+        yield
+    finally:
+        _entrevista_actual.reset(token)
+
+
+def entrevista_actual() -> Optional[str]:
+    """Nombre de la entrevista del `contexto_entrevista` activo (None fuera de uno)."""
+    return _entrevista_actual.get()
+
+
+@dataclass
+class RegistroLlamada:
+    """Métricas de una llamada al LLM."""
+    agente: str
+    entrevista: Optional[str]
+    modelo: str
+    tokens_entrada: int = 0
+    tokens_cacheados: int = 0
+    tokens_salida: int = 0
+    tokens_prediccion_aceptados: int = 0     # salidas predichas (incluidos en tokens_salida)
+    tokens_prediccion_rechazados: int = 0
+    latencia: float = 0.0      # segundos de la llamada que respondió
+    duracion: float = 0.0      # segundos totales, con esperas del limitador y reintentos
+    reintentos: int = 0
+    finish_reason: Optional[str] = None
+    desde_cache: bool = False
+
+
+class MetricasLLM:
+    """Acumula los registros de llamadas y genera el resumen de la ejecución."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.registros: List[RegistroLlamada] = []
+    
+    def registrar(self, registro: RegistroLlamada) -> None:
+        """Agrega el registro de una llamada."""
+        if registro.entrevista is None:
+            registro.entrevista = _entrevista_actual.get()
+        with self._lock:
+            self.registros.append(registro)
+    
+    def _agrupar(self, clave) -> Dict[str, dict]:
+        """Totales por el valor de `clave(registro)`, en orden de aparición."""
+        grupos = defaultdict(lambda: {
+            "llamadas": 0, "desde_cache": 0, "reintentos": 0,
+            "tokens_entrada": 0, "tokens_cacheados": 0, "tokens_salida": 0,
+            "tokens_prediccion_aceptados": 0, "tokens_prediccion_rechazados": 0,
+            "latencia": 0.0, "duracion": 0.0,
+        })
+        with self._lock:
+            registros = list(self.registros)
+        for r in registros:
+            g = grupos[clave(r)]
+            g["llamadas"] += 1
+            g["desde_cache"] += int(r.desde_cache)
+            g["reintentos"] += r.reintentos
+            g["tokens_entrada"] += r.tokens_entrada
+            g["tokens_cacheados"] += r.tokens_cacheados
+            g["tokens_salida"] += r.tokens_salida
+            g["tokens_prediccion_aceptados"] += r.tokens_prediccion_aceptados
+            g["tokens_prediccion_rechazados"] += r.tokens_prediccion_rechazados
+            g["latencia"] += r.latencia
+            g["duracion"] += r.duracion
+        return dict(grupos)
+    
+    def por_agente(self) -> Dict[str, dict]:
+        return self._agrupar(lambda r: r.agente)
+    
+    def por_entrevista(self) -> Dict[str, dict]:
+        return self._agrupar(lambda r: r.entrevista or "-")
+    
+    def _tabla(self, titulo: str, grupos: Dict[str, dict]) -> str:
+        ancho = max([len(titulo)] + [len(nombre) for nombre in grupos])
+        lineas = [
+            f"  {titulo:<{ancho}}  {'llam.':>5}  {'caché':>5}  {'reint.':>6}  "
+            f"{'entrada':>9}  {'cacheados':>9}  {'salida':>8}  {'latencia':>9}  {'duración':>9}"
+        ]
+        for nombre, g in sorted(grupos.items(), key=lambda x: -x[1]["duracion"]):
+            lineas.append(
+                f"  {nombre:<{ancho}}  {g['llamadas']:>5}  {g['desde_cache']:>5}  {g['reintentos']:>6}  "
+                f"{g['tokens_entrada']:>9}  {g['tokens_cacheados']:>9}  {g['tokens_salida']:>8}  "
+                f"{g['latencia']:>8.1f}s  {g['duracion']:>8.1f}s"
+            )
+        return "\n".join(lineas)
+    
+    def _tabla_prediccion(self, grupos: Dict[str, dict]) -> str:
+        """Tokens de salida predichos aceptados y rechazados, por agente que los usó."""
+        lineas = []
+        for nombre, g in grupos.items():
+            predichos = g["tokens_prediccion_aceptados"] + g["tokens_prediccion_rechazados"]
+            if predichos:
+                lineas.append(
+                    f"  {nombre}: {g['tokens_prediccion_aceptados']} aceptados, "
+                    f"{g['tokens_prediccion_rechazados']} rechazados "
+                    f"({g['tokens_prediccion_aceptados'] / predichos * 100:.0f}% de la predicción)"
+                )
+        return "\n".join(lineas)
+    
+    def resumen(self) -> str:
+        """Tablas de uso por agente y por entrevista, ordenadas por duración."""
+        if not self.registros:
+            return "Métricas LLM: sin llamadas registradas"
+        por_agente = self.por_agente()
+        bloques = [
+            "Métricas LLM por agente:\n" + self._tabla("Agente", por_agente),
+            "Métricas LLM por entrevista:\n" + self._tabla("Entrevista", self.por_entrevista()),
+        ]
+        prediccion = self._tabla_prediccion(por_agente)
+        if prediccion:
+            bloques.append("Salidas predichas:\n" + prediccion)
+        return "\n\n".join(bloques)
+    
+    def guardar_json(self, ruta: str) -> str:
+        """
+        Guarda los registros y los totales en un archivo JSON.
+        
+        Args:
+            ruta: Ruta del archivo de salida.
+        
+        Returns:
+            Ruta del archivo guardado.
+        """
+        with self._lock:
+            registros = [asdict(r) for r in self.registros]
+        datos = {
+            "por_agente": self.por_agente(),
+            "por_entrevista": self.por_entrevista(),
+            "llamadas": registros,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, ensure_ascii=False, indent=2)
+        return ruta
+
+
+_metricas = MetricasLLM()
+
+
+def obtener_metricas() -> MetricasLLM:
+    """Retorna el registro de métricas del proceso."""
+    return _metricas
@@ -0,0 +1,337 @@
+"""
+Proveedor LLM local simulado (LLM_PROVIDER=local).
+
+Permite ejecutar main.py y consolidador_main.py de principio a fin sin red ni
+cuota, para medir el rendimiento de la orquestación. Las respuestas son
+deterministas (dependen solo del prompt) y respetan el formato que espera cada
+agente; la latencia, su variación, la velocidad de generación y la tasa de
+errores 429 se configuran en config.py.
+"""
+import sys
+import os
+import asyncio
+import difflib
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    LOCAL_LATENCIA, LOCAL_JITTER, LOCAL_TOKENS_POR_SEGUNDO,
+    LOCAL_TASA_429, LOCAL_SEMILLA, LOCAL_ACELERACION_PREDICCION
+)
+
+
+class ErrorSimulado429(Exception):
+    """Error de límite de tasa inyectado por el proveedor local."""
+    
+    # Mismo atributo que las excepciones HTTP del SDK de OpenAI
+    status_code = 429
+
+
+# Errores de reconocimiento que el simulador corrige
+ERRORES_SIMULADOS = {
+    "Nike": "Nyquist",
+    "tensor flau": "TensorFlow",
+    "pai torch": "PyTorch",
+    "quedas": "Keras",
+}
+
+
+class ProveedorLocal:
+    """
+    Sustituto offline del SDK de OpenAI/Gemini.
+    
+    Reconoce el tipo de prompt por las marcas que ya usan los agentes:
+    - Corrección ("---CORRECCIONES---"): devuelve la transcripción con los
+      ERRORES_SIMULADOS corregidos, seguida del bloque de correcciones.
+    - Sección individual o consolidada ('Genera ÚNICAMENTE la sección "X"'):
+      devuelve "## X" con párrafos y viñetas.
+    - Reporte narrativo y consolidado monolítico: texto con su estructura.
+    - Salida estructurada (esquema JSON): un objeto JSON con una sección por
+      propiedad de texto, tomando el nombre de la sección de su "description",
+      una lista de frases por cada lista de textos y una lista de cambios
+      (ERRORES_SIMULADOS) por cada otra propiedad de tipo lista (por tramo, si
+      los elementos tienen "tramo").
+    
+    Con una predicción (salidas predichas de OpenAI), el texto de la respuesta
+    que coincide con ella cuenta como tokens aceptados y se genera
+    LOCAL_ACELERACION_PREDICCION veces más rápido; el texto de la predicción
+    que no aparece en la respuesta cuenta como rechazado.
+    """
+    
+    # Simulación de la caché de prefijos de OpenAI: bloques de ~128 tokens a partir de ~1024
+    BLOQUE_PREFIJO = 512
+    MINIMO_PREFIJO = 4096
+    
+    def __init__(
+        self,
+        latencia: float = LOCAL_LATENCIA,
+        jitter: float = LOCAL_JITTER,
+        tokens_por_segundo: float = LOCAL_TOKENS_POR_SEGUNDO,
+        tasa_429: float = LOCAL_TASA_429,
+        semilla: int = LOCAL_SEMILLA
+    ):
+        self.latencia = latencia
+        self.jitter = jitter
+        self.tokens_por_segundo = tokens_por_segundo
+        self.tasa_429 = tasa_429
+        self.semilla = semilla
+        
+        self._lock = threading.Lock()
+        self._llamadas = 0
+        self._prefijos = set()
+    
+    def _rng_prompt(self, prompt_usuario: str, prompt_sistema: str) -> random.Random:
+        """Generador aleatorio que depende solo de la semilla y del prompt."""
+        huella = hashlib.sha256(f"{prompt_sistema}\x00{prompt_usuario}".encode('utf-8')).hexdigest()
+        return random.Random(f"{self.semilla}-{huella}")
+    
+    def _palabras_muestra(self, prompt_usuario: str, rng: random.Random, cantidad: int) -> str:
+        """Toma palabras del prompt para que el contenido simulado varíe con la entrada."""
+        palabras = re.findall(r'[A-Za-zÁÉÍÓÚáéíóúÑñ]{5,}', prompt_usuario)
+        if not palabras:
+            return "contenido"
+        return " ".join(rng.choice(palabras).lower() for _ in range(cantidad))
+    
+    def _parrafo(self, prompt_usuario: str, rng: random.Random) -> str:
+        frases = []
+        for _ in range(3):
+            frases.append(f"Se identifican aspectos relacionados con {self._palabras_muestra(prompt_usuario, rng, 4)}.")
+        return " ".join(frases)
+    
+    def _transcripcion_original(self, prompt_usuario: str) -> str:
+        match = re.search(r'TRANSCRIPCIÓN ORIGINAL:\n---\n(.*)\n---\n', prompt_usuario, re.DOTALL)
+        return match.group(1) if match else ""
+    
+    def _respuesta_correccion(self, prompt_usuario: str) -> str:
+        corregido = self._transcripcion_original(prompt_usuario)
+        lineas = []
+        for error, correccion in ERRORES_SIMULADOS.items():
+            corregido, n = re.subn(rf'\b{re.escape(error)}\b', correccion, corregido)
+            if n:
+                lineas.append(f"- {error} → {correccion}")
+        correcciones = "\n".join(lineas) or "- Sin correcciones significativas detectadas"
+        return f"{corregido}\n\n---CORRECCIONES---\n{correcciones}"
+    
+    def _respuesta_diferencias(self, prompt_usuario: str) -> list:
+        """Cambios de ERRORES_SIMULADOS presentes en la transcripción, con su contexto."""
+        original = self._transcripcion_original(prompt_usuario)
+        cambios = []
+        for error, correccion in ERRORES_SIMULADOS.items():
+            apariciones = list(re.finditer(rf'\b{re.escape(error)}\b', original))
+            # Un error repetido se corrige en todas sus apariciones (contexto vacío)
+            if len(apariciones) > 3:
+                cambios.append({"original": error, "reemplazo": correccion, "contexto": ""})
+                continue
+            for match in apariciones:
+                contexto = original[max(0, match.start() - 25):match.end() + 25]
+                contexto = " ".join(contexto.split()[1:-1]) or match.group(0)
+                cambios.append({"original": match.group(0), "reemplazo": correccion, "contexto": contexto})
+        return cambios
+    
+    def _respuesta_tramos(self, prompt_usuario: str) -> list:
+        """Cambios de ERRORES_SIMULADOS presentes en cada tramo numerado del prompt."""
+        match = re.search(r'TRAMOS DUDOSOS:\n---\n(.*)\n---\n', prompt_usuario, re.DOTALL)
+        cambios = []
+        for linea in (match.group(1).split('\n') if match else []):
+            numero = re.match(r'\[(\d+)\] ', linea)
+            if not numero:
+                continue
+            for error, correccion in ERRORES_SIMULADOS.items():
+                if re.search(rf'\b{re.escape(error)}\b', linea[numero.end():]):
+                    cambios.append({"tramo": int(numero.group(1)), "original": error, "reemplazo": correccion})
+        return cambios
+    
+    def _respuesta_seccion(self, nombre_seccion: str, prompt_usuario: str, rng: random.Random) -> str:
+        vinetas = "\n".join(
+            f"- **{self._palabras_muestra(prompt_usuario, rng, 1).capitalize()}**: {self._palabras_muestra(prompt_usuario, rng, 5)}"
+            for _ in range(3)
+        )
+        return f"## {nombre_seccion}\n\n{self._parrafo(prompt_usuario, rng)}\n\n{vinetas}"
+    
+    def _respuesta_json(self, esquema: dict, prompt_usuario: str, rng: random.Random) -> str:
+        objeto = {}
+        for clave, propiedad in esquema.get("properties", {}).items():
+            if propiedad.get("type") == "array" and propiedad.get("items", {}).get("type") == "string":
+                objeto[clave] = [
+                    f"{self._palabras_muestra(prompt_usuario, rng, 1).capitalize()} {self._palabras_muestra(prompt_usuario, rng, 7)}"
+                    for _ in range(rng.randint(0, 4))
+                ]
+                continue
+            if propiedad.get("type") == "array":
+                if "tramo" in propiedad.get("items", {}).get("properties", {}):
+                    objeto[clave] = self._respuesta_tramos(prompt_usuario)
+                else:
+                    objeto[clave] = self._respuesta_diferencias(prompt_usuario)
+                continue
+            seccion = self._respuesta_seccion(propiedad.get("description", clave), prompt_usuario, rng)
+            objeto[clave] = seccion.split("\n\n", 1)[1]
+        return json.dumps(objeto, ensure_ascii=False)
+    
+    def _respuesta_narrativa(self, prompt_usuario: str, rng: random.Random) -> str:
+        parrafos = "\n\n".join(self._parrafo(prompt_usuario, rng) for _ in range(4))
+        destacados = "\n".join(f"- {self._palabras_muestra(prompt_usuario, rng, 6)}" for _ in range(3))
+        return f"{parrafos}\n\n**Puntos destacados**\n\n{destacados}"
+    
+    def _respuesta_documento(self, prompt_usuario: str, rng: random.Random) -> str:
+        secciones = [
+            "I. Grupos y Laboratorios de IA", "II. Inventario de Hardware",
+            "III. Software y Frameworks", "IV. Perspectivas de los Entrevistados",
+            "V. Análisis de Capacidad", "VI. Propuestas de Mejora", "VII. Conclusiones",
+        ]
+        return "\n\n".join(self._respuesta_seccion(s, prompt_usuario, rng) for s in secciones)
+    
+    def responder(self, prompt_usuario: str, prompt_sistema: str = None, esquema: dict = None) -> str:
+        """
+        Construye la respuesta determinista para un prompt.
+        
+        Args:
+            prompt_usuario: Mensaje del usuario.
+            prompt_sistema: Instrucciones de sistema (opcional).
+            esquema: JSON Schema de la salida estructurada (opcional).
+            
+        Returns:
+            Texto con el formato que espera el agente que hizo la llamada.
+        """
+        rng = self._rng_prompt(prompt_usuario, prompt_sistema or "")
+        
+        if esquema:
+            return self._respuesta_json(esquema, prompt_usuario, rng)
+        
+        if "---CORRECCIONES---" in prompt_usuario:
+            return self._respuesta_correccion(prompt_usuario)
+        
+        match = re.search(r'Genera ÚNICAMENTE la sección "([^"]+)"', prompt_usuario)
+        if match:
+            return self._respuesta_seccion(match.group(1), prompt_usuario, rng)
+        
+        if "reporte narrativo" in prompt_usuario.lower():
+            return self._respuesta_narrativa(prompt_usuario, rng)
+        
+        return self._respuesta_documento(prompt_usuario, rng)
+    
+    def _caracteres_cacheados(self, texto: str) -> int:
+        """
+        Longitud del prefijo de `texto` ya visto en llamadas anteriores, en
+        bloques completos, y registra los prefijos de esta llamada.
+        """
+        huella = hashlib.sha256()
+        prefijos = []
+        cacheados = 0
+        
+        limite = len(texto) - len(texto) % self.BLOQUE_PREFIJO
+        for inicio in range(0, limite, self.BLOQUE_PREFIJO):
+            huella.update(texto[inicio:inicio + self.BLOQUE_PREFIJO].encode('utf-8'))
+            prefijos.append(huella.digest())
+        
+        with self._lock:
+            for i, prefijo in enumerate(prefijos):
+                if prefijo not in self._prefijos:
+                    break
+                cacheados = (i + 1) * self.BLOQUE_PREFIJO
+            self._prefijos.update(prefijos)
+        
+        return cacheados if cacheados >= self.MINIMO_PREFIJO else 0
+    
+    @staticmethod
+    def _caracteres_coincidentes(prediccion: list, respuesta: list) -> int:
+        """Caracteres de los elementos de `prediccion` que aparecen en orden en `respuesta`."""
+        comparador = difflib.SequenceMatcher(None, prediccion, respuesta, autojunk=False)
+        return sum(
+            len(prediccion[i])
+            for bloque in comparador.get_matching_blocks()
+            for i in range(bloque.a, bloque.a + bloque.size)
+        )
+    
+    def _tokens_prediccion(self, prediccion: str, respuesta: str) -> tuple:
+        """
+        Tokens aceptados (texto de la predicción que reaparece en orden en la
+        respuesta) y rechazados (el resto de la predicción). Se alinea por
+        líneas y, dentro de las líneas modificadas, por palabras.
+        """
+        lineas_prediccion = prediccion.splitlines(keepends=True)
+        lineas_respuesta = respuesta.splitlines(keepends=True)
+        comparador = difflib.SequenceMatcher(None, lineas_prediccion, lineas_respuesta, autojunk=False)
+        
+        coincidentes = 0
+        for operacion, a1, a2, b1, b2 in comparador.get_opcodes():
+            if operacion == "equal":
+                coincidentes += sum(len(linea) for linea in lineas_prediccion[a1:a2])
+            elif operacion == "replace":
+                for linea_prediccion, linea_respuesta in zip(lineas_prediccion[a1:a2], lineas_respuesta[b1:b2]):
+                    coincidentes += self._caracteres_coincidentes(
+                        re.findall(r'\S+\s*', linea_prediccion), re.findall(r'\S+\s*', linea_respuesta)
+                    )
+        return coincidentes // 4, (len(prediccion) - coincidentes) // 4
+    
+    def _preparar(self, prompt_usuario: str, prompt_sistema: str, max_tokens: int, esquema: dict = None, prediccion: str = None) -> tuple:
+        """
+        Calcula la respuesta, el uso de tokens y la demora simulada, o lanza un
+        429 simulado.
+        
+        Returns:
+            Tupla (respuesta, uso, segundos_de_demora).
+        """
+        with self._lock:
+            self._llamadas += 1
+            rng_llamada = random.Random(f"{self.semilla}-llamada-{self._llamadas}")
+        
+        if rng_llamada.random() < self.tasa_429:
+            raise ErrorSimulado429("Error code: 429 - RESOURCE_EXHAUSTED (proveedor local simulado)")
+        
+        respuesta = self.responder(prompt_usuario, prompt_sistema, esquema)
+        
+        # Truncar a max_tokens (~4 caracteres por token) como haría el proveedor real
+        truncada = len(respuesta) > max_tokens * 4
+        respuesta = respuesta[:max_tokens * 4]
+        tokens_salida = len(respuesta) / 4
+        
+        # Los mensajes se envían en orden sistema → usuario, como en los proveedores reales
+        entrada = f"{prompt_sistema}\n{prompt_usuario}" if prompt_sistema else prompt_usuario
+        uso = {
+            "tokens_entrada": len(entrada) // 4,
+            "tokens_cacheados": self._caracteres_cacheados(entrada) // 4,
+            "tokens_salida": int(tokens_salida),
+            "finish_reason": "length" if truncada else "stop",
+        }
+        
+        # Los tokens aceptados de la predicción se generan más rápido; los
+        # rechazados se facturan como salida, como en OpenAI
+        tokens_generados = tokens_salida
+        if prediccion:
+            aceptados, rechazados = self._tokens_prediccion(prediccion, respuesta)
+            aceptados = min(aceptados, int(tokens_salida))
+            uso["tokens_salida"] += rechazados
+            uso["tokens_prediccion_aceptados"] = aceptados
+            uso["tokens_prediccion_rechazados"] = rechazados
+            tokens_generados = tokens_salida - aceptados + aceptados / LOCAL_ACELERACION_PREDICCION
+        
+        rng = self._rng_prompt(prompt_usuario, prompt_sistema or "")
+        demora = self.latencia + rng.uniform(-self.jitter, self.jitter)
+        if self.tokens_por_segundo > 0:
+            demora += tokens_generados / self.tokens_por_segundo
+        return respuesta, uso, max(0.0, demora)
+    
+    def generar(self, prompt_usuario: str, prompt_sistema: str = None, max_tokens: int = 4000, temperature: float = 0.0,
+                esquema: dict = None, prediccion: str = None) -> tuple:
+        """
+        Simula una llamada síncrona (bloquea el hilo durante la demora).
+        
+        Returns:
+            Tupla (respuesta, uso) con el uso en el formato de ClienteLLM.
+        """
+        respuesta, uso, demora = self._preparar(prompt_usuario, prompt_sistema, max_tokens, esquema, prediccion)
+        time.sleep(demora)
+        return respuesta, uso
+    
+    async def generar_async(self, prompt_usuario: str, prompt_sistema: str = None, max_tokens: int = 4000, temperature: float = 0.0,
+                            esquema: dict = None, prediccion: str = None) -> tuple:
+        """Simula una llamada asíncrona (no bloquea el event loop)."""
+        respuesta, uso, demora = self._preparar(prompt_usuario, prompt_sistema, max_tokens, esquema, prediccion)
+        await asyncio.sleep(demora)
+        return respuesta, uso
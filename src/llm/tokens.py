@@ -0,0 +1,151 @@
+"""
+Estimación local de tokens y verificación previa del presupuesto de cada llamada.
+
+Sin red: con `tiktoken` instalado se cuenta exacto para OpenAI; en otro caso
+(y para Gemini) se usa una heurística de caracteres por token calibrada para
+texto en español. Permite saber antes de la primera llamada si un prompt cabe
+en la ventana de contexto del modelo y cuántos tokens se van a gastar.
+"""
+import sys
+import os
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    VENTANAS_CONTEXTO, SALIDAS_MAXIMAS, CARACTERES_POR_TOKEN,
+    MARGEN_ESTIMACION_TOKENS, MIN_TOKENS_SALIDA
+)
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+
+class ErrorPresupuestoTokens(Exception):
+    """El prompt no cabe en la ventana de contexto del modelo."""
+    pass
+
+
+@lru_cache(maxsize=None)
+def _codificador(model: str):
+    """Codificador de tiktoken para un modelo de OpenAI (None si no hay tiktoken)."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def estimar_tokens(texto: str, provider: str, model: str = "") -> int:
+    """
+    Estima los tokens de un texto para un proveedor/modelo.
+    
+    Args:
+        texto: Texto a medir.
+        provider: "openai", "gemini" o "local".
+        model: Nombre del modelo (para elegir el tokenizador de OpenAI).
+    
+    Returns:
+        Número de tokens (exacto con tiktoken, estimado en otro caso).
+    """
+    if not texto:
+        return 0
+    if provider == "openai":
+        codificador = _codificador(model)
+        if codificador is not None:
+            return len(codificador.encode(texto, disallowed_special=()))
+    return math.ceil(len(texto) / CARACTERES_POR_TOKEN.get(provider, 4.0))
+
+
+def _por_prefijo(tabla: dict, model: str, default: int) -> int:
+    """Valor de la entrada con el prefijo más largo del modelo (o el de "default")."""
+    candidatos = [nombre for nombre in tabla if nombre != "default" and model.startswith(nombre)]
+    if candidatos:
+        return tabla[max(candidatos, key=len)]
+    return tabla.get("default", default)
+
+
+def ventana_contexto(provider: str, model: str) -> int:
+    """Ventana de contexto del modelo, por el prefijo más largo en VENTANAS_CONTEXTO."""
+    return _por_prefijo(VENTANAS_CONTEXTO.get(provider, {}), model, 128000)
+
+
+def salida_maxima(provider: str, model: str) -> int:
+    """Tokens de salida máximos del modelo, por el prefijo más largo en SALIDAS_MAXIMAS."""
+    return _por_prefijo(SALIDAS_MAXIMAS.get(provider, {}), model, 8192)
+
+
+@dataclass
+class PlanLlamada:
+    """Presupuesto de tokens de una llamada antes de enviarla."""
+    agente: str
+    tokens_entrada: int
+    max_tokens: int         # salida pedida por el agente
+    ventana: int
+    
+    @property
+    def tokens_entrada_con_margen(self) -> int:
+        return math.ceil(self.tokens_entrada * (1 + MARGEN_ESTIMACION_TOKENS))
+    
+    @property
+    def max_tokens_ajustado(self) -> int:
+        """Salida que cabe en la ventana (la pedida si hay espacio)."""
+        return max(0, min(self.max_tokens, self.ventana - self.tokens_entrada_con_margen))
+    
+    @property
+    def replanificada(self) -> bool:
+        return self.max_tokens_ajustado < self.max_tokens
+    
+    @property
+    def cabe(self) -> bool:
+        """True si cabe en la ventana, aunque sea reduciendo la salida."""
+        return self.max_tokens_ajustado >= min(self.max_tokens, MIN_TOKENS_SALIDA)
+    
+    def verificar(self) -> int:
+        """
+        Retorna los max_tokens a usar en la llamada.
+        
+        Raises:
+            ErrorPresupuestoTokens: Si el prompt no cabe en la ventana.
+        """
+        if not self.cabe:
+            raise ErrorPresupuestoTokens(
+                f"{self.agente}: el prompt (~{self.tokens_entrada} tokens) no cabe en la "
+                f"ventana de {self.ventana} tokens con al menos {MIN_TOKENS_SALIDA} de salida"
+            )
+        return self.max_tokens_ajustado
+
+
+def resumen_plan(planes: List[PlanLlamada], titulo: Optional[str] = None) -> str:
+    """
+    Tabla con el gasto de tokens planificado antes de la primera llamada.
+    
+    Args:
+        planes: Planes de las llamadas que se van a realizar.
+        titulo: Encabezado de la tabla.
+    
+    Returns:
+        Texto de varias líneas con una fila por llamada y el total.
+    """
+    metodo = "tiktoken" if tiktoken is not None else "estimación"
+    lineas = [titulo or f"Presupuesto de tokens planificado ({metodo}):"]
+    ancho = max(len(p.agente) for p in planes) if planes else 0
+    
+    for p in planes:
+        estado = ""
+        if not p.cabe:
+            estado = f"  ✗ excede la ventana de {p.ventana}"
+        elif p.replanificada:
+            estado = f"  ⚠ salida reducida a {p.max_tokens_ajustado}"
+        lineas.append(f"    {p.agente:<{ancho}}  entrada ~{p.tokens_entrada:>8}  salida ≤ {p.max_tokens:>6}{estado}")
+    
+    total_entrada = sum(p.tokens_entrada for p in planes)
+    total_salida = sum(p.max_tokens_ajustado for p in planes if p.cabe)
+    lineas.append(f"    Total: {len(planes)} llamadas, ~{total_entrada} tokens de entrada, hasta {total_salida} de salida")
+    return "\n".join(lineas)
@@ -9,6 +9,7 @@ Uso:
     python main.py                          # Procesa todas las transcripciones en data/raw/
     python main.py archivo.txt              # Procesa un archivo específico
     python main.py --paralelo               # Ejecuta agentes en paralelo
+    python main.py --sin-cache              # Ignora la caché de respuestas del LLM
     python main.py --help                   # Muestra ayuda
 """
 import os
@@ -19,8 +20,13 @@ from pathlib import Path
 # Agregar el directorio src al path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from config import DATA_RAW_DIR, DATA_OUTPUTS_DIR
+from config import (
+    DATA_RAW_DIR, DATA_OUTPUTS_DIR, EXTRACCION_CONJUNTA, MODO_CORRECCION,
+    CORRECCION_UMBRAL_FUERA_LEXICO, VISTA_TRANSCRIPCION, SEGMENTACION_BLOQUES,
+    RECUPERACION_PASAJES
+)
 from agents import AgenteIntegrador
+from llm import configurar_cache, contexto_entrevista, obtener_cliente_llm, obtener_metricas
 from utils.file_loader import (
     cargar_transcripcion,
     listar_transcripciones,
@@ -28,6 +34,8 @@ from utils.file_loader import (
     guardar_reporte
 )
 from utils.latex_generator import guardar_latex_y_pdf
+from utils.reportes_individuales import guardar_secciones
+from utils.transcripciones_corregidas import configurar_transcripciones_corregidas
 
 
 def procesar_transcripcion(
@@ -71,12 +79,18 @@ def procesar_transcripcion(
         modo = "paralelo" if paralelo else "secuencial"
         print(f"  Ejecutando sistema multi-agente (modo {modo})...")
     
-    reportes = integrador.procesar(
-        transcripcion=transcripcion,
-        nombre_entrevistado=nombre_entrevistado,
-        paralelo=paralelo,
-        verbose=verbose
-    )
+    with contexto_entrevista(nombre_entrevistado):
+        reportes = integrador.procesar(
+            transcripcion=transcripcion,
+            nombre_entrevistado=nombre_entrevistado,
+            paralelo=paralelo,
+            verbose=verbose
+        )
+    
+    # Secciones en Markdown para el consolidador (consolidador_main.py --desde-reportes)
+    ruta_secciones = guardar_secciones(carpeta_entrevistado, nombre_entrevistado, reportes['secciones'], transcripcion)
+    if verbose:
+        print(f"  ✓ Secciones guardadas: {ruta_secciones}")
     
     # Generar PDFs con LaTeX (directamente, sin guardar MD)
     if verbose:
@@ -120,6 +134,14 @@ Ejemplos:
   python main.py "entrevista.txt"             # Procesa un archivo específico
   python main.py --paralelo                   # Ejecuta agentes en paralelo (más rápido)
   python main.py --directorio ./mis_datos     # Usa un directorio personalizado
+  python main.py --sin-cache                  # Vuelve a llamar al LLM aunque haya respuestas en caché
+  python main.py --conjunta                   # Una sola llamada para las siete secciones
+  python main.py --correccion diferencias     # El LLM devuelve solo los cambios de la corrección
+  python main.py --correccion tramos          # El LLM revisa solo los tramos con palabras sospechosas
+  python main.py --umbral-fuera-lexico 0.02   # Omite la corrección con LLM si ≤2% de palabras son nuevas
+  python main.py --vista entrevistado         # Los agentes de sección reciben solo los turnos del entrevistado
+  python main.py --bloques                    # Cada agente de bloque recibe solo su bloque de la entrevista
+  python main.py --recuperacion               # Cada agente de sección recibe solo sus pasajes más relevantes
         """
     )
     
@@ -153,8 +175,57 @@ Ejemplos:
         help="Modo silencioso (sin mensajes de progreso)"
     )
     
+    parser.add_argument(
+        "--conjunta",
+        action="store_true",
+        help="Extraer las siete secciones del reporte en una sola llamada con salida JSON"
+    )
+    
+    parser.add_argument(
+        "--correccion",
+        choices=["completo", "diferencias", "tramos"],
+        default=MODO_CORRECCION,
+        help=f"Formato de respuesta de la corrección de transcripción (default: {MODO_CORRECCION})"
+    )
+    
+    parser.add_argument(
+        "--umbral-fuera-lexico",
+        type=float,
+        default=CORRECCION_UMBRAL_FUERA_LEXICO,
+        help="Omitir la corrección con LLM si la fracción de palabras fuera del léxico "
+             f"aprendido no supera este valor; 0 = nunca (default: {CORRECCION_UMBRAL_FUERA_LEXICO})"
+    )
+    
+    parser.add_argument(
+        "--vista",
+        choices=["completa", "entrevistado", "sin_preguntas"],
+        default=VISTA_TRANSCRIPCION,
+        help=f"Parte de la transcripción que reciben los agentes de sección (default: {VISTA_TRANSCRIPCION})"
+    )
+    
+    parser.add_argument(
+        "--bloques",
+        action="store_true",
+        help="Enviar a los agentes de los bloques III-VI solo la parte de la entrevista de su bloque"
+    )
+    
+    parser.add_argument(
+        "--recuperacion",
+        action="store_true",
+        help="Enviar a los agentes de sección solo los pasajes más relevantes para su sección (BM25)"
+    )
+    
+    parser.add_argument(
+        "--sin-cache",
+        action="store_true",
+        help="No usar la caché persistente de respuestas del LLM ni las transcripciones ya corregidas"
+    )
+    
     args = parser.parse_args()
     
+    cache = configurar_cache(habilitada=not args.sin_cache)
+    transcripciones_corregidas = configurar_transcripciones_corregidas(habilitado=not args.sin_cache)
+    
     # Por defecto ejecutar en paralelo, a menos que se especifique --secuencial
     paralelo = not args.secuencial
     
@@ -165,7 +236,14 @@ Ejemplos:
     os.makedirs(output_dir, exist_ok=True)
     
     # Inicializar integrador
-    integrador = AgenteIntegrador()
+    integrador = AgenteIntegrador(
+        extraccion_conjunta=args.conjunta or EXTRACCION_CONJUNTA,
+        modo_correccion=args.correccion,
+        umbral_fuera_lexico=args.umbral_fuera_lexico,
+        vista_transcripcion=args.vista,
+        segmentacion_bloques=args.bloques or SEGMENTACION_BLOQUES,
+        recuperacion_pasajes=args.recuperacion or RECUPERACION_PASAJES
+    )
     
     verbose = not args.silencioso
     
@@ -222,6 +300,9 @@ Ejemplos:
                 import traceback
                 traceback.print_exc()
     
+    # Métricas por llamada al LLM (uso de tokens, latencia, reintentos)
+    ruta_metricas = obtener_metricas().guardar_json(os.path.join(output_dir, "metricas_llm.json"))
+    
     # Resumen final
     if verbose:
         print("\n" + "="*60)
@@ -236,6 +317,12 @@ Ejemplos:
             print(f"\n  {nombre}/")
             print(f"    ✓ {os.path.basename(ruta_detallado)}")
             print(f"    ✓ {os.path.basename(ruta_narrativo)}")
+        print(f"\n{cache.resumen()}")
+        print(transcripciones_corregidas.resumen())
+        print(obtener_cliente_llm().limitador.resumen())
+        print(obtener_cliente_llm().resumen_tokens())
+        print(f"\n{obtener_metricas().resumen()}")
+        print(f"\nMétricas guardadas en: {ruta_metricas}")
         print()
 
 
@@ -0,0 +1,149 @@
+"""
+Utilidades compartidas por los almacenes JSON en disco.
+
+- `escribir_json_atomico`: escribe en un temporal del mismo directorio y lo
+  renombra, de modo que otro hilo o proceso nunca lee un archivo a medias.
+- `huella_texto` / `huella_campos`: identificadores por contenido de un texto
+  o de un conjunto de campos (versiones de prompt, claves de caché).
+- `AlmacenPorContenido`: base de los almacenes con un archivo por texto de
+  entrada y versión del prompt (`<huella del texto>-<versión>.json`), con sus
+  contadores de reutilización y la instancia compartida del proceso.
+"""
+import os
+import hashlib
+import json
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+
+def escribir_json_atomico(ruta: str, datos, indent: Optional[int] = 1) -> None:
+    """
+    Escribe un JSON en disco de forma atómica (temporal + os.replace).
+    
+    Args:
+        ruta: Ruta final del archivo; su directorio debe existir.
+        datos: Objeto serializable.
+        indent: Sangría del JSON (None para una sola línea).
+    """
+    fd, ruta_tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(ruta)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, ensure_ascii=False, indent=indent)
+        os.replace(ruta_tmp, ruta)
+    except BaseException:
+        # Sin temporales huérfanos si la serialización o el renombrado fallan
+        try:
+            os.remove(ruta_tmp)
+        except OSError:
+            pass
+        raise
+
+
+def huella_texto(texto: str) -> str:
+    """Identificador corto del contenido de una transcripción."""
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()[:16]
+
+
+def huella_campos(campos: dict, longitud: Optional[int] = 12) -> str:
+    """
+    Hash SHA-256 de un diccionario, independiente del orden de las claves.
+    
+    Args:
+        campos: Todo lo que determina un resultado (proveedor, modelo, prompts...).
+        longitud: Caracteres hexadecimales que se conservan (None para el hash completo).
+    
+    Returns:
+        Hash en hexadecimal.
+    """
+    serializado = json.dumps(campos, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(serializado.encode('utf-8')).hexdigest()[:longitud]
+
+
+class AlmacenPorContenido:
+    """
+    Resultados en disco, un archivo JSON por texto de entrada y versión del
+    prompt que los produjo. Las subclases fijan el directorio por defecto y
+    exponen `obtener`/`guardar` con los campos que les corresponden.
+    """
+    
+    _compartidos: Dict[type, "AlmacenPorContenido"] = {}
+    _lock_compartidos = threading.Lock()
+    
+    def __init__(self, directorio: str, habilitado: bool = True):
+        self.directorio = directorio
+        self.habilitado = habilitado
+        self.reutilizados = 0
+        self.nuevos = 0
+        
+        self._lock = threading.Lock()
+    
+    def _ruta(self, texto: str, version: str) -> str:
+        return os.path.join(self.directorio, f"{huella_texto(texto)}-{version}.json")
+    
+    def contiene(self, texto: str, version: str) -> bool:
+        """True si hay un resultado guardado (y el almacén está activado)."""
+        return self.habilitado and os.path.exists(self._ruta(texto, version))
+    
+    def leer(self, texto: str, version: str, campos: List[str]) -> Optional[dict]:
+        """
+        Lee los campos guardados para un texto y una versión.
+        
+        Args:
+            texto: Texto de entrada del que se obtuvo el resultado.
+            version: Versión del prompt.
+            campos: Campos que debe tener el archivo.
+        
+        Returns:
+            Diccionario con esos campos, o None si el archivo no existe, está
+            incompleto o el almacén está desactivado.
+        """
+        if not self.habilitado:
+            return None
+        
+        try:
+            with open(self._ruta(texto, version), 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+            resultado = {campo: datos[campo] for campo in campos}
+        except (OSError, ValueError, KeyError):
+            return None
+        
+        with self._lock:
+            self.reutilizados += 1
+        return resultado
+    
+    def escribir(self, texto: str, version: str, datos: dict) -> None:
+        """
+        Guarda el resultado de un texto y una versión (escritura atómica).
+        
+        Args:
+            texto: Texto de entrada del que se obtuvo el resultado.
+            version: Versión del prompt; se añade a los datos como 'version_prompt'.
+            datos: Campos a guardar.
+        """
+        if not self.habilitado:
+            return
+        
+        os.makedirs(self.directorio, exist_ok=True)
+        escribir_json_atomico(self._ruta(texto, version), {'version_prompt': version, **datos})
+        
+        with self._lock:
+            self.nuevos += 1
+    
+    @classmethod
+    def compartido(cls) -> "AlmacenPorContenido":
+        """Instancia de la subclase compartida por todo el proceso."""
+        almacen = AlmacenPorContenido._compartidos.get(cls)
+        if almacen is None:
+            with AlmacenPorContenido._lock_compartidos:
+                almacen = AlmacenPorContenido._compartidos.get(cls)
+                if almacen is None:
+                    almacen = AlmacenPorContenido._compartidos[cls] = cls()
+        return almacen
+    
+    @classmethod
+    def configurar_compartido(cls, habilitado: bool) -> "AlmacenPorContenido":
+        """Activa o desactiva la instancia compartida y la retorna."""
+        almacen = cls.compartido()
+        almacen.habilitado = habilitado
+        return almacen
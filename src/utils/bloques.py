@@ -0,0 +1,181 @@
+"""
+Segmentación de una entrevista en los bloques de la guía.
+
+La guía de entrevista tiene 4 bloques, siempre en el mismo orden:
+
+1. Experiencia técnica y práctica aplicada
+2. Desarrollo, innovación y transferencia tecnológica
+3. Colaboración, liderazgo y visión estratégica
+4. Motivación y proyección profesional
+
+Cada pregunta del entrevistador (ver utils/turnos.py) se puntúa por las
+palabras clave de cada bloque y por menciones explícitas ("pasemos al segundo
+bloque"). Luego se asigna a cada pregunta un bloque respetando el orden de la
+guía (nunca se vuelve a un bloque anterior), con la asignación de mayor
+puntaje total. Los turnos siguientes a una pregunta, hasta la próxima,
+pertenecen a su bloque.
+
+La confianza es la fracción de preguntas con alguna palabra clave cuyo
+bloque asignado es también el de mayor puntaje para esa pregunta sola. Sin
+entrevistador identificado, la confianza es 0.
+"""
+import sys
+import os
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.turnos import IndiceTurnos
+
+BLOQUES = {
+    1: "Experiencia técnica y práctica aplicada",
+    2: "Desarrollo, innovación y transferencia tecnológica",
+    3: "Colaboración, liderazgo y visión estratégica",
+    4: "Motivación y proyección profesional",
+}
+
+# Raíces (sin tildes) de las palabras que anuncian cada bloque en las preguntas de la guía
+RAICES_BLOQUE = {
+    1: ['experienc', 'proyect', 'rol', 'resultad', 'articul', 'investigacion', 'herramient',
+        'arquitectur', 'metodolog', 'framework', 'lenguaj', 'librer', 'disen', 'integr', 'tecnic'],
+    2: ['desarroll', 'despleg', 'desplieg', 'produccion', 'innov', 'desercion', 'escal', 'sostenib',
+        'manten', 'infraestructur', 'recurs', 'laboratori', 'plataform', 'transferenc', 'servidor',
+        'comput'],
+    3: ['colabor', 'sinergi', 'alianz', 'facultad', 'aprendizaj', 'lider', 'competenc', 'vision',
+        'transform', 'futur', 'estrategi'],
+    4: ['motiv', 'impuls', 'proposit', 'proyeccion', 'crecimient', 'acompan', 'profesional',
+        'carrera', 'expectativ', 'inspir'],
+}
+
+# Mención explícita de un bloque: "segundo bloque", "bloque 3", "la última parte"
+PATRON_MENCION = re.compile(
+    r'\b(?:(primer|segund|tercer|cuart|ultim)[oa]?\s+(?:bloque|parte|eje)'
+    r'|(?:bloque|parte|eje)\s+(?:numero\s+)?([1-4]|uno|dos|tres|cuatro))\b'
+)
+ORDINALES = {'primer': 1, 'segund': 2, 'tercer': 3, 'cuart': 4, 'ultim': 4,
+             '1': 1, '2': 2, '3': 3, '4': 4, 'uno': 1, 'dos': 2, 'tres': 3, 'cuatro': 4}
+PESO_MENCION = 5
+
+PATRON_PALABRA = re.compile(r'\w+')
+
+
+def _sin_tildes(texto: str) -> str:
+    descompuesto = unicodedata.normalize('NFD', texto.lower())
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def puntuar_pregunta(texto: str) -> Dict[int, int]:
+    """Puntaje de cada bloque para el texto de una pregunta."""
+    texto = _sin_tildes(texto)
+    puntajes = {bloque: 0 for bloque in BLOQUES}
+    for palabra in PATRON_PALABRA.findall(texto):
+        for bloque, raices in RAICES_BLOQUE.items():
+            if any(palabra.startswith(raiz) for raiz in raices):
+                puntajes[bloque] += 1
+    for mencion in PATRON_MENCION.finditer(texto):
+        puntajes[ORDINALES[mencion.group(1) or mencion.group(2)]] += PESO_MENCION
+    return puntajes
+
+
+@dataclass
+class SegmentacionBloques:
+    """Bloque de la guía al que pertenece cada turno de una transcripción."""
+    bloque_turno: List[int]
+    confianza: float
+    preguntas: int = 0
+    preguntas_con_senal: int = 0
+    indice: Optional[IndiceTurnos] = field(default=None, repr=False)
+    
+    def turnos(self, bloques: Iterable[int]) -> Set[int]:
+        """Índices de los turnos que pertenecen a alguno de los bloques."""
+        bloques = set(bloques)
+        return {i for i, bloque in enumerate(self.bloque_turno) if bloque in bloques}
+    
+    def seleccionar(self, bloques: Iterable[int], confianza_minima: float) -> Optional[Set[int]]:
+        """
+        Turnos de los bloques pedidos, o None si la segmentación no alcanza la
+        confianza mínima o alguno de los bloques no aparece (usar el texto completo).
+        """
+        if self.confianza < confianza_minima:
+            return None
+        turnos = set()
+        for bloque in bloques:
+            del_bloque = self.turnos([bloque])
+            if not del_bloque:
+                return None
+            turnos |= del_bloque
+        return turnos
+    
+    def fraccion(self, bloques: Iterable[int]) -> float:
+        """Fracción del texto de los turnos que ocupan los bloques."""
+        if self.indice is None or not self.indice.texto:
+            return 0.0
+        turnos = self.turnos(bloques)
+        caracteres = sum(t.fin - t.inicio for i, t in enumerate(self.indice.turnos) if i in turnos)
+        return caracteres / len(self.indice.texto)
+    
+    def resumen(self) -> str:
+        """Línea con el tamaño de cada bloque y la confianza."""
+        if not self.preguntas_con_senal:
+            return "Bloques: no se reconocieron las preguntas de la guía"
+        partes = [f"{bloque}: {100 * self.fraccion([bloque]):.0f}%" for bloque in BLOQUES]
+        return f"Bloques ({', '.join(partes)}), confianza {self.confianza:.2f}"
+
+
+def segmentar_bloques(indice: IndiceTurnos) -> SegmentacionBloques:
+    """
+    Asigna un bloque de la guía a cada turno de la transcripción.
+    
+    Args:
+        indice: Índice de turnos de la transcripción.
+    
+    Returns:
+        SegmentacionBloques; con confianza 0 si no hay entrevistador identificado
+        o ninguna pregunta tiene palabras clave.
+    """
+    preguntas = [
+        i for i, turno in enumerate(indice.turnos)
+        if turno.pregunta and turno.hablante in indice.entrevistadores
+    ]
+    if not preguntas:
+        return SegmentacionBloques([1] * len(indice.turnos), 0.0, indice=indice)
+    
+    puntajes = [puntuar_pregunta(indice.texto[indice.turnos[i].inicio:indice.turnos[i].fin]) for i in preguntas]
+    
+    # mejor[k][b]: mayor puntaje total de las preguntas 0..k con la pregunta k en el bloque b,
+    # sin retroceder de bloque
+    mejor = []
+    for k, puntaje in enumerate(puntajes):
+        fila = {}
+        acumulado = 0
+        for bloque in BLOQUES:
+            if k:
+                acumulado = max(acumulado, mejor[k - 1][bloque])
+            fila[bloque] = puntaje[bloque] + acumulado
+        mejor.append(fila)
+    
+    # Reconstrucción: ante empates, el bloque más temprano (las preguntas sin
+    # palabras clave siguen en el bloque de la anterior)
+    asignados = [0] * len(preguntas)
+    limite = max(BLOQUES)
+    for k in range(len(preguntas) - 1, -1, -1):
+        candidatos = [b for b in BLOQUES if b <= limite]
+        asignados[k] = max(candidatos, key=lambda b: (mejor[k][b], -b))
+        limite = asignados[k]
+    
+    con_senal = [k for k, puntaje in enumerate(puntajes) if max(puntaje.values()) > 0]
+    acuerdo = sum(1 for k in con_senal if puntajes[k][asignados[k]] == max(puntajes[k].values()))
+    confianza = acuerdo / len(con_senal) if con_senal else 0.0
+    
+    # Cada turno toma el bloque de la última pregunta anterior (o de la primera)
+    bloque_turno = []
+    k = 0
+    for i in range(len(indice.turnos)):
+        while k + 1 < len(preguntas) and preguntas[k + 1] <= i:
+            k += 1
+        bloque_turno.append(asignados[k])
+    
+    return SegmentacionBloques(bloque_turno, confianza, len(preguntas), len(con_senal), indice=indice)
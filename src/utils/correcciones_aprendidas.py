@@ -0,0 +1,314 @@
+"""
+Almacén persistente de correcciones aprendidas del agente de corrección.
+
+Los pares "original → corrección" que el LLM reporta en cada transcripción se
+acumulan en un archivo JSON con el número de transcripciones distintas en que
+aparecieron. Los pares con suficientes ocurrencias y confianza se aplican de
+forma determinista antes de la llamada de corrección, pero en otras
+transcripciones solo donde el contexto se parece al de las apariciones en que
+el LLM los reportó (ver `palabras_contexto`), y nunca si el original está
+formado solo por palabras conocidas del español o préstamos habituales. El
+almacén guarda también el léxico de las transcripciones ya corregidas, para
+estimar cuántas palabras de una transcripción nueva siguen sin verificar.
+
+Los pares que no se vuelven a reportar en CORRECCIONES_EDAD_MAXIMA
+transcripciones se olvidan, y el número de pares y de palabras del léxico está
+acotado (se conservan los vistos más recientemente).
+"""
+import sys
+import os
+import json
+import re
+import threading
+from itertools import islice
+from typing import List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import (
+    CORRECCIONES_APRENDIDAS_PATH, CORRECCIONES_MIN_OCURRENCIAS,
+    CORRECCIONES_CONFIANZA_MINIMA, CORRECCIONES_EDAD_MAXIMA,
+    CORRECCIONES_MAX_PARES, CORRECCIONES_MAX_LEXICO
+)
+from utils.almacen_json import escribir_json_atomico, huella_texto
+from utils.lexico_espanol import PALABRAS_FRECUENTES, PRESTAMOS
+
+# Transcripciones de origen que se recuerdan por par (para reconocer reejecuciones)
+MAX_FUENTES = 50
+
+# Contexto de cada corrección: palabras a menos de VENTANA_CONTEXTO palabras de
+# las primeras MAX_APARICIONES_CONTEXTO apariciones, hasta MAX_CONTEXTO palabras
+VENTANA_CONTEXTO = 8
+MAX_APARICIONES_CONTEXTO = 3
+MAX_CONTEXTO = 40
+
+# Un original aprendible: de una a cinco palabras, empezando y terminando en letra o número
+PATRON_ORIGINAL = re.compile(r'\w[^\n]{0,58}\w|\w')
+PATRON_PALABRA = re.compile(r'[^\W\d_]+')
+
+PALABRAS_CONOCIDAS = PALABRAS_FRECUENTES | PRESTAMOS
+
+
+def palabras_contexto(texto: str, inicio: int, fin: int) -> set:
+    """
+    Palabras que caracterizan el contexto de texto[inicio:fin]: las de hasta
+    VENTANA_CONTEXTO palabras antes y después, en la misma línea, con al menos
+    cuatro letras y fuera de PALABRAS_FRECUENTES y PRESTAMOS (en minúsculas).
+    """
+    antes = texto[max(0, inicio - 20 * VENTANA_CONTEXTO):inicio].rsplit('\n', 1)[-1]
+    despues = texto[fin:fin + 20 * VENTANA_CONTEXTO].split('\n', 1)[0]
+    palabras = PATRON_PALABRA.findall(antes.lower())[-VENTANA_CONTEXTO:] + PATRON_PALABRA.findall(despues.lower())[:VENTANA_CONTEXTO]
+    return {p for p in palabras if len(p) >= 4 and p not in PALABRAS_CONOCIDAS}
+
+
+def solo_palabras_conocidas(texto: str) -> bool:
+    """True si todas las palabras del texto son palabras conocidas del español o préstamos."""
+    palabras = PATRON_PALABRA.findall(texto.lower())
+    return bool(palabras) and all(p in PALABRAS_CONOCIDAS for p in palabras)
+
+
+class AlmacenCorrecciones:
+    """
+    Correcciones aprendidas y léxico verificado, guardados en un archivo JSON:
+        
+        {"transcripciones": 120,
+         "pares": {"tensor flau": {"original": "tensor flau", "vista": 118,
+                                   "correcciones": {"TensorFlow": {"ocurrencias": 3,
+                                                                   "fuentes": [...],
+                                                                   "contexto": ["neuronales", ...]}}}},
+         "lexico": {"datos": 120, "grupo": 97, ...}}
+    
+    "transcripciones" cuenta las transcripciones de las que se aprendió; "vista"
+    y los valores del léxico son el número de la última en que aparecieron.
+    """
+    
+    def __init__(
+        self,
+        ruta: str = CORRECCIONES_APRENDIDAS_PATH,
+        min_ocurrencias: int = CORRECCIONES_MIN_OCURRENCIAS,
+        confianza_minima: float = CORRECCIONES_CONFIANZA_MINIMA,
+        edad_maxima: int = CORRECCIONES_EDAD_MAXIMA,
+        max_pares: int = CORRECCIONES_MAX_PARES,
+        max_lexico: int = CORRECCIONES_MAX_LEXICO
+    ):
+        self.ruta = ruta
+        self.min_ocurrencias = min_ocurrencias
+        self.confianza_minima = confianza_minima
+        self.edad_maxima = edad_maxima
+        self.max_pares = max_pares
+        self.max_lexico = max_lexico
+        
+        self._lock = threading.Lock()
+        self._datos = None
+    
+    def _cargar(self) -> dict:
+        if self._datos is None:
+            try:
+                with open(self.ruta, 'r', encoding='utf-8') as f:
+                    self._datos = json.load(f)
+            except (OSError, ValueError):
+                self._datos = {}
+            self._datos.setdefault("pares", {})
+            self._datos.setdefault("transcripciones", 0)
+            lexico = self._datos.get("lexico", {})
+            # Formato anterior: lista de palabras, sin la última transcripción en que aparecieron
+            self._datos["lexico"] = dict.fromkeys(lexico, 0) if isinstance(lexico, list) else lexico
+        return self._datos
+    
+    def guardar(self) -> None:
+        """Escribe el almacén en disco (escritura atómica)."""
+        with self._lock:
+            datos = self._cargar()
+            serializable = {
+                "transcripciones": datos["transcripciones"],
+                "pares": datos["pares"],
+                "lexico": dict(sorted(datos["lexico"].items())),
+            }
+            os.makedirs(os.path.dirname(os.path.abspath(self.ruta)), exist_ok=True)
+            escribir_json_atomico(self.ruta, serializable)
+    
+    def pares_activos(self, huella: Optional[str] = None) -> List[Tuple[str, str, Optional[frozenset]]]:
+        """
+        Pares (original, corrección, contexto) que se aplican: la corrección más
+        reportada de cada original. Si se aprendió de la transcripción con esta
+        huella se aplica en todo el texto (contexto None); si no, solo si alcanza
+        las ocurrencias y la confianza mínimas, el original no está formado solo
+        por palabras conocidas y tiene contexto registrado, y únicamente donde
+        aparece alguna de esas palabras de contexto. Los originales más largos
+        van primero.
+        """
+        activos = []
+        with self._lock:
+            for par in self._cargar()["pares"].values():
+                correcciones = par["correcciones"]
+                total = sum(c["ocurrencias"] for c in correcciones.values())
+                reemplazo, mejor = max(correcciones.items(), key=lambda x: (x[1]["ocurrencias"], x[0]))
+                if huella is not None and huella in mejor["fuentes"]:
+                    activos.append((par["original"], reemplazo, None))
+                    continue
+                confiable = mejor["ocurrencias"] >= self.min_ocurrencias and mejor["ocurrencias"] / total >= self.confianza_minima
+                if confiable and mejor.get("contexto") and not solo_palabras_conocidas(par["original"]):
+                    activos.append((par["original"], reemplazo, frozenset(mejor["contexto"])))
+        return sorted(activos, key=lambda x: (-len(x[0]), x[0]))
+    
+    def aplicar(self, texto: str, huella: Optional[str] = None) -> Tuple[str, List[str]]:
+        """
+        Aplica los pares activos al texto.
+        
+        Args:
+            texto: Transcripción sin corregir.
+            huella: Huella de la transcripción (ver `huella_texto`).
+        
+        Returns:
+            Tupla (texto_corregido, lista_correcciones) con una línea
+            "- original → corrección (aprendida)" por par aplicado.
+        """
+        pares = self.pares_activos(huella)
+        if not pares:
+            return texto, []
+        por_original = {original.lower(): (original, reemplazo, contexto) for original, reemplazo, contexto in pares}
+        # Una sola pasada: en cada posición, el original más largo
+        patron = re.compile(r'\b(?:' + '|'.join(re.escape(original) for original, _, _ in pares) + r')\b', re.IGNORECASE)
+        aplicadas = []
+        
+        def reemplazar(match):
+            encontrado = match.group(0)
+            original, reemplazo, contexto = por_original.get(encontrado.lower(), (None, encontrado, None))
+            if contexto is not None and not contexto & palabras_contexto(texto, match.start(), match.end()):
+                return encontrado
+            if original is not None and encontrado != reemplazo and (original, reemplazo) not in aplicadas:
+                aplicadas.append((original, reemplazo))
+            return reemplazo
+        
+        corregido = patron.sub(reemplazar, texto)
+        orden = {original: i for i, (original, _, _) in enumerate(pares)}
+        aplicadas.sort(key=lambda par: orden[par[0]])
+        return corregido, [f"- {original} → {reemplazo} (aprendida)" for original, reemplazo in aplicadas]
+    
+    def _palabras_erroneas(self) -> set:
+        """Palabras de los originales aprendidos que no aparecen en sus correcciones."""
+        erroneas = set()
+        for par in self._cargar()["pares"].values():
+            correctas = {p for c in par["correcciones"] for p in PATRON_PALABRA.findall(c.lower())}
+            erroneas |= set(PATRON_PALABRA.findall(par["original"].lower())) - correctas
+        return erroneas
+    
+    def lexicos(self) -> Tuple[set, set]:
+        """
+        Léxico verificado (sin las palabras de errores aprendidos) y palabras
+        de errores aprendidos, en minúsculas.
+        """
+        with self._lock:
+            erroneas = self._palabras_erroneas()
+            return self._cargar()["lexico"].keys() - erroneas, erroneas
+    
+    def tasa_fuera_lexico(self, texto: str) -> float:
+        """
+        Fracción de palabras del texto que no están en el léxico verificado
+        (o que son parte de un error aprendido). 1.0 si el texto no tiene palabras.
+        """
+        palabras = PATRON_PALABRA.findall(texto.lower())
+        if not palabras:
+            return 1.0
+        lexico, _ = self.lexicos()
+        return sum(1 for p in palabras if p not in lexico) / len(palabras)
+    
+    @staticmethod
+    def _pares_reportados(correcciones: str) -> List[Tuple[str, str]]:
+        """Pares "original → corrección" de la lista que devuelve el agente."""
+        pares = []
+        for linea in correcciones.split('\n'):
+            for separador in ['→', '->', '=>']:
+                if separador in linea:
+                    partes = linea.split(separador)
+                    if len(partes) == 2:
+                        original = partes[0].strip().strip('-•*"\'').strip()
+                        corregido = partes[1].strip().strip('"\'').strip()
+                        pares.append((original, corregido))
+                    break
+        return pares
+    
+    def aprender(self, texto: str, correcciones: str, texto_corregido: str, huella: str) -> int:
+        """
+        Registra los pares reportados por el LLM, con las palabras de contexto
+        de sus apariciones, y el léxico del texto corregido; luego olvida los
+        pares y palabras más antiguos (ver `_podar`). Solo se aceptan pares
+        cortos cuyo original aparece en el texto enviado al LLM y cuya
+        corrección aparece en su respuesta; las correcciones conocidas
+        (patrones con "\\") y las que solo cambian mayúsculas se ignoran.
+        
+        Args:
+            texto: Texto enviado al LLM.
+            correcciones: Lista de correcciones devuelta por el agente.
+            texto_corregido: Texto corregido final.
+            huella: Huella de la transcripción original.
+        
+        Returns:
+            Número de pares registrados.
+        """
+        registrados = 0
+        with self._lock:
+            datos = self._cargar()
+            datos["transcripciones"] += 1
+            actual = datos["transcripciones"]
+            for original, corregido in self._pares_reportados(correcciones):
+                if (not corregido or '\\' in original or original.lower() == corregido.lower()
+                        or not PATRON_ORIGINAL.fullmatch(original) or len(original.split()) > 5
+                        or corregido not in texto_corregido):
+                    continue
+                apariciones = list(islice(re.finditer(rf'\b{re.escape(original)}\b', texto, re.IGNORECASE), MAX_APARICIONES_CONTEXTO))
+                if not apariciones:
+                    continue
+                par = datos["pares"].setdefault(original.lower(), {"original": original, "correcciones": {}})
+                par["vista"] = actual
+                entrada = par["correcciones"].setdefault(corregido, {"ocurrencias": 0, "fuentes": []})
+                if huella in entrada["fuentes"]:
+                    continue
+                entrada["ocurrencias"] += 1
+                entrada["fuentes"] = (entrada["fuentes"] + [huella])[-MAX_FUENTES:]
+                # Las palabras del propio par no distinguen un contexto de otro
+                propias = set(PATRON_PALABRA.findall(f"{original} {corregido}".lower()))
+                contexto = entrada.get("contexto", [])
+                for aparicion in apariciones:
+                    nuevas = palabras_contexto(texto, aparicion.start(), aparicion.end()) - propias
+                    contexto = [p for p in contexto if p not in nuevas] + sorted(nuevas)
+                entrada["contexto"] = contexto[-MAX_CONTEXTO:]
+                registrados += 1
+            datos["lexico"].update(dict.fromkeys(PATRON_PALABRA.findall(texto_corregido.lower()), actual))
+            self._podar(datos)
+        return registrados
+    
+    def _podar(self, datos: dict) -> None:
+        """
+        Olvida los pares no reportados en las últimas `edad_maxima`
+        transcripciones y deja como máximo `max_pares` pares y `max_lexico`
+        palabras del léxico, las vistas más recientemente.
+        """
+        actual = datos["transcripciones"]
+        pares = {
+            clave: par for clave, par in datos["pares"].items()
+            if actual - par.get("vista", 0) < self.edad_maxima
+        }
+        if len(pares) > self.max_pares:
+            recientes = sorted(pares, key=lambda clave: (-pares[clave].get("vista", 0), clave))[:self.max_pares]
+            pares = {clave: pares[clave] for clave in recientes}
+        datos["pares"] = pares
+        
+        lexico = datos["lexico"]
+        if len(lexico) > self.max_lexico:
+            recientes = sorted(lexico, key=lambda palabra: (-lexico[palabra], palabra))[:self.max_lexico]
+            datos["lexico"] = {palabra: lexico[palabra] for palabra in recientes}
+
+
+_almacen_compartido = None
+_lock_compartido = threading.Lock()
+
+
+def obtener_almacen_correcciones() -> AlmacenCorrecciones:
+    """Retorna el almacén de correcciones aprendidas compartido del proceso."""
+    global _almacen_compartido
+    if _almacen_compartido is None:
+        with _lock_compartido:
+            if _almacen_compartido is None:
+                _almacen_compartido = AlmacenCorrecciones()
+    return _almacen_compartido
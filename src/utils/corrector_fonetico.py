@@ -0,0 +1,396 @@
+"""
+Precorrección local de vocabulario técnico por similitud fonética.
+
+Las transcripciones automáticas escriben los nombres de tecnologías y grupos
+como suenan en español ("paiton", "yupiter", "jaging feis"). Este módulo
+reconoce esas variantes sin llamar al LLM:
+
+1. Cada forma del léxico (nombre canónico y variantes conocidas) se reduce a
+   una clave fonética con reglas del español (c/qu/k, z/s, v/b, ll/y, h...)
+   y de la pronunciación española de palabras inglesas (ph, th, y vocal).
+2. Las claves se indexan por longitud y conjunto de letras para buscar, con
+   una distancia de edición acotada, las claves cercanas a la de cada grupo
+   de 1 a 3 palabras del texto.
+3. Solo se reemplaza con alta confianza: clave idéntica, o distancia pequeña
+   en claves largas, con el mismo número de palabras que la forma del léxico
+   y un único término canónico a la menor distancia.
+4. Nunca se reemplaza una palabra frecuente del español: las formas del
+   léxico que coinciden con una de ellas (por escritura o por clave) no se
+   aplican, y tampoco se corrigen los grupos formados solo por palabras
+   frecuentes. Esos casos los señala el detector de tramos sospechosos
+   (`cercanos`) para que los revise el LLM con su contexto.
+
+Las claves de palabras y las búsquedas se recuerdan, así que el costo es
+lineal en el número de palabras del texto.
+"""
+import sys
+import os
+import re
+import hashlib
+import unicodedata
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.lexico_espanol import PALABRAS_FRECUENTES
+
+
+# Términos canónicos y variantes de transcripción, tomados de las listas del
+# prompt de AgenteCorreccion. Se omiten las entradas que no son fonéticas
+# ("neural network" → red neuronal) o cuyas variantes son palabras comunes del
+# español ("grande", "geo", "quedas" → Keras).
+LEXICO_TECNICO: List[Tuple[str, List[str]]] = [
+    # Tecnologías y frameworks
+    ("TensorFlow", ["tensor flau", "tensor flow", "tensor flo"]),
+    ("Keras", ["keras", "queras"]),
+    ("PyTorch", ["pai torch", "pai tors", "paytorch"]),
+    ("Python", ["phyton", "paiton", "python"]),
+    ("scikit-learn", ["scikit learn", "saiki learn"]),
+    ("NumPy", ["numpy", "nam pai"]),
+    ("pandas", []),
+    ("Jupyter", ["jupyter", "yupiter"]),
+    ("Google Colab", ["google colab"]),
+    ("Colab", ["colab", "co lab"]),
+    ("Hugging Face", ["hugging face", "jaging feis"]),
+    ("OpenAI", ["open ai", "open ey ai"]),
+    ("ChatGPT", ["chat gpt", "chat yipi ti"]),
+    ("LLM", ["llm", "ele ele eme"]),
+    # Términos técnicos de IA
+    ("machine learning", ["machine lerning"]),
+    ("deep learning", ["dip lerning"]),
+    ("convolucional", ["convolutional"]),
+    ("clustering", ["clastering"]),
+    ("overfitting", ["over fiting"]),
+    ("dataset", ["data set"]),
+    ("API", ["a pi ai"]),
+    ("GPU", ["yi pi yu"]),
+    ("CPU", ["ci pi yu"]),
+    ("RAM", ["ram"]),
+    ("Raspberry Pi", ["raspberry pi", "rasberry pai", "narras berry"]),
+    ("LoRa", ["lora", "lo ra"]),
+    # Grupos de investigación e instituciones
+    ("GIROPS", ["jirops", "girops"]),
+    ("SIRIUS", ["sirius", "sirios"]),
+    ("GEIO", ["geio"]),
+    ("GTA", ["gta", "g t a"]),
+    ("OMICRON", ["omicron"]),
+    ("GAIA", ["gaia"]),
+    ("Colciencias", ["colciencias", "col ciencias"]),
+    ("SiB Colombia", ["sib colombia", "sid colombia"]),
+]
+
+# Grupos de hasta tres palabras separadas solo por espacios
+MAX_PALABRAS = 3
+PATRON_PALABRA = re.compile(r'\w+')
+PATRON_SEPARADOR = re.compile(r'[ \t]+')
+
+# Reglas de la clave fonética, en orden (texto en minúsculas, sin tildes)
+REGLAS_CLAVE = [
+    (re.compile(r'x'), 'ks'),
+    (re.compile(r'ph'), 'f'),
+    (re.compile(r'th'), 't'),
+    (re.compile(r'sh|ch'), '#'),            # /ʃ/ y /tʃ/
+    (re.compile(r'ck|qu|k|c(?![ei])'), 'k'),
+    (re.compile(r'c|z'), 's'),
+    (re.compile(r'gu(?=[ei])'), 'g'),
+    (re.compile(r'g(?=[ei])|j|ll'), 'y'),  # la j inglesa suena como la y española
+    (re.compile(r'v'), 'b'),
+    (re.compile(r'w'), 'u'),
+    (re.compile(r'y(?![aeiou])'), 'i'),     # y vocal: "python", "jupyter"
+    (re.compile(r'ai|ay'), 'i'),            # "paiton" ~ "python"
+    (re.compile(r'(.)\1+'), r'\1'),         # letras repetidas
+]
+
+
+def _sin_tildes(texto: str) -> str:
+    descompuesto = unicodedata.normalize('NFD', texto.lower())
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+@lru_cache(maxsize=65536)
+def _clave_palabra(palabra: str) -> str:
+    """Clave fonética de una sola palabra (memorizada: las palabras se repiten mucho)."""
+    clave = _sin_tildes(palabra)
+    # La h inicial inglesa se transcribe como j ("hugging" → "jaging"); la h interior es muda
+    clave = re.sub(r'(?<!^)h', '', re.sub(r'^h(?=[aeiou])', 'j', clave))
+    for patron, reemplazo in REGLAS_CLAVE:
+        clave = patron.sub(reemplazo, clave)
+    return clave
+
+
+def clave_fonetica(texto: str) -> str:
+    """
+    Clave fonética de una o varias palabras: la unión de la clave de cada una.
+    
+    Ejemplos: "paiton" y "python" → "piton"; "yupiter" y "jupyter" → "yupiter";
+    "pai torch" y "pytorch" → "pitork".
+    """
+    return ''.join(_clave_palabra(palabra) for palabra in PATRON_PALABRA.findall(texto))
+
+
+def _mascara(clave: str) -> int:
+    """Conjunto de letras de una clave como bits (las colisiones solo debilitan el filtro)."""
+    mascara = 0
+    for caracter in clave:
+        mascara |= 1 << (ord(caracter) & 63)
+    return mascara
+
+
+def distancia_edicion(a: str, b: str, maximo: int) -> int:
+    """
+    Distancia de Levenshtein entre `a` y `b`, o `maximo + 1` si la supera.
+    Solo se calcula la franja de `maximo` celdas a cada lado de la diagonal.
+    """
+    if abs(len(a) - len(b)) > maximo:
+        return maximo + 1
+    fuera = maximo + 1
+    anterior = [j if j <= maximo else fuera for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        desde, hasta = max(1, i - maximo), min(len(b), i + maximo)
+        actual = [fuera] * (len(b) + 1)
+        if i <= maximo:
+            actual[0] = i
+        for j in range(desde, hasta + 1):
+            actual[j] = min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + (a[i - 1] != b[j - 1]))
+        if min(actual[desde - 1:hasta + 1]) > maximo:
+            return fuera
+        anterior = actual
+    return min(anterior[-1], fuera)
+
+
+def tolerancia(clave: str) -> int:
+    """
+    Distancia máxima admitida para una clave: ninguna en claves cortas, donde
+    una letra distinta suele ser otra palabra del español ("caras" / "keras").
+    """
+    if len(clave) < 8:
+        return 0
+    return 1 if len(clave) < 12 else 2
+
+
+class IndiceClaves:
+    """
+    Índice de claves fonéticas para buscar las que están a una distancia de
+    edición acotada: las claves se agrupan por longitud, y antes de calcular
+    la distancia se descartan las que difieren en más de 2·tolerancia letras
+    (cada edición cambia a lo sumo dos letras del conjunto).
+    """
+    
+    def __init__(self):
+        self._por_longitud: Dict[int, List[Tuple[str, int]]] = {}
+    
+    def agregar(self, clave: str) -> None:
+        grupo = self._por_longitud.setdefault(len(clave), [])
+        if all(c != clave for c, _ in grupo):
+            grupo.append((clave, _mascara(clave)))
+    
+    def buscar(self, clave: str, mascara: int, tolerancia: int) -> List[Tuple[int, str]]:
+        """Claves a distancia ≤ tolerancia, como (distancia, clave)."""
+        resultados = []
+        for longitud in range(len(clave) - tolerancia, len(clave) + tolerancia + 1):
+            for candidata, mascara_candidata in self._por_longitud.get(longitud, ()):
+                if bin(mascara ^ mascara_candidata).count('1') > 2 * tolerancia:
+                    continue
+                d = distancia_edicion(clave, candidata, tolerancia)
+                if d <= tolerancia:
+                    resultados.append((d, candidata))
+        return resultados
+
+
+class CorrectorFonetico:
+    """Reemplaza variantes fonéticas de los términos del léxico por su forma canónica."""
+    
+    def __init__(
+        self,
+        lexico: List[Tuple[str, List[str]]] = LEXICO_TECNICO,
+        comunes: FrozenSet[str] = PALABRAS_FRECUENTES
+    ):
+        """
+        Args:
+            lexico: Pares (término canónico, variantes de transcripción).
+            comunes: Palabras del español que nunca se reemplazan.
+        """
+        self.lexico = lexico
+        self.comunes = frozenset(_sin_tildes(p) for p in comunes)
+        self._formas: Dict[str, set] = {}   # clave fonética -> {(término canónico, número de palabras)}
+        self._indice = IndiceClaves()
+        
+        # Claves de formas que coinciden con palabras frecuentes: solo para `cercanos`
+        claves_comunes = {clave_fonetica(p) for p in self.comunes}
+        self._claves_ambiguas = set()
+        
+        for canonico, variantes in lexico:
+            for forma in [canonico] + variantes:
+                clave = clave_fonetica(forma)
+                # Claves de una o dos letras ("llm" → "im") coinciden con cualquier cosa
+                if len(clave) >= 3:
+                    self._formas.setdefault(clave, set()).add((canonico, len(PATRON_PALABRA.findall(forma))))
+                    self._indice.agregar(clave)
+                    if clave in claves_comunes or self._solo_comunes(PATRON_PALABRA.findall(forma)):
+                        self._claves_ambiguas.add(clave)
+        
+        huella_comunes = hashlib.sha256(" ".join(sorted(self.comunes)).encode('utf-8')).hexdigest()[:12]
+        self._version = f"{self.lexico!r}|comunes:{huella_comunes}"
+        
+        self._longitud_maxima = max((len(c) for c in self._formas), default=0) + 2
+        self._memoria: Dict[Tuple[str, int], Optional[Tuple[int, str]]] = {}
+        self._memoria_cercanos: Dict[Tuple[str, bool], Tuple[int, set]] = {}
+    
+    @property
+    def version(self) -> str:
+        """Identificador del léxico (cambia si cambian los términos, variantes o palabras comunes)."""
+        return self._version
+    
+    def _solo_comunes(self, palabras: List[str]) -> bool:
+        return all(_sin_tildes(p) in self.comunes for p in palabras)
+    
+    def _buscar(self, clave: str, mascara: int, n_palabras: int) -> Optional[Tuple[int, str]]:
+        """
+        (distancia, término canónico) de la mejor coincidencia con una forma
+        del léxico de igual número de palabras, si es única; o None.
+        """
+        if not (3 <= len(clave) <= self._longitud_maxima):
+            return None
+        memoria = self._memoria.get((clave, n_palabras), False)
+        if memoria is not False:
+            return memoria
+        
+        if clave in self._formas:
+            coincidencias = [(0, clave)]
+        else:
+            coincidencias = self._indice.buscar(clave, mascara, tolerancia(clave)) if tolerancia(clave) else []
+        
+        por_distancia: Dict[int, set] = {}
+        for d, coincidencia in coincidencias:
+            if coincidencia in self._claves_ambiguas:
+                continue
+            for canonico, palabras in self._formas[coincidencia]:
+                if palabras == n_palabras:
+                    por_distancia.setdefault(d, set()).add(canonico)
+        
+        resultado = None
+        if por_distancia:
+            mejor = min(por_distancia)
+            if len(por_distancia[mejor]) == 1:
+                resultado = (mejor, next(iter(por_distancia[mejor])))
+        
+        self._memoria[(clave, n_palabras)] = resultado
+        return resultado
+    
+    def _grupos(self, texto: str):
+        """
+        Grupos de 1 a MAX_PALABRAS palabras consecutivas separadas solo por
+        espacios, como (inicio, fin, clave, máscara, número de palabras,
+        índice de la primera palabra).
+        """
+        palabras = list(PATRON_PALABRA.finditer(texto))
+        claves = [_clave_palabra(p.group()) for p in palabras]
+        mascaras = [_mascara(c) for c in claves]
+        
+        for i in range(len(palabras)):
+            clave, mascara = "", 0
+            for n in range(1, MAX_PALABRAS + 1):
+                if i + n > len(palabras):
+                    break
+                if n > 1 and not PATRON_SEPARADOR.fullmatch(texto, palabras[i + n - 2].end(), palabras[i + n - 1].start()):
+                    break
+                clave += claves[i + n - 1]
+                mascara |= mascaras[i + n - 1]
+                if len(clave) > self._longitud_maxima:
+                    break
+                yield palabras[i].start(), palabras[i + n - 1].end(), clave, mascara, n, i
+    
+    def aplicar(self, texto: str) -> Tuple[str, List[str]]:
+        """
+        Corrige las variantes reconocidas con alta confianza.
+        
+        Args:
+            texto: Texto a corregir.
+        
+        Returns:
+            Tupla (texto_corregido, lista_correcciones) con una línea
+            "- original → canónico (fonética)" por cada par distinto.
+        """
+        # Candidatos: (distancia, -palabras, inicio, fin, canónico) de cada grupo de 1 a 3 palabras
+        # que no esté formado solo por palabras frecuentes
+        comunes = [_sin_tildes(p) in self.comunes for p in PATRON_PALABRA.findall(texto)]
+        candidatos = []
+        for inicio, fin, clave, mascara, n, i in self._grupos(texto):
+            if all(comunes[i:i + n]):
+                continue
+            encontrado = self._buscar(clave, mascara, n)
+            if encontrado:
+                candidatos.append((encontrado[0], -n, inicio, fin, encontrado[1]))
+        
+        # Las coincidencias más exactas (y, a igual distancia, más largas) reservan su tramo
+        # primero: "y tensor flau" no gana sobre "tensor flau"
+        elegidos = []
+        ocupado = bytearray(len(texto))
+        for _, _, inicio, fin, canonico in sorted(candidatos):
+            if any(ocupado[inicio:fin]):
+                continue
+            ocupado[inicio:fin] = b'\x01' * (fin - inicio)
+            elegidos.append((inicio, fin, canonico))
+        
+        partes = []
+        lineas = []
+        posicion = 0
+        for inicio, fin, canonico in sorted(elegidos):
+            original = texto[inicio:fin]
+            # Términos en minúscula (ej: "dataset"): solo cambios de escritura, no de mayúsculas
+            if original == canonico or (canonico.islower() and original.lower() == canonico):
+                continue
+            partes.append(texto[posicion:inicio])
+            partes.append(canonico)
+            posicion = fin
+            linea = f"- {original} → {canonico} (fonética)"
+            if linea not in lineas:
+                lineas.append(linea)
+        
+        partes.append(texto[posicion:])
+        return "".join(partes), lineas
+
+    
+    def cercanos(self, texto: str, conocida: Callable[[str], bool] = None) -> List[Tuple[int, int, int]]:
+        """
+        Grupos de palabras parecidos a alguna forma del léxico, con una
+        distancia admitida mayor que la de `aplicar` (una edición más en claves
+        de 5 o más letras) y sin exigir una coincidencia única: posibles
+        variantes que no se corrigen localmente pero conviene revisar. Se
+        omiten los grupos ya escritos como un término canónico.
+        
+        Args:
+            texto: Texto a revisar.
+            conocida: Si se indica, los grupos formados solo por palabras
+                     conocidas se buscan solo con clave idéntica ("hora" no
+                     se parece a "LoRa", pero una palabra con la misma clave
+                     que una forma del léxico sí se señala).
+        
+        Returns:
+            Lista de (inicio, fin, distancia).
+        """
+        marcas = [conocida(p) for p in PATRON_PALABRA.findall(texto)] if conocida else None
+        resultados = []
+        for inicio, fin, clave, mascara, n, i in self._grupos(texto):
+            if not 3 <= len(clave) <= self._longitud_maxima:
+                continue
+            exacta = len(clave) < 5 or (marcas is not None and all(marcas[i:i + n]))
+            memoria = self._memoria_cercanos.get((clave, exacta))
+            if memoria is None:
+                if exacta:
+                    coincidencias = [(0, clave)] if clave in self._formas else []
+                else:
+                    coincidencias = self._indice.buscar(clave, mascara, tolerancia(clave) + 1)
+                canonicos = {c for _, forma in coincidencias for c, _ in self._formas[forma]}
+                memoria = (min((d for d, _ in coincidencias), default=-1), canonicos)
+                self._memoria_cercanos[(clave, exacta)] = memoria
+            distancia, canonicos = memoria
+            if distancia >= 0 and texto[inicio:fin] not in canonicos:
+                resultados.append((inicio, fin, distancia))
+        return resultados
+
+@lru_cache(maxsize=None)
+def obtener_corrector_fonetico() -> CorrectorFonetico:
+    """Corrector con el léxico técnico por defecto (se construye una vez por proceso)."""
+    return CorrectorFonetico()
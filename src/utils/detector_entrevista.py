@@ -56,17 +56,6 @@ class InfoEntrevista:
                 return "el investigador"
 
 
-# Patrones que indican múltiples participantes
-PATRONES_GRUPAL = [
-    r'\b(nosotros|nosotras)\b',
-    r'\b(nuestro|nuestra|nuestros|nuestras)\s+(grupo|equipo|área|dependencia)',
-    r'\ben\s+(el|la)\s+(área|dependencia|facultad|grupo)\b.*\b(trabajamos|hacemos|desarrollamos)\b',
-    r'\b(representante|representantes)\s+de\b',
-    r'\b(somos|estamos)\s+\d+\s+(personas|integrantes|miembros)\b',
-    r'\b(mi compañero|mi compañera|mis compañeros|mis compañeras)\b',
-    r'\b(entre|junto con)\s+(los|las|nosotros)\b',
-]
-
 # Palabras clave de áreas/dependencias UTP
 AREAS_UTP = [
     'Vicerrectoría', 'Decanatura', 'Facultad', 'Departamento', 'Centro',
@@ -76,6 +65,28 @@ AREAS_UTP = [
     'Investigaciones', 'Extensión', 'Docencia',
 ]
 
+# Recorrido único de la transcripción (ver `_escanear`). Las menciones de
+# "yo"/"nosotros" y los posibles inicios de un área ("de/del/en [la] <área>")
+# son marcas de ancho cero; las etiquetas de hablante consumen el texto, como
+# en un re.findall. El filtro inicial por primera letra evita probar todas las
+# alternativas en cada posición.
+_MARCAS = (
+    r'(?=(?P<area>(?i:(?:de(?:l)?|en)\s+(?:la\s+)?(?:' + '|'.join(AREAS_UTP) + r'))))'
+    r'|(?=(?P<yo>\b[yY][oO]\b))'
+    r'|(?=(?P<nosotros>\b[nN][oO][sS][oO][tT][rR][oOaA][sS]\b))'
+)
+PATRON_MARCAS = re.compile(_MARCAS)
+PATRON_ESCANEO = re.compile(
+    r'(?=[dDeEyYnNshpA-ZÁÉÍÓÚ])(?:' + _MARCAS +
+    r'|(?P<hablante>(?:speaker|hablante|participante)\s*\d+'
+    r'|(?P<nombre>[A-ZÁÉÍÓÚ][a-záéíóú]+(?:\s+[A-ZÁÉÍÓÚ][a-záéíóú]+)*)\s*:))'
+)
+# Texto del área a partir de cada inicio ("de la Facultad de Ingeniería, ..." → "Facultad de Ingeniería")
+PATRONES_AREA = [
+    (area, re.compile(rf'(?:de(?:l)?|en)\s+(?:la\s+)?({area}[^,.\n]*)', re.IGNORECASE))
+    for area in AREAS_UTP
+]
+
 # Nombres femeninos comunes
 NOMBRES_FEMENINOS = [
     'maría', 'maria', 'ana', 'laura', 'sandra', 'diana', 'luz', 'gloria', 
@@ -108,6 +119,44 @@ def detectar_genero_nombre(nombre: str) -> str:
     return 'masculino'
 
 
+def _escanear(transcripcion: str) -> tuple:
+    """
+    Recorre la transcripción una vez.
+    
+    Returns:
+        Tupla (menciones de "yo", menciones de "nosotros/as", nombres de las
+        etiquetas de hablante ("" para "Speaker N"), posiciones donde empieza
+        una mención de área).
+    """
+    yo = nosotros = 0
+    hablantes = []
+    inicios_area = []
+    
+    def registrar(marca):
+        nonlocal yo, nosotros
+        if marca.lastgroup == 'yo':
+            yo += 1
+        elif marca.lastgroup == 'nosotros':
+            nosotros += 1
+        else:
+            inicios_area.append(marca.start())
+    
+    for match in PATRON_ESCANEO.finditer(transcripcion):
+        if match.group('hablante') is None:
+            registrar(match)
+            continue
+        hablantes.append(match.group('nombre') or '')
+        # Marcas que empiezan dentro de la etiqueta
+        for posicion in range(match.start() + 1, match.end()):
+            if transcripcion[posicion] in 'dDeEyYnN':
+                marca = PATRON_MARCAS.match(transcripcion, posicion)
+                if marca:
+                    registrar(marca)
+    
+    inicios_area.sort()
+    return yo, nosotros, hablantes, inicios_area
+
+
 def detectar_tipo_entrevista(transcripcion: str, nombre_archivo: str = "") -> InfoEntrevista:
     """
     Analiza la transcripción para determinar si es individual o grupal.
@@ -115,36 +164,35 @@ def detectar_tipo_entrevista(transcripcion: str, nombre_archivo: str = "") -> In
     Args:
         transcripcion: Texto completo de la transcripción.
         nombre_archivo: Nombre del archivo (puede contener pistas).
-        
+    
     Returns:
         InfoEntrevista con los detalles detectados.
     """
     texto_lower = transcripcion.lower()
     
-    # Contar indicadores de entrevista grupal
-    indicadores_grupal = 0
-    for patron in PATRONES_GRUPAL:
-        matches = re.findall(patron, texto_lower, re.IGNORECASE)
-        indicadores_grupal += len(matches)
-    
-    # Buscar menciones de "yo" vs "nosotros"
-    menciones_yo = len(re.findall(r'\byo\b', texto_lower))
-    menciones_nosotros = len(re.findall(r'\b(nosotros|nosotras)\b', texto_lower))
+    menciones_yo, menciones_nosotros, hablantes, inicios_area = _escanear(transcripcion)
+    if len(texto_lower) != len(transcripcion):
+        # Algún carácter cambia de longitud al pasar a minúsculas (ej: "İ"): contar como antes
+        menciones_yo = len(re.findall(r'\byo\b', texto_lower))
+        menciones_nosotros = len(re.findall(r'\b(nosotros|nosotras)\b', texto_lower))
     
     # Detectar si hay múltiples hablantes con nombres distintos
-    # Buscar patrones como "Speaker 1:", "Hablante 2:", nombres seguidos de ":"
-    patrones_hablantes = re.findall(r'(?:speaker|hablante|participante)\s*\d+|([A-ZÁÉÍÓÚ][a-záéíóú]+(?:\s+[A-ZÁÉÍÓÚ][a-záéíóú]+)*)\s*:', transcripcion)
-    hablantes_unicos = set([h for h in patrones_hablantes if h and len(h) > 2])
+    # ("Speaker 1:", "Hablante 2:", nombres seguidos de ":")
+    hablantes_unicos = set([h for h in hablantes if h and len(h) > 2])
     
-    # Detectar área/dependencia mencionada
+    # Detectar área/dependencia mencionada: la primera de AREAS_UTP que aparece,
+    # con el contexto completo de su primera mención
     area_detectada = None
-    for area in AREAS_UTP:
-        if area.lower() in texto_lower:
-            # Buscar el contexto completo
-            match = re.search(rf'(?:de(?:l)?|en)\s+(?:la\s+)?({area}[^,.\n]*)', transcripcion, re.IGNORECASE)
+    for area, patron in PATRONES_AREA:
+        if area.lower() not in texto_lower:
+            continue
+        for inicio in inicios_area:
+            match = patron.match(transcripcion, inicio)
             if match:
                 area_detectada = match.group(1).strip()
                 break
+        if area_detectada:
+            break
     
     # Determinar si es grupal - ser muy estricto
     # Priorizar el nombre del archivo como indicador principal
@@ -213,7 +261,7 @@ def generar_instruccion_contexto(info: InfoEntrevista) -> str:
     
     Args:
         info: Información de la entrevista detectada.
-        
+    
     Returns:
         Texto con instrucciones de contexto para el prompt.
     """
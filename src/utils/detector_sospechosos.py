@@ -0,0 +1,165 @@
+"""
+Detección local de los tramos de una transcripción que conviene revisar.
+
+Una palabra es sospechosa si:
+
+1. Es parte de un error aprendido (ver utils.correcciones_aprendidas).
+2. Se parece fonéticamente a un término del léxico técnico sin estar escrita
+   como él (ver `CorrectorFonetico.cercanos`). Un parecido no exacto entre
+   palabras conocidas no cuenta ("caras" / "Keras" sí, "hora" / "LoRa" no).
+3. No es una palabra conocida (léxico del español, préstamos, léxico
+   verificado, términos del léxico técnico y de las correcciones conocidas) y
+   tiene algún par de letras que no se da en español ("Nike", "jaging").
+
+Las siglas en mayúsculas y las etiquetas de turno ("Entrevistado:") no se
+revisan. Cada palabra sospechosa se extiende con unas palabras de contexto a
+cada lado, sin salir de su línea, y los tramos que se tocan se unen.
+"""
+import sys
+import os
+import hashlib
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import CORRECCION_PALABRAS_CONTEXTO
+from utils.lexico_espanol import PALABRAS_FRECUENTES, PRESTAMOS, PARES_LETRAS
+from utils.corrector_fonetico import CorrectorFonetico, obtener_corrector_fonetico
+from utils.correcciones_aprendidas import AlmacenCorrecciones
+
+PATRON_PALABRA = re.compile(r'\w+')
+
+# Etiqueta de turno al inicio de la línea: "Entrevistador:", "Speaker 1:", "Ana María (00:12):"
+PATRON_ETIQUETA = re.compile(
+    r'^[ \t]*(?:[^\W\d_]+[ \t]*){1,4}(?:\d+[ \t]*)?(?:\(?\d{1,2}:\d{2}(?::\d{2})?\)?)?[ \t]*:',
+    re.MULTILINE
+)
+
+
+@dataclass
+class Tramo:
+    """Tramo [inicio, fin) del texto con al menos una palabra sospechosa."""
+    inicio: int
+    fin: int
+    texto: str
+    sospechosas: List[str] = field(default_factory=list)
+
+
+@lru_cache(maxsize=65536)
+def pares_raros(palabra: str) -> Tuple[str, ...]:
+    """Pares de letras de la palabra que no aparecen en palabras del español."""
+    descompuesto = unicodedata.normalize('NFD', palabra.lower())
+    letras = '^' + ''.join(c for c in descompuesto if not unicodedata.combining(c)) + '$'
+    return tuple(letras[i:i + 2] for i in range(len(letras) - 1) if letras[i:i + 2] not in PARES_LETRAS)
+
+
+class DetectorSospechosos:
+    """Marca las palabras dudosas de una transcripción y arma los tramos a revisar."""
+    
+    def __init__(
+        self,
+        corrector_fonetico: CorrectorFonetico = None,
+        almacen: AlmacenCorrecciones = None,
+        conocidas: Iterable[str] = (),
+        palabras_contexto: int = CORRECCION_PALABRAS_CONTEXTO
+    ):
+        """
+        Args:
+            corrector_fonetico: Léxico técnico para el parecido fonético. Por
+                     defecto, el compartido del proceso.
+            almacen: Almacén de correcciones aprendidas (léxico verificado y
+                     errores aprendidos), opcional.
+            conocidas: Textos cuyas palabras se consideran correctas (por
+                     ejemplo, los reemplazos de las correcciones conocidas).
+            palabras_contexto: Palabras de contexto a cada lado de una sospechosa.
+        """
+        self.corrector_fonetico = corrector_fonetico or obtener_corrector_fonetico()
+        self.almacen = almacen
+        self.palabras_contexto = palabras_contexto
+        
+        textos = [canonico for canonico, _ in self.corrector_fonetico.lexico] + list(conocidas)
+        self.conocidas = PALABRAS_FRECUENTES | PRESTAMOS | {
+            palabra for texto in textos for palabra in PATRON_PALABRA.findall(texto.lower())
+        }
+    
+    @property
+    def version(self) -> str:
+        """Identificador de los léxicos y parámetros fijos (no del léxico aprendido)."""
+        campos = [sorted(self.conocidas), sorted(PARES_LETRAS), self.corrector_fonetico.version, self.palabras_contexto]
+        return hashlib.sha256(repr(campos).encode('utf-8')).hexdigest()[:12]
+    
+    def _sospechosas(self, texto: str, palabras: list) -> List[bool]:
+        """Marca de cada palabra del texto: True si es sospechosa."""
+        verificadas, erroneas = self.almacen.lexicos() if self.almacen is not None else (set(), set())
+        
+        en_etiqueta = set()
+        for etiqueta in PATRON_ETIQUETA.finditer(texto):
+            en_etiqueta.update(p.start() for p in PATRON_PALABRA.finditer(texto, *etiqueta.span()))
+        
+        def conocida(palabra: str) -> bool:
+            minusculas = palabra.lower()
+            return minusculas in self.conocidas or (minusculas in verificadas and minusculas not in erroneas)
+        
+        marcas = [False] * len(palabras)
+        for i, palabra in enumerate(p.group() for p in palabras):
+            if palabras[i].start() in en_etiqueta:
+                continue
+            if palabra.lower() in erroneas:
+                marcas[i] = True
+            elif (len(palabra) >= 3 and palabra.isalpha() and not palabra.isupper()
+                    and not conocida(palabra) and pares_raros(palabra.lower())):
+                marcas[i] = True
+        
+        indice_inicio = {p.start(): i for i, p in enumerate(palabras)}
+        indice_fin = {p.end(): i for i, p in enumerate(palabras)}
+        for inicio, fin, _ in self.corrector_fonetico.cercanos(texto, conocida):
+            if inicio in en_etiqueta:
+                continue
+            for i in range(indice_inicio[inicio], indice_fin[fin] + 1):
+                marcas[i] = True
+        return marcas
+    
+    def detectar(self, texto: str) -> List[Tramo]:
+        """
+        Tramos del texto con palabras sospechosas y su contexto.
+        
+        Args:
+            texto: Transcripción (ya precorregida).
+        
+        Returns:
+            Lista de tramos en orden, sin solaparse; vacía si no hay nada que revisar.
+        """
+        palabras = list(PATRON_PALABRA.finditer(texto))
+        marcas = self._sospechosas(texto, palabras)
+        
+        tramos: List[Tramo] = []
+        ultimo = -1  # índice de la última palabra del tramo anterior
+        for i, marcada in enumerate(marcas):
+            if not marcada:
+                continue
+            inicio_linea = texto.rfind('\n', 0, palabras[i].start())
+            fin_linea = texto.find('\n', palabras[i].end())
+            fin_linea = len(texto) if fin_linea == -1 else fin_linea
+            
+            desde, hasta = i, i
+            while desde > 0 and i - desde < self.palabras_contexto and palabras[desde - 1].start() > inicio_linea:
+                desde -= 1
+            while hasta + 1 < len(palabras) and hasta - i < self.palabras_contexto and palabras[hasta + 1].end() <= fin_linea:
+                hasta += 1
+            
+            inicio, fin = palabras[desde].start(), palabras[hasta].end()
+            if tramos and desde <= ultimo + 1 and '\n' not in texto[tramos[-1].fin:inicio]:
+                tramo = tramos[-1]
+                tramo.fin = max(tramo.fin, fin)
+                tramo.texto = texto[tramo.inicio:tramo.fin]
+            else:
+                tramo = Tramo(inicio, fin, texto[inicio:fin])
+                tramos.append(tramo)
+            if palabras[i].group() not in tramo.sospechosas:
+                tramo.sospechosas.append(palabras[i].group())
+            ultimo = max(ultimo, hasta)
+        return tramos
@@ -0,0 +1,110 @@
+"""
+División de transcripciones largas en fragmentos para procesarlos por separado.
+
+Los cortes se hacen, en orden de preferencia, al inicio de un turno de palabra,
+en un salto de línea, al final de una oración o en un espacio. Los fragmentos
+son contiguos y cubren todo el texto, de modo que al unir sus versiones
+procesadas se reconstruye el documento completo de forma determinista. Cada
+fragmento lleva además un contexto de solo lectura del texto vecino.
+"""
+import re
+from dataclasses import dataclass
+from typing import List
+
+
+# Inicio de un turno de palabra: "Entrevistador:", "Speaker 1:", "Ana María 00:12:"
+PATRON_TURNO = re.compile(
+    r'\n(?=[ \t]*(?:(?i:speaker|hablante|participante)\s*\d+'
+    r'|[A-ZÁÉÍÓÚÑ][\wáéíóúñ]*(?:[ \t]+[A-ZÁÉÍÓÚÑ][\wáéíóúñ]*){0,3})'
+    r'[ \t]*(?:\(?\d{1,2}:\d{2}(?::\d{2})?\)?)?[ \t]*:)'
+)
+PATRON_LINEA = re.compile(r'\n')
+PATRON_ORACION = re.compile(r'[.?!…][»")]?[ \t]+')
+PATRON_ESPACIO = re.compile(r'\s+')
+
+# De mayor a menor preferencia
+PATRONES_CORTE = [PATRON_TURNO, PATRON_LINEA, PATRON_ORACION, PATRON_ESPACIO]
+
+
+@dataclass
+class Fragmento:
+    """Tramo [inicio, fin) de un texto, con contexto vecino de solo lectura."""
+    inicio: int
+    fin: int
+    texto: str
+    contexto_previo: str = ""
+    contexto_siguiente: str = ""
+
+
+def _buscar_corte(texto: str, desde: int, hasta: int) -> int:
+    """
+    Última posición de corte en (desde, hasta], con el patrón de mayor
+    preferencia que tenga alguna coincidencia. Si ninguno la tiene, `hasta`.
+    """
+    for patron in PATRONES_CORTE:
+        corte = -1
+        for match in patron.finditer(texto, desde, hasta):
+            corte = match.end()
+        if corte > desde:
+            return corte
+    return hasta
+
+
+def fragmentar_texto(texto: str, max_caracteres: int, contexto_caracteres: int = 0) -> List[Fragmento]:
+    """
+    Divide un texto en fragmentos contiguos de hasta `max_caracteres`.
+    
+    Args:
+        texto: Texto a dividir.
+        max_caracteres: Tamaño máximo de cada fragmento.
+        contexto_caracteres: Caracteres de contexto a cada lado del fragmento.
+    
+    Returns:
+        Lista de fragmentos en orden; uno solo si el texto cabe entero.
+    """
+    fragmentos = []
+    inicio = 0
+    
+    while inicio < len(texto):
+        if len(texto) - inicio <= max_caracteres:
+            fin = len(texto)
+        else:
+            # No cortar en la primera mitad para no producir fragmentos diminutos
+            fin = _buscar_corte(texto, inicio + max_caracteres // 2, inicio + max_caracteres)
+        fragmentos.append(Fragmento(inicio, fin, texto[inicio:fin]))
+        inicio = fin
+    
+    if contexto_caracteres and len(fragmentos) > 1:
+        for fragmento in fragmentos:
+            previo = texto[max(0, fragmento.inicio - contexto_caracteres):fragmento.inicio]
+            siguiente = texto[fragmento.fin:fragmento.fin + contexto_caracteres]
+            # Recortar a palabras completas
+            if fragmento.inicio - contexto_caracteres > 0:
+                previo = previo.split(None, 1)[-1] if ' ' in previo else previo
+            if fragmento.fin + contexto_caracteres < len(texto):
+                siguiente = siguiente.rsplit(None, 1)[0] if ' ' in siguiente else siguiente
+            fragmento.contexto_previo = previo.strip()
+            fragmento.contexto_siguiente = siguiente.strip()
+    
+    return fragmentos
+
+
+def unir_fragmentos(fragmentos: List[Fragmento], textos_procesados: List[str]) -> str:
+    """
+    Reconstruye el documento con la versión procesada de cada fragmento,
+    conservando los espacios y saltos de línea originales de los bordes.
+    
+    Args:
+        fragmentos: Fragmentos devueltos por `fragmentar_texto`.
+        textos_procesados: Texto procesado de cada fragmento, en el mismo orden.
+    
+    Returns:
+        Texto completo.
+    """
+    partes = []
+    for fragmento, procesado in zip(fragmentos, textos_procesados):
+        original = fragmento.texto
+        espacio_inicial = original[:len(original) - len(original.lstrip())]
+        espacio_final = original[len(original.rstrip()):] if original.strip() else ""
+        partes.append(espacio_inicial + procesado.strip() + espacio_final)
+    return "".join(partes)
@@ -0,0 +1,75 @@
+"""
+Hechos extraídos de cada entrevista para la consolidación por hechos.
+
+El resultado del agente de hechos (ver consolidador/agente_hechos.py) se guarda
+en un archivo JSON por entrevista, con nombre
+`<huella del texto de la entrevista>-<versión del prompt>.json`. Una nueva
+consolidación solo extrae los hechos de las entrevistas nuevas o modificadas;
+si el prompt de extracción cambia, cambia la versión y se extraen de nuevo.
+"""
+import sys
+import os
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import HECHOS_ENTREVISTAS_DIR
+from utils.almacen_json import AlmacenPorContenido
+
+
+class AlmacenHechos(AlmacenPorContenido):
+    """Hechos por categoría de cada entrevista en disco, por texto y versión del prompt."""
+    
+    def __init__(self, directorio: str = HECHOS_ENTREVISTAS_DIR, habilitado: bool = True):
+        super().__init__(directorio, habilitado)
+    
+    def obtener(self, entrevista: str, version: str) -> Optional[Dict[str, List[str]]]:
+        """
+        Busca los hechos guardados de una entrevista.
+        
+        Args:
+            entrevista: Texto de la entrevista del que se extrajeron.
+            version: Versión del prompt de extracción.
+        
+        Returns:
+            Diccionario categoría -> hechos, o None si no existe o el almacén
+            está desactivado.
+        """
+        datos = self.leer(entrevista, version, ['hechos'])
+        return datos['hechos'] if datos is not None else None
+    
+    def guardar(self, entrevista: str, version: str, hechos: Dict[str, List[str]], nombre: str = None) -> None:
+        """
+        Guarda los hechos de una entrevista (escritura atómica).
+        
+        Args:
+            entrevista: Texto de la entrevista del que se extrajeron.
+            version: Versión del prompt de extracción.
+            hechos: Diccionario categoría -> hechos.
+            nombre: Nombre del entrevistado, solo informativo.
+        """
+        self.escribir(entrevista, version, {'nombre': nombre, 'hechos': hechos})
+    
+    def resumen(self) -> str:
+        """Línea de resumen con los contadores de la ejecución."""
+        if not self.habilitado:
+            return "Hechos de entrevistas: reutilización desactivada"
+        return f"Hechos de entrevistas: {self.reutilizados} reutilizados, {self.nuevos} extraídos ({self.directorio})"
+
+
+def obtener_almacen_hechos() -> AlmacenHechos:
+    """Retorna el almacén de hechos compartido del proceso."""
+    return AlmacenHechos.compartido()
+
+
+def configurar_almacen_hechos(habilitado: bool) -> AlmacenHechos:
+    """
+    Activa o desactiva la reutilización de hechos extraídos (opción --sin-cache).
+    
+    Args:
+        habilitado: Si False, no se lee ni se escribe en el almacén.
+    
+    Returns:
+        El almacén compartido.
+    """
+    return AlmacenHechos.configurar_compartido(habilitado)
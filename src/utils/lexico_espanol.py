@@ -0,0 +1,144 @@
+"""
+Léxico compacto del español para el detector de tramos sospechosos.
+
+- PALABRAS_FRECUENTES: palabras frecuentes del español hablado y del
+  vocabulario de las entrevistas (investigación, universidad, computación).
+- PRESTAMOS: préstamos del inglés habituales en las entrevistas y muletillas;
+  se aceptan como conocidos pero no cuentan para los pares de letras.
+- PARES_LETRAS: pares de letras consecutivas (sin tildes; "^" y "$" marcan
+  el inicio y el fin de palabra) que aparecen en palabras del español,
+  tomados de PALABRAS_FRECUENTES y de un corpus de texto en español. Una
+  palabra con algún par fuera de la tabla ("Nike": "ik", "ke") probablemente
+  es un nombre extranjero o un error de transcripción.
+"""
+
+PALABRAS_FRECUENTES = frozenset("""
+a abajo abierta abierto abrir absolutamente acá académica académico académicos acceso
+acción acciones acerca actividad actividades actual actualmente acuerdo adecuado
+adelante además administración administrativo adquirir afuera agosto agricultura agua
+ahí ahora ahorita aire al alcance algo alguien algún alguna algunas alguno algunos allá
+allí alrededor alta alto altos alumno alumnos ambiental ambiente amigo amigos análisis
+año años ante anterior anteriormente antes antiguo aparece aparte apenas aplicación
+aplicaciones aplicada aplicado aplicamos aplicar aporte aportes apoyamos apoyo aprender
+aprendimos aprendizaje aprobado aprovechar aproximadamente aquel aquella aquellas
+aquello aquellos aquí área áreas arriba artículo artículos artificial así asignatura
+asignaturas aspecto aspectos atención atrás aumentar aunque automática automático
+automatización avance avances ayer ayuda ayudar bajar bajo barato base básica básico
+bastante beneficio beneficios biblioteca bien bolsa bosque brindar buen buena buenas
+bueno buenos buscamos buscar búsqueda cabeza cabo cada calidad calle cámara cámaras
+cambiar cambio cambios caminar camino campo campos cantidad capacidad capacidades
+capacitación capaz característica características caracterización cargo carrera carreras
+carro casi caso casos causa centro centros cerca cien ciencia ciencias científica
+científico cierta ciertas cierto ciertos cinco ciudad civil claro clase clases
+clasificación cliente clima código colaboración colegas colegio colombia colombiana
+colombiano comenzamos comenzar comercial como cómo compañero compañeros complejo
+completo compramos comprar computación computacional computador computadora computadores
+computo cómputo común comunidad con concepto conceptos condiciones conectar conexión
+conferencia congreso conjunto conocer conocido conocimiento conocimientos consecuencia
+conseguimos construcción construir consumo contamos contar contenido contexto continuar
+contra contrato control convenio convenios convertir convocatoria convocatorias correcto
+correo corto cosa cosas costo costos costoso creamos crear crecimiento crédito creo cual
+cuál cuales cuáles cualquier cuando cuándo cuanta cuánta cuantas cuántas cuanto cuánto
+cuantos cuántos cuatro cuenca cuenta cuerpo cuestión cuidado cultivo cultivos cultura
+curso cursos daño dato datos de debe debemos deben debido decimos decir decisión
+decisiones dedicado dedicamos defensa definir del demanda demás demasiado dentro
+departamento depende derecho desafortunadamente desarrollar desarrollo desarrollos
+descargar desde después detalle detalles detección día días dicen diez diferente
+diferentes difícil dificultad dificultades digamos digital digo dijo dinero dirección
+directamente director directora disco discos discusión diseño disponible distinto doce
+docente docentes doctorado documentación documento documentos donde dónde dos doy dueño
+durante e economía edad edificio educación efecto eficiencia eficiente ejemplo ejemplos
+el él eléctrica eléctrico electrónica electrónico elemento elementos ella ellas ellos
+embargo empezamos empezó empresa empresas en encima encontrar encuentro energía enfoque
+enseñanza entidad entidades entiendo entonces entorno entrada entre entrenamiento
+entrenamos entrenar entrevista entrevistada entrevistado entrevistador entrevistadora
+envío equipo equipos era eran error errores es esa esas escala escribir escrito escuela
+ese eso esos espacio especial especie especies específica específico esta está estaba
+estaban estación estaciones estadística estado estados estamos están estar estas este
+esto estos estoy estrategia estructura estudiamos estudiante estudiantes estudio
+estudios estuve estuvo ética evaluación evento eventos evidencia exactamente exacto
+existe existen existente experiencia experimento experimentos explicar externo fácil
+fácilmente facultad falla fallas falta familia favor fecha fenómeno final finalmente
+financiación financiamiento física fondo fondos forma formación formas fortalecer fotos
+fue fuente fuentes fueron fuerte fui función funciona funcionamiento funcionan funcionar
+futuro ganamos ganar generación general generamos generar gente gestión gobierno gracias
+grado gráfica gráficas gran grande grandes grupo grupos guía gustaría gusto ha había
+habían habla hablamos hablando hablar hace hacemos hacen hacer hacia hacía haciendo hago
+hallazgo han hasta hay he hecho hemos hermano herramienta herramientas hice hijo hijos
+historia hizo hora horas hoy humano humanos idea ideas identificar igual igualmente
+imagen imágenes impacto implementación implementamos implementar importancia importante
+importantes incluso indicador industria información infraestructura ingeniería ingeniero
+ingenieros ingreso iniciativa inicio instalación instalar institución institucional
+instituciones integración inteligencia intención intentamos interés interesante interna
+internacional interno investigación investigaciones investigador investigadores
+investigar jefe joven jóvenes juego juegos junto la laboratorio laboratorios lado largo
+las le lectura lenguaje lenguajes les ley libre libro libros licencia licencias
+limitación limitaciones limitado límite línea líneas listo llamado llegamos llegar
+llevamos llevar lo local logramos lograr los lugar madre maestría mal mañana manejo
+manera mano mantener mantenimiento máquina máquinas marca más materia materias mayor
+mayoría me medicina medición mediciones medida medidas medio medios mejor mejorar
+memoria mencionó mercado mes mesa meses meta método métodos mi mí mientras mil millón
+millones miramos mis misma mismas mismo mismos mitad modelo modelos momento monitoreo
+montamos mostrar motivo movimiento mucha muchas mucho muchos muestra muestras mujer
+mujeres mundo muy nacional nada nadie natural necesario necesidad necesidades
+necesitamos necesitan necesitar necesito negocio negocios ni ningún ninguna ninguno
+nivel niveles no noche nombre normal normalmente nos nosotras nosotros nota noticia nube
+nuestra nuestras nuestro nuestros nueva nuevas nueve nuevo nuevos número nunca o
+objetivo objetivos obra obras obtener obviamente ocasiones ocho ojo once operación
+opinión oportunidad oportunidades orden organización otra otras otro otros padre pagar
+página país países para parece parte partes pasa pasado paso pasó pensamos pensar
+pequeña pequeño pequeños percepción perder pérdida pereira perfecto período permite
+permitir pero persona personas perspectiva pesado pienso piso plan planes planta plantas
+plataforma plataformas población pobre poca pocas poco pocos podemos poder podría
+podríamos política políticas pongo por porque porqué posgrado posibilidad posibilidades
+posible potencia práctica prácticas precio precisión pregrado pregunta preguntas prensa
+presentar presupuesto primer primera primero primeros principal privada privado problema
+problemas procesamiento proceso procesos producción producto productos profesor
+profesora profesores profundo programa programación programas promedio propia propio
+propuesta propuestas protección proyecto proyectos prueba pruebas pública publicación
+publicaciones público públicos puede pueden puedo pues punto puntos que qué queremos
+quería quien quién quienes quiere quieren quiero química quisiera quizás rápido raro
+razón real realidad realizamos realmente recibir reciente recolección reconocimiento
+recurso recursos red redes reducir región regional regla reglas relación respecto
+respuesta resultado resultados reunión reuniones revisar revista revistas riesgo
+risaralda ruido sabe sabemos saber salida salir salud se sé sea sean sector sectores
+seguimos seguir según segundo seguridad seguro seis semana semanas semestre semillero
+semilleros señal señales sencillo sensor sensores sentido sentimos sentir ser sería
+serían serie servicio servicios servidor servidores servir sesión si sí siempre siento
+siete sigue siguiente simple simulación sin sino sistema sistemas sitio situación sobre
+social sociales sociedad solamente solicitud solo sólo solución soluciones somos son soy
+su suele suelo suerte suficiente sujeto sus suya suyo tamaño también tampoco tan tanta
+tantas tanto tantos tarde tarea tareas tarjeta tarjetas te técnica técnicas técnico
+técnicos tecnología tecnologías tecnológica tecnológico tema temas temprano tendría
+tenemos tener tengo tenía teníamos teoría tercero término términos tesis texto tiempo
+tiene tienen tienes tierra tipo tipos titulo título toca tocaría toda todas todavía todo
+todos tomar total trabaja trabajamos trabajan trabajando trabajar trabajo trabajos
+tradicional transcripción tras tratamiento tratamos través treinta tres tu tú tus u
+último un una unas única único unidad unidades universidad universidades uno unos usamos
+usan usando usar uso usos usted ustedes usuario usuarios utilizamos utilizando utilizar
+utp va vale valor valores vamos van variable variables varias varios veces veinte
+velocidad vemos venta ventaja ventajas veo ver verdad versión vez vía vida video videos
+viene vienen vimos visión visto vivir voz y ya yo
+""".split())
+
+PRESTAMOS = frozenset("""
+amazon app apps big chatbot chatbots cloud cluster clusters data deep eh ehh email
+framework frameworks github google hardware internet kit kits learning link links
+linux machine microsoft mmm nvidia online open paper papers software source startup
+startups teams web windows zoom
+""".split())
+
+PARES_LETRAS = frozenset("""
+^a ^b ^c ^d ^e ^f ^g ^h ^i ^j ^k ^l ^m ^n ^o ^p ^q ^r ^s ^t ^u ^v ^y ^z a$ ab ac ad
+ae af ag ah ai aj al am an ao ap aq ar as at au av ax ay az b$ ba be bi bj bl bm bo
+br bs bt bu bv by c$ ca cc ce ch ci cl cn co cr ct cu d$ da de dh di dm do dr du dy
+e$ ea eb ec ed ee ef eg eh ei ej el em en eo ep eq er es et eu ev ex ey ez fa fe fi
+fl fo fr fu ga ge gi gl gm gn go gr gu ha he hi ho hu i$ ia ib ic id ie if ig ij il
+im in io ip iq ir is it iu iv ix iz j$ ja je ji jo ju ka ki l$ la lb lc ld le lf lg
+li ll lm lo ls lt lu lv lz m$ ma mb me mi mn mo mp mu n$ na nc nd ne nf ng nh ni nl
+nm nn no nq ns nt nu nv nz o$ oa ob oc od oe of og oh oi oj ol om on oo op oq or os
+ot ov ox oy oz pa pc pe pi pl po pr ps pt pu qu r$ ra rb rc rd re rf rg ri rj rl rm
+rn ro rp rq rr rs rt ru rv rz s$ sa sb sc sd se sf sg sh si sl sm so sp sq st su sv
+t$ ta te ti tl tm to tr tu u$ ua ub uc ud ue uf ug uh ui uj ul um un up ur us ut uv
+uy uz va ve vi vo vu x$ xa xc xe xh xi xo xp xt y$ ya ye yo yu z$ za zc ze zo
+""".split())
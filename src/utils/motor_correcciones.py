@@ -0,0 +1,223 @@
+"""
+Motor compilado para aplicar una tabla de correcciones (patrón, reemplazo)
+en una sola pasada sobre el texto.
+
+Las reglas de la forma `\\bclave\\b` o `\\bclave\\b(?=.*palabra)` (clave
+literal, con la condición opcional de que `palabra` aparezca después en la
+misma línea) se combinan en una única expresión, y las condiciones se evalúan buscando
+la siguiente aparición de cada palabra, recordada entre coincidencias para
+no volver a recorrer el texto. El resultado es el
+de aplicar las reglas una a una con `re.sub(..., flags=re.IGNORECASE)` en el
+orden de la tabla: si dos coincidencias se solapan, gana la regla anterior.
+Si alguna regla tiene otra forma, o una regla podría actuar sobre el
+reemplazo de otra anterior (ver `_encadenadas`), el orden secuencial importa
+y la tabla se aplica regla por regla, como antes.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+
+# \bclave\b con condición opcional (?=.*palabra); clave y palabra literales
+# (sin metacaracteres, o escapados como los deja re.escape)
+PATRON_REGLA = re.compile(
+    r'^\\b((?:[^\\()\[\]{}.*+?|^$]|\\\W)+)\\b(?:\(\?=\.\*((?:[^\\()\[\]{}.*+?|^$]|\\\W)+)\))?$'
+)
+
+
+def _es_limite(texto: str, posicion: int) -> bool:
+    """True si hay un límite de palabra (\\b) en `posicion`."""
+    antes = posicion > 0 and (texto[posicion - 1].isalnum() or texto[posicion - 1] == '_')
+    despues = posicion < len(texto) and (texto[posicion].isalnum() or texto[posicion] == '_')
+    return antes != despues
+
+
+class MotorCorrecciones:
+    """Tabla de correcciones compilada para aplicarse en una sola pasada."""
+    
+    def __init__(self, reglas: List[Tuple[str, str]]):
+        """
+        Args:
+            reglas: Pares (patrón, reemplazo) en orden de prioridad.
+        """
+        self.reglas = list(reglas)
+        self._por_clave: Dict[str, list] = {}   # clave en minúsculas -> [(prioridad, condición, reemplazo)]
+        self._generales = []                    # reglas a aplicar una a una: (prioridad, patrón compilado, reemplazo)
+        
+        literales = {}
+        for prioridad, (patron, reemplazo) in enumerate(self.reglas):
+            match = PATRON_REGLA.match(patron)
+            if match:
+                clave, condicion = (re.sub(r'\\(.)', r'\1', g or '').lower() for g in match.groups())
+                literales[prioridad] = (clave, condicion or None)
+        secuencial = len(literales) < len(self.reglas) or self._encadenadas(literales)
+        
+        for prioridad, (patron, reemplazo) in enumerate(self.reglas):
+            if secuencial:
+                self._generales.append((prioridad, re.compile(patron, re.IGNORECASE), reemplazo))
+                continue
+            clave, condicion = literales[prioridad]
+            self._por_clave.setdefault(clave, []).append((prioridad, condicion, reemplazo))
+        
+        # Claves más cortas que empiezan en la misma posición que otra (ej: "grupo" y "grupo nike")
+        self._prefijos = {
+            clave: [p for p in self._por_clave if p != clave and clave.startswith(p) and _es_limite(clave, len(p))]
+            for clave in self._por_clave
+        }
+        # Inicios de palabra dentro de cada clave, donde puede empezar otra clave solapada
+        self._inicios_internos = {
+            clave: [i for i in range(1, len(clave)) if _es_limite(clave, i) and (clave[i].isalnum() or clave[i] == '_')]
+            for clave in self._por_clave
+        }
+        
+        # Una sola expresión con todas las claves (la más larga primero en cada posición),
+        # precedida de un filtro por la primera letra para descartar rápido el resto.
+        # Se busca sobre el texto en minúsculas; con IGNORECASE sobre el original solo
+        # si pasarlo a minúsculas cambia su longitud (algunos caracteres Unicode).
+        claves = sorted(self._por_clave, key=len, reverse=True)
+        alternativas = '|'.join(map(re.escape, claves))
+        primeras = ''.join(sorted({c[0] for c in claves}))
+        self._patron_claves = re.compile(
+            rf'(?=[{re.escape(primeras)}])\b({alternativas})\b'
+        ) if claves else None
+        self._patron_claves_original = re.compile(
+            rf'(?=[{re.escape(primeras + primeras.upper())}])\b({alternativas})\b', re.IGNORECASE
+        ) if claves else None
+        condiciones = {c for opciones in self._por_clave.values() for _, c, _ in opciones if c}
+        self._patrones_condicion = {c: re.compile(re.escape(c), re.IGNORECASE) for c in condiciones}
+    
+    def _encadenadas(self, literales: dict) -> bool:
+        """
+        True si el reemplazo de una regla puede crear o deshacer una coincidencia
+        de una regla posterior: la clave posterior cabe en el reemplazo (y lo
+        cambiaría), o se solapa con su inicio o su final; o el reemplazo añade o
+        quita una palabra de condición de la regla posterior.
+        """
+        for i, (patron, reemplazo) in enumerate(self.reglas):
+            palabras_reemplazo = re.findall(r'\w+', reemplazo.lower())
+            original = literales[i][0]
+            for j in range(i + 1, len(self.reglas)):
+                clave, condicion = literales[j]
+                if condicion and (condicion in reemplazo.lower()) != (condicion in original):
+                    return True
+                
+                palabras_clave = re.findall(r'\w+', clave)
+                n, m = len(palabras_reemplazo), len(palabras_clave)
+                dentro = any(palabras_reemplazo[k:k + m] == palabras_clave for k in range(n - m + 1))
+                if dentro and re.sub(rf'\b{re.escape(clave)}\b', self.reglas[j][1], reemplazo, flags=re.IGNORECASE) != reemplazo:
+                    return True
+                # Clave que empieza o termina dentro del reemplazo, o lo contiene
+                for k in range(1, min(n, m) + 1):
+                    if (k < m and palabras_reemplazo[n - k:] == palabras_clave[:k]) or \
+                       (k < m and palabras_clave[m - k:] == palabras_reemplazo[:k]):
+                        return True
+                if m > n and any(palabras_clave[k:k + n] == palabras_reemplazo for k in range(m - n + 1)):
+                    return True
+        return False
+    
+    def _coincidencias(self, texto: str, patron: re.Pattern):
+        """
+        Todas las coincidencias de claves, incluidas las que se solapan con
+        otra: (inicio, clave), por cada clave que empieza en cada posición.
+        """
+        for match in patron.finditer(texto):
+            pendientes = [match]
+            while pendientes:
+                actual = pendientes.pop()
+                clave = actual.group(1).lower()
+                inicio = actual.start(1)
+                yield inicio, clave
+                for prefijo in self._prefijos[clave]:
+                    yield inicio, prefijo
+                for desplazamiento in self._inicios_internos[clave]:
+                    interna = patron.match(texto, inicio + desplazamiento)
+                    if interna:
+                        pendientes.append(interna)
+    
+    def aplicar(self, texto: str) -> Tuple[str, List[str]]:
+        """
+        Aplica las correcciones.
+        
+        Args:
+            texto: Texto a corregir.
+        
+        Returns:
+            Tupla (texto_corregido, lista_correcciones) con una línea
+            "- patrón → reemplazo" por cada regla que modificó el texto,
+            en el orden de la tabla.
+        """
+        aplicadas = set()
+        
+        if self._patron_claves is not None:
+            minusculas = texto.lower()
+            if len(minusculas) == len(texto):
+                busqueda, patron = minusculas, self._patron_claves
+            else:
+                busqueda, patron = texto, self._patron_claves_original
+            
+            # Siguiente aparición de cada condición y del salto de línea, memorizada
+            # como (desde, posición) para no volver a recorrer el mismo tramo
+            siguientes = {}
+            
+            def siguiente(clave: str, buscar, desde: int) -> int:
+                memoria = siguientes.get(clave)
+                if memoria and memoria[0] <= desde and (memoria[1] == -1 or desde <= memoria[1]):
+                    return memoria[1]
+                posicion = buscar(desde)
+                siguientes[clave] = (desde, posicion)
+                return posicion
+            
+            def cumple(condicion: str, fin: int) -> bool:
+                """La condición aparece a partir de `fin` y antes del fin de la línea."""
+                def buscar(desde):
+                    if busqueda is minusculas:
+                        return minusculas.find(condicion, desde)
+                    match = self._patrones_condicion[condicion].search(texto, desde)
+                    return match.start() if match else -1
+                posicion = siguiente(condicion, buscar, fin)
+                if posicion == -1:
+                    return False
+                salto = siguiente('\n', lambda desde: texto.find('\n', desde), fin)
+                return salto == -1 or posicion < salto
+            
+            # Candidatos: (prioridad, inicio, fin, reemplazo) de la primera regla aplicable de cada clave
+            candidatos = []
+            for inicio, clave in self._coincidencias(busqueda, patron):
+                fin = inicio + len(clave)
+                for prioridad, condicion, reemplazo in self._por_clave[clave]:
+                    if condicion is None or cumple(condicion, fin):
+                        candidatos.append((prioridad, inicio, fin, reemplazo))
+                        break
+            
+            # Las reglas anteriores en la tabla reservan su tramo primero
+            ocupado = bytearray(len(texto))
+            elegidos = []
+            for prioridad, inicio, fin, reemplazo in sorted(candidatos):
+                if any(ocupado[inicio:fin]):
+                    continue
+                ocupado[inicio:fin] = b'\x01' * (fin - inicio)
+                elegidos.append((inicio, fin, reemplazo, prioridad))
+            
+            partes = []
+            posicion = 0
+            for inicio, fin, reemplazo, prioridad in sorted(elegidos):
+                if texto[inicio:fin] != reemplazo:
+                    aplicadas.add(prioridad)
+                partes.append(texto[posicion:inicio])
+                partes.append(reemplazo)
+                posicion = fin
+            partes.append(texto[posicion:])
+            texto = "".join(partes)
+        
+        for prioridad, patron, reemplazo in self._generales:
+            texto, n = patron.subn(reemplazo, texto)
+            if n:
+                aplicadas.add(prioridad)
+        
+        return texto, [f"- {self.reglas[p][0]} → {self.reglas[p][1]}" for p in sorted(aplicadas)]
+
+
+@lru_cache(maxsize=None)
+def obtener_motor(reglas: Tuple[Tuple[str, str], ...]) -> MotorCorrecciones:
+    """Motor compilado de una tabla de reglas (se compila una vez por tabla)."""
+    return MotorCorrecciones(list(reglas))
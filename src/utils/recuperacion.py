@@ -0,0 +1,198 @@
+"""
+Recuperación local de pasajes de una transcripción con BM25.
+
+La transcripción se divide en pasajes (un turno de palabra, o partes de un
+turno largo cortadas al final de una oración) y se indexa una vez en memoria:
+por cada término, la lista de pasajes donde aparece y su frecuencia, en
+arreglos compactos (`array`). Cada agente de sección que declara una consulta
+(`consulta_recuperacion`) recibe solo los pasajes con mayor puntaje BM25 que
+caben en un presupuesto de tokens, en el orden original de la transcripción.
+
+Los términos se comparan en minúsculas, sin tildes, sin palabras vacías y
+reducidos a una raíz aproximada: sin su terminación más común y truncados a sus
+primeras letras ("motivación", "motiva" y "motivados" son el mismo término). No usa red ni azar: la misma transcripción y consulta dan
+siempre los mismos pasajes.
+"""
+import sys
+import os
+import math
+import re
+import unicodedata
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import RECUPERACION_CARACTERES_PASAJE
+from utils.turnos import IndiceTurnos
+from utils.fragmentador import fragmentar_texto
+
+PATRON_PALABRA = re.compile(r'[^\W\d_]+')
+
+PALABRAS_VACIAS = frozenset("""
+a al algo algun alguna algunas alguno algunos ante antes aqui asi aun bien cada como con contra cual
+cuales cuando de del desde donde dos el ella ellas ello ellos en entonces entre era eran es esa esas
+ese eso esos esta estaba estamos estan estar estas este esto estos fue fueron ha habia han hasta hay
+la las le les lo los mas me mi mis mucho muy nada ni no nos nosotros o otra otras otro otros para pero
+poco por porque que quien se sea ser si sin sobre son su sus tambien tan tanto te tenemos tener tiene
+tienen todo todos tu un una unas uno unos usted ustedes va vamos y ya yo eh bueno pues digamos osea
+""".split())
+
+# Terminaciones que se quitan para aproximar la raíz, de la más larga a la más corta
+# ("motivación", "motiva" y "motivados" -> "motiv"), si quedan al menos 4 letras
+SUFIJOS = sorted("""
+aciones iciones amientos imientos amiento imiento mente acion icion ciones cion idades
+idad ables ibles able ible ando iendo ados idos adas idas ado ido ada ida ar er ir os as es o a e s
+""".split(), key=len, reverse=True)
+MINIMO_RAIZ = 4
+
+# Letras con que se compara cada término
+LONGITUD_RAIZ = 6
+
+# Parámetros de BM25
+K1 = 1.5
+B = 0.75
+
+
+@lru_cache(maxsize=65536)
+def _raiz(palabra: str) -> Optional[str]:
+    descompuesto = unicodedata.normalize('NFD', palabra.lower())
+    palabra = ''.join(c for c in descompuesto if not unicodedata.combining(c))
+    if len(palabra) < 3 or palabra in PALABRAS_VACIAS:
+        return None
+    for sufijo in SUFIJOS:
+        if palabra.endswith(sufijo) and len(palabra) - len(sufijo) >= MINIMO_RAIZ:
+            palabra = palabra[:-len(sufijo)]
+            break
+    return palabra[:LONGITUD_RAIZ]
+
+
+def terminos(texto: str) -> List[str]:
+    """Términos indexables de un texto, en orden."""
+    return [r for r in map(_raiz, PATRON_PALABRA.findall(texto)) if r]
+
+
+@dataclass
+class Pasaje:
+    """Pasaje [inicio, fin) del texto, dentro del turno `turno` (-1: antes del primer turno)."""
+    inicio: int
+    fin: int
+    turno: int
+    tokens: int
+
+
+class IndiceBM25:
+    """Índice BM25 de los pasajes de una transcripción, compartido por todos sus agentes."""
+    
+    def __init__(
+        self,
+        indice_turnos: IndiceTurnos,
+        contar_tokens: Callable[[str], int] = None,
+        caracteres_pasaje: int = RECUPERACION_CARACTERES_PASAJE
+    ):
+        """
+        Args:
+            indice_turnos: Índice de turnos de la transcripción.
+            contar_tokens: Función que estima los tokens de un texto. Por
+                     defecto, un token cada 4 caracteres.
+            caracteres_pasaje: Tamaño máximo de un pasaje; los turnos más
+                     largos se dividen.
+        """
+        self.indice_turnos = indice_turnos
+        texto = indice_turnos.texto
+        contar_tokens = contar_tokens or (lambda t: math.ceil(len(t) / 4))
+        
+        tramos = [(t.inicio, t.fin, i) for i, t in enumerate(indice_turnos.turnos)]
+        inicio_turnos = tramos[0][0] if tramos else len(texto)
+        if inicio_turnos > 0:
+            tramos.insert(0, (0, inicio_turnos, -1))
+        
+        self.pasajes: List[Pasaje] = []
+        for inicio, fin, turno in tramos:
+            for fragmento in fragmentar_texto(texto[inicio:fin], caracteres_pasaje):
+                a, b = inicio + fragmento.inicio, inicio + fragmento.fin
+                self.pasajes.append(Pasaje(a, b, turno, contar_tokens(texto[a:b])))
+        
+        # término -> (pasajes donde aparece, frecuencia en cada uno)
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._longitudes = array('f')
+        for id_pasaje, pasaje in enumerate(self.pasajes):
+            frecuencias = Counter(terminos(texto[pasaje.inicio:pasaje.fin]))
+            self._longitudes.append(sum(frecuencias.values()))
+            for termino, frecuencia in frecuencias.items():
+                ids, tfs = self._postings.setdefault(termino, (array('i'), array('f')))
+                ids.append(id_pasaje)
+                tfs.append(frecuencia)
+        self._longitud_media = (sum(self._longitudes) / len(self._longitudes) if self._longitudes else 0) or 1.0
+    
+    def puntuar(self, consulta: str) -> List[float]:
+        """Puntaje BM25 de cada pasaje para la consulta."""
+        n = len(self.pasajes)
+        puntajes = [0.0] * n
+        for termino in dict.fromkeys(terminos(consulta)):
+            postings = self._postings.get(termino)
+            if postings is None:
+                continue
+            ids, tfs = postings
+            idf = math.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+            for id_pasaje, tf in zip(ids, tfs):
+                normalizacion = K1 * (1 - B + B * self._longitudes[id_pasaje] / self._longitud_media)
+                puntajes[id_pasaje] += idf * tf * (K1 + 1) / (tf + normalizacion)
+        return puntajes
+    
+    def recuperar(
+        self,
+        consulta: str,
+        presupuesto_tokens: int,
+        max_pasajes: int = 0,
+        incluye: Callable[[Pasaje], bool] = None
+    ) -> Optional[List[Pasaje]]:
+        """
+        Pasajes más relevantes para la consulta que caben en el presupuesto.
+        
+        Args:
+            consulta: Términos de búsqueda del agente.
+            presupuesto_tokens: Tokens máximos de los pasajes elegidos.
+            max_pasajes: Máximo de pasajes (0 = sin límite).
+            incluye: Filtro de pasajes candidatos (ej: vista y bloques del agente).
+        
+        Returns:
+            Pasajes en el orden de la transcripción, o None si los candidatos
+            caben enteros en el presupuesto o ninguno es relevante (usar el
+            texto sin recuperación).
+        """
+        candidatos = [i for i, p in enumerate(self.pasajes) if incluye is None or incluye(p)]
+        if sum(self.pasajes[i].tokens for i in candidatos) <= presupuesto_tokens:
+            return None
+        
+        puntajes = self.puntuar(consulta)
+        elegidos = []
+        usados = 0
+        for i in sorted((i for i in candidatos if puntajes[i] > 0), key=lambda i: (-puntajes[i], i)):
+            if max_pasajes and len(elegidos) >= max_pasajes:
+                break
+            if usados + self.pasajes[i].tokens > presupuesto_tokens:
+                continue
+            elegidos.append(i)
+            usados += self.pasajes[i].tokens
+        
+        if not elegidos:
+            return None
+        return [self.pasajes[i] for i in sorted(elegidos)]
+    
+    def texto(self, pasajes: List[Pasaje]) -> str:
+        """Texto de los pasajes en orden, con "[...]" donde se omitió texto."""
+        texto = self.indice_turnos.texto
+        partes = []
+        fin_anterior = 0
+        for pasaje in pasajes:
+            if pasaje.inicio > fin_anterior:
+                partes.append("[...]\n")
+            partes.append(texto[pasaje.inicio:pasaje.fin])
+            fin_anterior = pasaje.fin
+        if fin_anterior < len(texto):
+            partes.append("\n[...]")
+        return "".join(partes)
@@ -0,0 +1,81 @@
+"""
+Secciones de los reportes individuales, guardadas para el consolidador.
+
+main.py guarda junto a los PDF de cada entrevistado un archivo `secciones.json`
+con las siete secciones del reporte detallado en Markdown (ver
+AgenteIntegrador) y la huella de la transcripción de la que salieron. El
+consolidador puede partir de ellas (consolidador_main.py --desde-reportes) en
+lugar de las transcripciones: el texto es varias veces más corto y ya está
+corregido, así que no necesita la fase de corrección.
+"""
+import sys
+import os
+import json
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.almacen_json import escribir_json_atomico, huella_texto
+
+ARCHIVO_SECCIONES = "secciones.json"
+
+
+def guardar_secciones(carpeta: str, nombre: str, secciones: Dict[str, str], transcripcion: str) -> str:
+    """
+    Guarda las secciones del reporte detallado de una entrevista (escritura atómica).
+    
+    Args:
+        carpeta: Carpeta de los reportes del entrevistado.
+        nombre: Nombre del entrevistado.
+        secciones: Título -> Markdown de cada sección, en el orden del reporte.
+        transcripcion: Texto original de la transcripción procesada.
+    
+    Returns:
+        Ruta del archivo guardado.
+    """
+    os.makedirs(carpeta, exist_ok=True)
+    ruta = os.path.join(carpeta, ARCHIVO_SECCIONES)
+    datos = {
+        'nombre': nombre,
+        'huella_transcripcion': huella_texto(transcripcion),
+        'secciones': secciones,
+    }
+    escribir_json_atomico(ruta, datos)
+    return ruta
+
+
+def cargar_secciones(directorio: str) -> List[dict]:
+    """
+    Secciones guardadas de todos los reportes individuales de un directorio.
+    
+    Args:
+        directorio: Directorio de salida de main.py (una carpeta por entrevistado).
+    
+    Returns:
+        Diccionarios con 'nombre', 'huella_transcripcion' y 'secciones', en
+        orden alfabético de carpeta. Los archivos ilegibles se omiten con un aviso.
+    """
+    if not os.path.isdir(directorio):
+        return []
+    
+    reportes = []
+    for carpeta in sorted(os.listdir(directorio)):
+        ruta = os.path.join(directorio, carpeta, ARCHIVO_SECCIONES)
+        if not os.path.isfile(ruta):
+            continue
+        try:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+            datos['nombre'] = datos.get('nombre') or carpeta
+            if not isinstance(datos['secciones'], dict):
+                raise ValueError("'secciones' no es un objeto")
+        except (OSError, ValueError, KeyError) as e:
+            print(f"  ⚠ Se omite {ruta}: {e}")
+            continue
+        reportes.append(datos)
+    return reportes
+
+
+def texto_secciones(reporte: dict) -> str:
+    """Markdown de las secciones de un reporte individual, en orden."""
+    return "\n\n".join(contenido.strip() for contenido in reporte['secciones'].values() if contenido.strip())
@@ -0,0 +1,78 @@
+"""
+Transcripciones corregidas guardadas junto a los reportes.
+
+El resultado del agente de corrección se guarda en un archivo JSON por
+transcripción, con nombre `<huella del texto original>-<versión del prompt>.json`.
+Cualquier punto de entrada (main.py, el consolidador) que vuelva a corregir
+el mismo archivo con el mismo prompt de corrección reutiliza el resultado sin
+llamar al LLM. Si el prompt cambia, cambia la versión y se corrige de nuevo.
+"""
+import sys
+import os
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import TRANSCRIPCIONES_CORREGIDAS_DIR
+from utils.almacen_json import AlmacenPorContenido
+
+
+class AlmacenTranscripcionesCorregidas(AlmacenPorContenido):
+    """Resultados del agente de corrección en disco, por texto original y versión del prompt."""
+    
+    def __init__(self, directorio: str = TRANSCRIPCIONES_CORREGIDAS_DIR, habilitado: bool = True):
+        super().__init__(directorio, habilitado)
+    
+    def obtener(self, transcripcion: str, version: str) -> Optional[dict]:
+        """
+        Busca la corrección guardada de una transcripción.
+        
+        Args:
+            transcripcion: Texto original (sin corregir).
+            version: Versión del prompt de corrección.
+        
+        Returns:
+            Diccionario con 'texto_corregido' y 'correcciones', o None si no
+            existe o el almacén está desactivado.
+        """
+        return self.leer(transcripcion, version, ['texto_corregido', 'correcciones'])
+    
+    def guardar(self, transcripcion: str, version: str, resultado: dict, nombre: str = None) -> None:
+        """
+        Guarda la corrección de una transcripción (escritura atómica).
+        
+        Args:
+            transcripcion: Texto original (sin corregir).
+            version: Versión del prompt de corrección.
+            resultado: Diccionario con 'texto_corregido' y 'correcciones'.
+            nombre: Nombre del entrevistado, solo informativo.
+        """
+        self.escribir(transcripcion, version, {
+            'nombre': nombre,
+            'texto_corregido': resultado['texto_corregido'],
+            'correcciones': resultado['correcciones'],
+        })
+    
+    def resumen(self) -> str:
+        """Línea de resumen con los contadores de la ejecución."""
+        if not self.habilitado:
+            return "Transcripciones corregidas: reutilización desactivada"
+        return f"Transcripciones corregidas: {self.reutilizados} reutilizadas, {self.nuevos} nuevas ({self.directorio})"
+
+
+def obtener_transcripciones_corregidas() -> AlmacenTranscripcionesCorregidas:
+    """Retorna el almacén de transcripciones corregidas compartido del proceso."""
+    return AlmacenTranscripcionesCorregidas.compartido()
+
+
+def configurar_transcripciones_corregidas(habilitado: bool) -> AlmacenTranscripcionesCorregidas:
+    """
+    Activa o desactiva la reutilización de transcripciones corregidas (opción --sin-cache).
+    
+    Args:
+        habilitado: Si False, no se lee ni se escribe en el almacén.
+    
+    Returns:
+        El almacén compartido.
+    """
+    return AlmacenTranscripcionesCorregidas.configurar_compartido(habilitado)
@@ -0,0 +1,150 @@
+"""
+Índice de turnos de palabra de una transcripción.
+
+Los turnos se reconocen por su etiqueta al inicio de la línea ("Entrevistador:",
+"Speaker 1:", "Ana María 00:12:") y se guardan solo como posiciones sobre el
+texto original, sin copiarlo. A partir del índice se arman vistas reducidas de
+la transcripción para los agentes de sección:
+
+- "completa": el texto tal cual.
+- "entrevistado": solo los turnos de quienes no son el entrevistador.
+- "sin_preguntas": todo menos los turnos del entrevistador que contienen una pregunta.
+
+El entrevistador se identifica por el nombre de su etiqueta ("Entrevistador",
+"Moderadora"...) o, con etiquetas genéricas ("Speaker 1"), como el hablante con
+más turnos con pregunta y menos texto. Si no se identifica con claridad, todas
+las vistas devuelven el texto completo. El texto anterior al primer turno
+(título, fecha) se conserva en todas las vistas.
+"""
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Set, Tuple
+
+
+# Etiqueta de turno al inicio de la línea (el mismo formato que corta utils/fragmentador.py)
+PATRON_ETIQUETA = re.compile(
+    r'^[ \t]*(?P<hablante>(?i:speaker|hablante|participante)[ \t]*\d+'
+    r'|[A-ZÁÉÍÓÚÑ][\wáéíóúñ]*(?:[ \t]+[A-ZÁÉÍÓÚÑ][\wáéíóúñ]*){0,3})'
+    r'[ \t]*(?:\(?\d{1,2}:\d{2}(?::\d{2})?\)?)?[ \t]*:',
+    re.MULTILINE
+)
+PATRON_ENTREVISTADOR = re.compile(r'^(?:entrevistador|entrevistadora|moderador|moderadora|interviewer)\b')
+
+# Etiquetas genéricas: el entrevistador es el hablante con más turnos con pregunta,
+# si al menos esta fracción de sus turnos la tiene y habla menos que el resto
+FRACCION_MINIMA_PREGUNTAS = 0.5
+
+
+@dataclass
+class Turno:
+    """Turno [inicio, fin) del texto, desde su etiqueta hasta la siguiente."""
+    hablante: str
+    inicio: int
+    fin: int
+    pregunta: bool
+
+
+class IndiceTurnos:
+    """Turnos de palabra de una transcripción y vistas reducidas sobre ellos."""
+    
+    def __init__(self, texto: str):
+        """
+        Args:
+            texto: Transcripción completa.
+        """
+        self.texto = texto
+        self.turnos: List[Turno] = []
+        
+        etiquetas = list(PATRON_ETIQUETA.finditer(texto))
+        for actual, siguiente in zip(etiquetas, etiquetas[1:] + [None]):
+            fin = siguiente.start() if siguiente else len(texto)
+            hablante = ' '.join(actual.group('hablante').lower().split())
+            self.turnos.append(Turno(hablante, actual.start(), fin, texto.find('?', actual.end(), fin) != -1))
+        
+        self.entrevistadores = self._identificar_entrevistadores()
+    
+    @property
+    def hablantes(self) -> List[str]:
+        """Hablantes distintos, en orden de aparición."""
+        return list(dict.fromkeys(t.hablante for t in self.turnos))
+    
+    def _identificar_entrevistadores(self) -> Set[str]:
+        """Hablantes que hacen de entrevistador (vacío si no se identifica)."""
+        hablantes = self.hablantes
+        if len(hablantes) < 2:
+            return set()
+        
+        por_nombre = {h for h in hablantes if PATRON_ENTREVISTADOR.match(h)}
+        if por_nombre:
+            return por_nombre
+        
+        turnos, preguntas, caracteres = {}, {}, {}
+        for turno in self.turnos:
+            turnos[turno.hablante] = turnos.get(turno.hablante, 0) + 1
+            preguntas[turno.hablante] = preguntas.get(turno.hablante, 0) + turno.pregunta
+            caracteres[turno.hablante] = caracteres.get(turno.hablante, 0) + turno.fin - turno.inicio
+        
+        candidato = max(hablantes, key=lambda h: (preguntas[h] / turnos[h], preguntas[h]))
+        if (turnos[candidato] >= 2 and preguntas[candidato] / turnos[candidato] >= FRACCION_MINIMA_PREGUNTAS
+                and caracteres[candidato] * 2 < sum(caracteres.values())):
+            return {candidato}
+        return set()
+    
+    def _conserva(self, turno: Turno, vista: str) -> bool:
+        if vista not in ("entrevistado", "sin_preguntas") or turno.hablante not in self.entrevistadores:
+            return True
+        return vista == "sin_preguntas" and not turno.pregunta
+    
+    def incluye(self, indice_turno: int, vista: str, turnos: Optional[Set[int]] = None) -> bool:
+        """
+        True si el turno forma parte de la vista (ver `segmentos`). El texto
+        anterior al primer turno (índice -1) se incluye siempre.
+        """
+        if indice_turno < 0:
+            return True
+        return (turnos is None or indice_turno in turnos) and self._conserva(self.turnos[indice_turno], vista)
+    
+    def segmentos(self, vista: str, turnos: Optional[Set[int]] = None) -> List[Tuple[int, int]]:
+        """
+        Tramos [inicio, fin) del texto original que forman una vista, uniendo
+        los turnos consecutivos.
+        
+        Args:
+            vista: "completa", "entrevistado" o "sin_preguntas".
+            turnos: Índices de los turnos a considerar (ej: los de un bloque de
+                    la entrevista, ver utils/bloques.py). None = todos.
+        """
+        if not self.turnos or (turnos is None and (vista not in ("entrevistado", "sin_preguntas") or not self.entrevistadores)):
+            return [(0, len(self.texto))] if self.texto else []
+        
+        segmentos = []
+        if self.turnos[0].inicio > 0:
+            segmentos.append((0, self.turnos[0].inicio))
+        for i, turno in enumerate(self.turnos):
+            if not self.incluye(i, vista, turnos):
+                continue
+            if segmentos and segmentos[-1][1] == turno.inicio:
+                segmentos[-1] = (segmentos[-1][0], turno.fin)
+            else:
+                segmentos.append((turno.inicio, turno.fin))
+        return segmentos
+    
+    def vista(self, vista: str, turnos: Optional[Set[int]] = None) -> str:
+        """
+        Texto de una vista de la transcripción (ver `segmentos`). La vista
+        "completa" de todos los turnos, o cualquiera si no se identificó al
+        entrevistador, es el texto original sin copiar.
+        """
+        segmentos = self.segmentos(vista, turnos)
+        if segmentos == [(0, len(self.texto))]:
+            return self.texto
+        return "".join(self.texto[inicio:fin] for inicio, fin in segmentos)
+    
+    def resumen(self, vista: str) -> str:
+        """Línea con el tamaño de la vista frente al texto completo."""
+        if not self.entrevistadores:
+            return f"Vista '{vista}': entrevistador no identificado, se usa la transcripción completa"
+        caracteres = sum(fin - inicio for inicio, fin in self.segmentos(vista))
+        porcentaje = 100 * caracteres / len(self.texto) if self.texto else 100
+        return (f"Vista '{vista}': {porcentaje:.0f}% de la transcripción "
+                f"({len(self.turnos)} turnos, entrevistador: {', '.join(sorted(self.entrevistadores))})")
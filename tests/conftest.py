@@ -0,0 +1,13 @@
+"""
+Configuración común de las pruebas.
+
+El código vive en src/ y se importa como en los scripts (`from config import ...`),
+así que src/ se agrega al path; benchmarks/ también, por las implementaciones
+anteriores que sirven de referencia en las pruebas de equivalencia.
+"""
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "src"))
+sys.path.insert(0, os.path.join(RAIZ, "benchmarks"))
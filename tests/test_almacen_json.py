@@ -0,0 +1,61 @@
+"""Pruebas de los almacenes JSON por contenido."""
+import json
+import os
+
+import pytest
+
+from utils.almacen_json import escribir_json_atomico, huella_campos, huella_texto
+from utils.hechos_entrevistas import AlmacenHechos
+from utils.transcripciones_corregidas import AlmacenTranscripcionesCorregidas
+
+
+def test_guardar_y_obtener_por_texto_y_version(tmp_path):
+    almacen = AlmacenTranscripcionesCorregidas(str(tmp_path))
+    resultado = {'texto_corregido': "texto corregido", 'correcciones': "- a → b"}
+    
+    almacen.guardar("texto original", "v1", resultado, nombre="Ana")
+    
+    assert almacen.obtener("texto original", "v1") == resultado
+    assert almacen.obtener("texto original", "v2") is None
+    assert almacen.obtener("otro texto", "v1") is None
+    assert (almacen.reutilizados, almacen.nuevos) == (1, 1)
+    with open(tmp_path / f"{huella_texto('texto original')}-v1.json", encoding='utf-8') as f:
+        assert json.load(f)['version_prompt'] == "v1"
+    assert not [n for n in os.listdir(tmp_path) if n.endswith('.tmp')]
+
+
+def test_archivo_incompleto_o_almacen_desactivado(tmp_path):
+    almacen = AlmacenHechos(str(tmp_path))
+    almacen.guardar("entrevista", "v1", {'grupos': ["Grupo A"]})
+    assert almacen.obtener("entrevista", "v1") == {'grupos': ["Grupo A"]}
+    
+    with open(almacen._ruta("entrevista", "v1"), 'w', encoding='utf-8') as f:
+        json.dump({'version_prompt': "v1"}, f)
+    assert almacen.obtener("entrevista", "v1") is None
+    
+    almacen.habilitado = False
+    almacen.guardar("otra", "v1", {})
+    assert almacen.obtener("otra", "v1") is None
+    assert not almacen.contiene("entrevista", "v1")
+
+
+def test_instancia_compartida_por_subclase():
+    assert AlmacenHechos.compartido() is AlmacenHechos.compartido()
+    assert AlmacenHechos.compartido() is not AlmacenTranscripcionesCorregidas.compartido()
+
+
+def test_huella_campos_no_depende_del_orden():
+    assert huella_campos({'a': 1, 'b': "ñ"}) == huella_campos({'b': "ñ", 'a': 1})
+    assert len(huella_campos({'a': 1})) == 12
+    assert len(huella_campos({'a': 1}, longitud=None)) == 64
+
+
+def test_escritura_fallida_no_deja_temporales(tmp_path):
+    ruta = tmp_path / "datos.json"
+    escribir_json_atomico(str(ruta), {'a': 1})
+    
+    with pytest.raises(TypeError):
+        escribir_json_atomico(str(ruta), {'a': object()})
+    
+    assert os.listdir(tmp_path) == ["datos.json"]
+    assert json.loads(ruta.read_text(encoding='utf-8')) == {'a': 1}
@@ -0,0 +1,57 @@
+"""Pruebas del cliente LLM compartido que no llaman a ningún proveedor."""
+from llm import CacheRespuestas, MetricasLLM, salida_maxima
+from llm.cliente import ClienteLLM, es_error_limite_tasa
+from llm.proveedor_local import ErrorSimulado429
+
+
+class ErrorHTTP(Exception):
+    def __init__(self, mensaje: str, status_code: int = None, code: int = None, status: str = None):
+        super().__init__(mensaje)
+        self.status_code = status_code
+        self.code = code
+        self.status = status
+
+
+def test_limite_de_tasa_por_codigo():
+    assert es_error_limite_tasa(ErrorHTTP("Too Many Requests", status_code=429))
+    assert es_error_limite_tasa(ErrorHTTP("quota", code=429))
+    assert es_error_limite_tasa(ErrorHTTP("quota", status="RESOURCE_EXHAUSTED"))
+    assert es_error_limite_tasa(ErrorSimulado429("Error code: 429"))
+
+
+def test_otros_errores_no_son_limite_de_tasa():
+    # Mensajes con "rate" o "429" que no son un límite de tasa
+    assert not es_error_limite_tasa(ValueError("Failed to generate an accurate response"))
+    assert not es_error_limite_tasa(ErrorHTTP("moderate content filter", status_code=400))
+    assert not es_error_limite_tasa(ErrorHTTP("Internal error (request 429)", status_code=500))
+    assert not es_error_limite_tasa(RuntimeError("429"))
+
+
+def test_gemini_recibe_el_prompt_de_sistema_antepuesto():
+    assert ClienteLLM._contenido_gemini("Transcripción", "Eres un agente") == "Eres un agente\n\nTranscripción"
+    assert ClienteLLM._contenido_gemini("Prompt del consolidador", None) == "Prompt del consolidador"
+
+
+def test_prediccion_con_gpt41_envia_max_tokens():
+    cliente = ClienteLLM(provider="openai", cache=CacheRespuestas(habilitada=False), metricas=MetricasLLM())
+    cliente.model = "gpt-4.1-mini"
+    
+    con_prediccion = cliente._parametros_openai("texto", "sistema", 500, 0.1, prediccion="texto")
+    sin_prediccion = cliente._parametros_openai("texto", "sistema", 500, 0.1)
+    
+    assert con_prediccion["prediction"] == {"type": "content", "content": "texto"}
+    assert con_prediccion["max_tokens"] == 500
+    assert "max_completion_tokens" not in con_prediccion
+    assert sin_prediccion["max_completion_tokens"] == 500
+    assert "max_tokens" not in sin_prediccion
+
+
+def test_salida_limitada_al_maximo_del_modelo():
+    cliente = ClienteLLM(provider="gemini", cache=CacheRespuestas(habilitada=False), metricas=MetricasLLM())
+    cliente.model = "gemini-2.0-flash"
+    cliente.salida_maxima = salida_maxima("gemini", cliente.model)
+    
+    assert cliente.planificar("texto", max_tokens=16000).max_tokens == 8192
+    assert cliente.planificar("texto", max_tokens=4000).max_tokens == 4000
+    assert salida_maxima("gemini", "gemini-2.5-flash") == 65536
+    assert salida_maxima("openai", "gpt-4.1-mini") == 32768
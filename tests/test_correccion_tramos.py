@@ -0,0 +1,56 @@
+"""Corrección en modo "tramos": detección única sobre el texto precorregido."""
+import asyncio
+
+import pytest
+
+from agents.agente_correccion import AgenteCorreccion
+from llm import ClienteLLM, CacheRespuestas, MetricasLLM
+from utils.corrector_fonetico import obtener_corrector_fonetico
+from utils.detector_sospechosos import Tramo
+from utils.transcripciones_corregidas import AlmacenTranscripcionesCorregidas
+
+
+class DetectorContado:
+    """Marca como sospechosa cada aparición de "flau" y cuenta las detecciones."""
+    version = "contado"
+    
+    def __init__(self):
+        self.textos = []
+    
+    def detectar(self, texto):
+        self.textos.append(texto)
+        inicio = texto.find("flau")
+        return [Tramo(inicio, inicio + 4, "flau", ["flau"])] if inicio >= 0 else []
+
+
+@pytest.fixture
+def agente(tmp_path):
+    cliente = ClienteLLM(provider="local", cache=CacheRespuestas(habilitada=False), metricas=MetricasLLM())
+    return AgenteCorreccion(
+        cliente=cliente, modo="tramos", almacen=None, umbral_fuera_lexico=0,
+        transcripciones=AlmacenTranscripcionesCorregidas(str(tmp_path), habilitado=False),
+        corrector_fonetico=obtener_corrector_fonetico(), detector=DetectorContado()
+    )
+
+
+@pytest.mark.parametrize("asincrono", [False, True])
+def test_el_detector_corre_una_vez_sobre_el_texto_precorregido(agente, asincrono):
+    texto = "Entrevistador: ¿qué usan?\nEntrevistado: paiton y el flau del laboratorio"
+    
+    if asincrono:
+        asyncio.run(agente.process_async(texto))
+    else:
+        agente.process(texto)
+    
+    assert agente.detector.textos == ["Entrevistador: ¿qué usan?\nEntrevistado: Python y el flau del laboratorio"]
+    assert agente.cliente.llamadas == 1
+
+
+def test_el_plan_coincide_con_la_precorreccion(agente):
+    # La precorrección fonética resuelve "tensor flau": no queda nada sospechoso
+    texto = "Entrevistado: trabajamos con tensor flau"
+    
+    assert agente.planificar(texto) == []
+    assert "ninguna palabra sospechosa" in agente.process(texto)['correcciones']
+    assert agente.detector.textos == ["Entrevistado: trabajamos con TensorFlow"] * 2
+    assert agente.cliente.llamadas == 0
@@ -0,0 +1,69 @@
+"""Aplicación con contexto y poda del almacén de correcciones aprendidas."""
+import json
+
+from utils.correcciones_aprendidas import AlmacenCorrecciones
+
+TEXTO_ROBOTICA = "En el semillero de robótica con el grupo Nike armamos brazos robóticos.\n"
+
+
+def aprender_de(almacen, texto, original, corregido, huella):
+    texto_corregido = texto.replace(original, corregido)
+    return almacen.aprender(texto, f"- {original} → {corregido}", texto_corregido, huella)
+
+
+def almacen_con_nike(tmp_path, **parametros):
+    almacen = AlmacenCorrecciones(str(tmp_path / "aprendidas.json"), **parametros)
+    assert aprender_de(almacen, TEXTO_ROBOTICA, "Nike", "GIROPS", "t1") == 1
+    assert aprender_de(almacen, "Ayer en robótica hablamos de Nike y los brazos.", "Nike", "GIROPS", "t2") == 1
+    return almacen
+
+
+def test_se_aplica_solo_con_contexto_parecido(tmp_path):
+    almacen = almacen_con_nike(tmp_path)
+    
+    texto, aplicadas = almacen.aplicar("Nike ganó el premio de robótica.\nCompré unas zapatillas Nike.", "t3")
+    
+    assert texto == "GIROPS ganó el premio de robótica.\nCompré unas zapatillas Nike."
+    assert aplicadas == ["- Nike → GIROPS (aprendida)"]
+
+
+def test_en_su_transcripcion_se_aplica_sin_contexto(tmp_path):
+    almacen = almacen_con_nike(tmp_path)
+    
+    texto, _ = almacen.aplicar("Compré unas zapatillas Nike.", "t1")
+    
+    assert texto == "Compré unas zapatillas GIROPS."
+
+
+def test_originales_de_palabras_conocidas_no_se_aplican_en_otras(tmp_path):
+    almacen = AlmacenCorrecciones(str(tmp_path / "aprendidas.json"))
+    for huella in ("t1", "t2"):
+        aprender_de(almacen, "Los sensores de hora en la red de robótica.", "hora", "LoRa", huella)
+    
+    assert almacen.aplicar("A qué hora empieza la red de robótica", "t3")[0] == "A qué hora empieza la red de robótica"
+    assert almacen.aplicar("Los sensores de hora", "t1")[0] == "Los sensores de LoRa"
+
+
+def test_pares_antiguos_se_olvidan_y_el_lexico_esta_acotado(tmp_path):
+    almacen = almacen_con_nike(tmp_path, edad_maxima=3, max_lexico=5)
+    
+    for i in range(3):
+        aprender_de(almacen, f"Texto número {i} sin pares.", "nada", "nada", f"otra{i}")
+    almacen.guardar()
+    
+    with open(tmp_path / "aprendidas.json", encoding='utf-8') as f:
+        datos = json.load(f)
+    assert datos["pares"] == {}
+    assert datos["transcripciones"] == 5
+    assert len(datos["lexico"]) == 5
+    assert all(datos["lexico"][palabra] == 5 for palabra in ["texto", "número", "sin", "pares"])
+
+
+def test_carga_el_formato_anterior(tmp_path):
+    ruta = tmp_path / "aprendidas.json"
+    ruta.write_text(json.dumps({"pares": {}, "lexico": ["datos", "grupo"]}), encoding='utf-8')
+    
+    almacen = AlmacenCorrecciones(str(ruta))
+    
+    assert almacen.lexicos() == ({"datos", "grupo"}, set())
+    assert almacen.tasa_fuera_lexico("datos del grupo") == 1 / 3
@@ -0,0 +1,24 @@
+"""Pruebas de la precorrección fonética del vocabulario técnico."""
+from utils.corrector_fonetico import CorrectorFonetico, obtener_corrector_fonetico
+
+
+def test_no_reemplaza_el_verbo_quedas():
+    corrector = obtener_corrector_fonetico()
+    for texto in ["¿te quedas en el laboratorio?", "Me quedas debiendo"]:
+        assert corrector.aplicar(texto) == (texto, [])
+
+
+def test_corrige_variantes_tecnicas():
+    texto, correcciones = obtener_corrector_fonetico().aplicar("Usamos paiton y tensor flau en yupiter")
+    assert texto == "Usamos Python y TensorFlow en Jupyter"
+    assert len(correcciones) == 3
+
+
+def test_variante_que_es_palabra_frecuente_no_se_aplica_pero_se_senala():
+    corrector = CorrectorFonetico([("LoRa", ["hora"])])
+    texto = "¿a qué hora llega?"
+    assert corrector.aplicar(texto) == (texto, [])
+    assert [texto[inicio:fin] for inicio, fin, _ in corrector.cercanos(texto)] == ["hora"]
+    
+    texto, _ = corrector.aplicar("la red lora del campus")
+    assert texto == "la red LoRa del campus"
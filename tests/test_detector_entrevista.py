@@ -0,0 +1,46 @@
+"""Equivalencia del detector de tipo de entrevista con la implementación anterior."""
+import random
+
+import pytest
+
+from detector_entrevista_anterior import detectar_tipo_entrevista_anterior
+from utils.detector_entrevista import detectar_tipo_entrevista
+
+CASOS = [
+    ("", ""),
+    ("Entrevistador: ¿Dónde trabaja?\nAna María: Yo trabajo en la Facultad de Ingeniería, en automática.", "Ana María"),
+    ("Speaker 1: nosotros somos 5 personas\nSpeaker 2: y yo coordino\nHablante 3: desde la Vicerrectoría académica", ""),
+    ("Carlos: nosotros\nLuisa: nosotras\nPedro Pablo: NOSOTROS\nMarta: Nosotros\nJosé : yo\nAna: YO", "Carlos y Luisa"),
+    ("trabajo en Bienestar. Luego del Centro de datos, y en la Unidad: Ana: de\nla Biblioteca", "Grupo de Robótica"),
+    ("İyo nosotros ſpeaker 1: del CRIE", "Observatorio"),   # lower() cambia la longitud
+    ("de registro y control: DEL CRIE de la docencia", "Luz_transcripcion.txt"),
+]
+
+PIEZAS = [
+    "yo", "Yo", "YO", "nosotros", "Nosotras", "nosotrosx", "ayo", "Speaker 1:", "hablante 2", "participante4",
+    "Ana María:", "José :", "Entrevistador:", "de la Facultad de Ingeniería, ", "del Centro de datos.",
+    "en  la  Vicerrectoría académica", "de registro y control", "DEL CRIE", "de\nla Biblioteca", "İyo", "á",
+    "de la Unidad: Ana:", "Dirección", "\n", " ", ", ",
+]
+
+
+def test_casos_fijos_igual_que_antes():
+    for transcripcion, nombre in CASOS:
+        assert vars(detectar_tipo_entrevista(transcripcion, nombre)) == vars(detectar_tipo_entrevista_anterior(transcripcion, nombre))
+
+
+@pytest.mark.parametrize("semilla", range(5))
+def test_textos_aleatorios_igual_que_antes(semilla):
+    rng = random.Random(semilla)
+    for _ in range(300):
+        transcripcion = "".join(rng.choice(PIEZAS) + rng.choice(["", " ", "\n"]) for _ in range(rng.randint(0, 40)))
+        nombre = rng.choice(["", "Ana María", "Grupo X", "Luis y Ana"])
+        assert vars(detectar_tipo_entrevista(transcripcion, nombre)) == vars(detectar_tipo_entrevista_anterior(transcripcion, nombre))
+
+
+def test_detecta_area_y_participantes():
+    info = detectar_tipo_entrevista("Ana: yo trabajo en la Facultad de Ingeniería, con datos.", "Ana y Luis")
+    
+    assert info.es_grupal
+    assert info.nombres == ["Ana", "Luis"]
+    assert info.area_dependencia == "Facultad de Ingeniería"
@@ -0,0 +1,77 @@
+"""Prompt y respuesta de la extracción conjunta de secciones."""
+import asyncio
+import json
+
+import pytest
+
+from agents import AgenteIntegrador
+from agents.agente_extraccion_conjunta import REGLA_JSON, REGLA_MARKDOWN
+from llm import ClienteLLM, CacheRespuestas, MetricasLLM
+
+
+@pytest.fixture
+def conjunto():
+    cliente = ClienteLLM(provider="local", cache=CacheRespuestas(habilitada=False), metricas=MetricasLLM())
+    return AgenteIntegrador(cliente=cliente, extraccion_conjunta=True).agente_conjunto
+
+
+def test_solo_se_quita_el_encabezado_de_la_seccion(conjunto):
+    primero, segundo = conjunto.agentes[:2]
+    respuesta = json.dumps({
+        "seccion_1": f"## {primero.nombre_seccion}\n\n- Dato",
+        "seccion_2": "### Subsección propia\n\nTexto",
+    })
+    
+    secciones = conjunto._interpretar_resultado(respuesta)
+    
+    assert secciones[0] == f"## {primero.nombre_seccion}\n\n- Dato"
+    assert secciones[1] == f"## {segundo.nombre_seccion}\n\n### Subsección propia\n\nTexto"
+
+
+@pytest.mark.parametrize("disposicion", ["clasica", "prefijo"])
+def test_el_prompt_pide_json(conjunto, disposicion):
+    conjunto.disposicion_prompt = disposicion
+    
+    prompt = conjunto.construir_prompt("Entrevistador: hola", "Ana María")
+    
+    if disposicion == "prefijo":
+        assert "la respuesta completa es el objeto JSON" in prompt
+    else:
+        assert REGLA_MARKDOWN not in prompt
+        assert REGLA_JSON in prompt
+
+
+def test_el_respaldo_usa_el_texto_de_cada_agente(conjunto, monkeypatch):
+    def fallar(*args, **kwargs):
+        raise ValueError("JSON inválido")
+    
+    recibidos = []
+    for agente in conjunto.agentes:
+        monkeypatch.setattr(agente, "process", lambda texto, *args: recibidos.append(texto) or "## Sección")
+    monkeypatch.setattr(conjunto.cliente, "generar", fallar)
+    textos = [f"texto {i}" for i in range(len(conjunto.agentes))]
+    
+    conjunto.process("texto del integrador", "Ana María", None, textos)
+    
+    assert recibidos == textos
+    assert len(conjunto.secciones_respaldo) == len(conjunto.agentes)
+
+
+def test_el_respaldo_async_usa_el_texto_de_cada_agente(conjunto, monkeypatch):
+    async def fallar(*args, **kwargs):
+        raise ValueError("JSON inválido")
+    
+    recibidos = []
+    
+    async def procesar(texto, *args):
+        recibidos.append(texto)
+        return "## Sección"
+    
+    for agente in conjunto.agentes:
+        monkeypatch.setattr(agente, "process_async", procesar)
+    monkeypatch.setattr(conjunto.cliente, "generar_async", fallar)
+    textos = [f"texto {i}" for i in range(len(conjunto.agentes))]
+    
+    asyncio.run(conjunto.process_async("texto del integrador", "Ana María", None, textos))
+    
+    assert recibidos == textos
@@ -0,0 +1,66 @@
+"""Equivalencia del motor de correcciones con la aplicación regla por regla."""
+import random
+import re
+
+import pytest
+
+from agents.agente_correccion import AgenteCorreccion
+from utils.motor_correcciones import MotorCorrecciones
+
+REGLAS = AgenteCorreccion.CORRECCIONES_CONOCIDAS
+
+VOCABULARIO = "el la de en grupo con datos universidad investigación al trabajo y que".split()
+ESPECIALES = [
+    "grupo Nike", "Al grupo nike", "Nike", "nikes", "GIROPS", "jirops", "Cafe", "electromagnéticos",
+    "eis", "ecología", "gia", "inteligencia", "giga", "lider", "laboratorio", "tensor flau",
+    "Tensor Flau", "tensor flauta", "narras berry", "sid Colombia", "gicto", "mecabot", "ice3",
+]
+
+
+def corregir_secuencial(texto, reglas):
+    """Implementación anterior del agente de corrección."""
+    aplicadas = []
+    for patron, reemplazo in reglas:
+        if re.search(patron, texto, re.IGNORECASE):
+            texto = re.sub(patron, reemplazo, texto, flags=re.IGNORECASE)
+            aplicadas.append(f"- {patron} → {reemplazo}")
+    return texto, aplicadas
+
+
+def corpus(semilla, caracteres):
+    rng = random.Random(semilla)
+    lineas = []
+    while sum(map(len, lineas)) < caracteres:
+        palabras = (rng.choice(ESPECIALES) if rng.random() < 0.15 else rng.choice(VOCABULARIO) for _ in range(rng.randint(3, 30)))
+        lineas.append(" ".join(palabras) + rng.choice([".", ",", "?", ""]))
+    return "\n".join(lineas)
+
+
+@pytest.mark.parametrize("semilla", range(20))
+def test_mismo_texto_que_la_aplicacion_secuencial(semilla):
+    texto = corpus(semilla, random.Random(semilla).choice([200, 2000, 20000]))
+    esperado, aplicadas_antes = corregir_secuencial(texto, REGLAS)
+    
+    obtenido, aplicadas = MotorCorrecciones(REGLAS).aplicar(texto)
+    
+    assert obtenido == esperado
+    assert set(aplicadas) <= set(aplicadas_antes)
+
+
+@pytest.mark.parametrize("texto", [
+    "Trabajo en el grupo Nike\nNike sin condición en esta línea",
+    "al grupo nike y Nike, GIROPS y jirops",
+    "İstanbul: el grupo Nike y tensor flau",   # lower() cambia la longitud
+    "",
+])
+def test_casos_fijos(texto):
+    assert MotorCorrecciones(REGLAS).aplicar(texto)[0] == corregir_secuencial(texto, REGLAS)[0]
+
+
+def test_tabla_encadenada_se_aplica_en_orden():
+    reglas = [(r'\bab\b', 'cd'), (r'\bcd\b', 'ef')]
+    
+    motor = MotorCorrecciones(reglas)
+    
+    assert motor._generales
+    assert motor.aplicar("ab cd")[0] == corregir_secuencial("ab cd", reglas)[0] == "ef ef"
@@ -0,0 +1,128 @@
+"""
+Ejecución concurrente de los agentes de AgenteIntegrador.procesar_paralelo.
+
+Un cliente falso tarda un tiempo fijo distinto por agente, sin red: si los
+agentes corren a la vez, el tiempo total se acerca al del agente más lento y
+no a la suma de todos.
+"""
+import asyncio
+import time
+
+import pytest
+
+from agents import AgenteCorreccion, AgenteIntegrador
+from llm import ClienteLLM, CacheRespuestas, MetricasLLM
+
+RETARDOS = {
+    "AgenteDatosBasicos": 0.30,
+    "AgenteResumenGeneral": 0.20,
+    "AgenteExperienciaTecnica": 0.25,
+    "AgenteDesarrolloInnovacion": 0.20,
+    "AgenteColaboracionLiderazgo": 0.15,
+    "AgenteMotivacionProyeccion": 0.20,
+    "AgenteHallazgosClave": 0.25,
+    "AgenteNarrativo": 0.40,
+}
+
+TRANSCRIPCION = """Entrevistador: ¿En qué proyectos de inteligencia artificial trabaja?
+Ana María: Trabajo con redes neuronales para clasificar imágenes satelitales en el grupo de investigación.
+Entrevistador: ¿Qué equipos usan?
+Ana María: Un servidor con dos GPU y Google Colab para los experimentos más pequeños.
+"""
+
+
+class ClienteLento(ClienteLLM):
+    """Cliente que responde tras el retardo fijo de cada agente, sin proveedor ni caché."""
+    
+    def __init__(self):
+        super().__init__(provider="local", cache=CacheRespuestas(habilitada=False), metricas=MetricasLLM())
+        self.llamadas_por_agente = {}
+    
+    def generar(self, prompt_usuario, prompt_sistema=None, max_tokens=None, temperature=None,
+                esquema=None, agente=None, prediccion=None):
+        # Una llamada síncrona bloquearía el event loop: se nota en el tiempo total
+        time.sleep(RETARDOS.get(agente, 0))
+        return self._respuesta(agente)
+    
+    async def generar_async(self, prompt_usuario, prompt_sistema=None, max_tokens=None, temperature=None,
+                            esquema=None, agente=None, prediccion=None):
+        await asyncio.sleep(RETARDOS.get(agente, 0))
+        return self._respuesta(agente)
+    
+    def _respuesta(self, agente):
+        self.llamadas_por_agente[agente] = self.llamadas_por_agente.get(agente, 0) + 1
+        return f"## {agente}\n\nContenido de prueba."
+
+
+@pytest.fixture
+def integrador(monkeypatch):
+    integrador = AgenteIntegrador(cliente=ClienteLento(), modo_correccion="completo")
+    
+    async def sin_correccion(transcripcion):
+        return {'texto_corregido': transcripcion, 'correcciones': []}
+    
+    monkeypatch.setattr(integrador.agente_correccion, "process_async", sin_correccion)
+    return integrador
+
+
+def test_tiempo_total_cercano_al_agente_mas_lento(integrador):
+    inicio = time.perf_counter()
+    reportes = asyncio.run(integrador.procesar_paralelo(TRANSCRIPCION, "Ana María", verbose=False))
+    total = time.perf_counter() - inicio
+    
+    assert integrador.cliente.llamadas_por_agente == {agente: 1 for agente in RETARDOS}
+    assert len(reportes['secciones']) == len(integrador.agentes)
+    
+    mas_lento, suma = max(RETARDOS.values()), sum(RETARDOS.values())
+    assert total < mas_lento + 0.3
+    assert total < suma / 2
+
+
+def _disposicion_prefijo(integrador):
+    for agente in integrador.agentes + [integrador.agente_narrativo]:
+        agente.disposicion_prompt = "prefijo"
+
+
+def test_prefijo_compartido_calienta_la_cache_primero(integrador):
+    _disposicion_prefijo(integrador)
+    
+    inicio = time.perf_counter()
+    asyncio.run(integrador.procesar_paralelo(TRANSCRIPCION, "Ana María", verbose=False))
+    total = time.perf_counter() - inicio
+    
+    # Primero el agente de datos básicos y después el resto a la vez
+    assert total >= RETARDOS["AgenteDatosBasicos"] + RETARDOS["AgenteNarrativo"] - 0.05
+
+
+def test_sin_prefijo_compartido_no_espera_al_primero(integrador):
+    _disposicion_prefijo(integrador)
+    # El primer agente recibe su propia vista: nadie comparte su prefijo
+    integrador.agentes[0].vista_transcripcion = "entrevistado"
+    
+    inicio = time.perf_counter()
+    asyncio.run(integrador.procesar_paralelo(TRANSCRIPCION, "Ana María", verbose=False))
+    total = time.perf_counter() - inicio
+    
+    assert total < RETARDOS["AgenteDatosBasicos"] + RETARDOS["AgenteNarrativo"] - 0.1
+
+
+def test_correccion_local_no_bloquea_el_bucle(monkeypatch):
+    agente = AgenteCorreccion(cliente=ClienteLento(), modo="completo")
+    
+    def precorregir_lento(transcripcion):
+        time.sleep(0.3)
+        return "huella", transcripcion, [], None, {'texto_corregido': transcripcion, 'correcciones': ''}
+    
+    monkeypatch.setattr(agente, "_reutilizar", lambda transcripcion: None)
+    monkeypatch.setattr(agente, "_precorregir", precorregir_lento)
+    monkeypatch.setattr(agente, "_guardar", lambda transcripcion, resultado: resultado)
+    
+    async def corregir_varias():
+        return await asyncio.gather(*(agente.process_async(f"texto {i}") for i in range(4)))
+    
+    inicio = time.perf_counter()
+    resultados = asyncio.run(corregir_varias())
+    total = time.perf_counter() - inicio
+    
+    assert [r['texto_corregido'] for r in resultados] == [f"texto {i}" for i in range(4)]
+    assert total < 0.3 * 4 / 2